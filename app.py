@@ -9,18 +9,21 @@ This Flask application serves as the backend for the AI Physics Tutor, handling:
 """
 
 import os
+import json
 import logging
 import time
 from datetime import datetime, timedelta
 from typing import Tuple, Dict, Any, Optional
-from flask import Flask, request, jsonify, send_from_directory, Response
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 from jose import jwt
 from jose.exceptions import JWTError
 from llm_integration.claude_tutor import ClaudeTutor
+from llm_integration.tutor_core import get_tutor_core, current_tutor_core
 from utils.ssl_config import configure_ssl_certificates
+from utils.metrics import LatencyTracker
 from config.settings import load_config
-from utils.error_handler import ValidationError, handle_api_error
+from utils.error_handler import ValidationError, handle_api_error, api_error_payload
 
 # Load centralized configuration
 try:
@@ -40,6 +43,8 @@ except Exception as e:
         host = os.getenv('HOST', '0.0.0.0')
         port = int(os.getenv('PORT', '5000'))
         debug = os.getenv('DEBUG', 'False').lower() == 'true'
+        metrics_enabled = os.getenv('METRICS_ENABLED', str(debug)).lower() == 'true'
+        allow_cache_bypass = os.getenv('ALLOW_CACHE_BYPASS', str(debug)).lower() == 'true'
         
     class FallbackSecurityConfig:
         jwt_secret = os.getenv('JWT_SECRET')
@@ -78,6 +83,12 @@ JWT_ALGORITHM = security_config.jwt_algorithm
 RATE_LIMIT = security_config.rate_limit
 RATE_LIMIT_WINDOW = security_config.rate_limit_window
 
+# Per-worker latency of /api/ask (first request reported separately from steady state)
+ask_latency = LatencyTracker()
+# Per-worker latency of /api/ask/stream: time to first token and time to the last token
+stream_ttft = LatencyTracker()
+stream_latency = LatencyTracker()
+
 # Vercel/serverless: Use JWT for stateless session and rate limiting
 # Remove in-memory dictionaries
 
@@ -120,11 +131,15 @@ def check_rate_limit_jwt(token: Optional[str]) -> Tuple[str, bool]:
     return encode_session_jwt(payload['session_id'], count + 1, window_start), True
 
 def get_tutor(session_id: str) -> ClaudeTutor:
-    """Always create a new tutor instance for each request (stateless)."""
+    """Create a lightweight tutor for this request on top of the shared tutor core.
+    
+    The ontology, Anthropic client and static prompt sections are loaded once per
+    worker by get_tutor_core(); only the per-session student model is loaded.
+    """
     if not validate_session_id(session_id):
         raise ValueError("Invalid session ID")
     try:
-        tutor = ClaudeTutor(student_id=session_id)
+        tutor = ClaudeTutor(student_id=session_id, core=get_tutor_core())
         logger.info(f"Created tutor for session {session_id}")
         return tutor
     except Exception as e:
@@ -162,18 +177,11 @@ def before_request():
     if not validate_session_id(session_id):
         return jsonify({'error': 'Invalid session ID'}), 400
 
-@app.route('/')
-def index():
-    """Serve the main HTML page with enhanced security headers.
+def add_security_headers(response):
+    """Attach the security headers served with the single-page application.
     
-    This route delivers the single-page application (SPA) with appropriate
-    security headers to protect against common web vulnerabilities.
-    
-    Returns:
-        Flask response with the HTML content and security headers
+    Shared with the ASGI app (asgi.py), which serves the same page.
     """
-    response = send_from_directory('static', 'index.html')
-    
     # Security headers to prevent common attacks
     response.headers['X-Content-Type-Options'] = 'nosniff'  # Prevents MIME type sniffing
     response.headers['X-Frame-Options'] = 'DENY'  # Prevents clickjacking
@@ -191,6 +199,20 @@ def index():
     ]
     response.headers['Content-Security-Policy'] = "; ".join(csp_directives)  # CSP
     response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'  # Limits referrer information
+    return response
+
+@app.route('/')
+def index():
+    """Serve the main HTML page with enhanced security headers.
+    
+    This route delivers the single-page application (SPA) with appropriate
+    security headers to protect against common web vulnerabilities.
+    
+    Returns:
+        Flask response with the HTML content and security headers
+    """
+    response = send_from_directory('static', 'index.html')
+    add_security_headers(response)
     
     return response
 
@@ -207,6 +229,85 @@ def after_request(response):
         response.headers['Authorization'] = new_token
     return response
 
+def parse_question(data: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str], Optional[Tuple[Dict[str, str], int]]]:
+    """Validate a question request body.
+    
+    Framework-independent so the Flask and ASGI apps share it.
+    
+    Returns:
+        Tuple of (question, session_id, error). error is an
+        ({'error': message}, status) pair when validation fails, otherwise None.
+    """
+    if not data or 'question' not in data:
+        return None, None, ({'error': 'Question is required'}, 400)
+    
+    session_id = data.get('session_id', 'default_session')
+    question = data['question']
+    
+    # Input validation
+    if not isinstance(question, str):
+        return None, None, ({'error': 'Question must be a text string'}, 400)
+    
+    if len(question) < 3:
+        return None, None, ({'error': 'Question is too short'}, 400)
+        
+    if len(question) > 1000:
+        return None, None, ({'error': 'Question exceeds maximum length of 1000 characters'}, 400)
+    
+    logger.info(f"Processing question for session {session_id}: {question[:50]}...")
+    return question, session_id, None
+
+def create_tutor(session_id: str) -> Tuple[Optional[ClaudeTutor], Optional[Tuple[Dict[str, str], int]]]:
+    """Get the tutor instance for a session, mapping failures to an error payload.
+    
+    Returns:
+        Tuple of (tutor, error). error is an ({'error': message}, status) pair
+        when the tutor could not be created, otherwise None.
+    """
+    try:
+        return get_tutor(session_id), None
+    except ValueError as ve:
+        logger.error(f"Validation error creating tutor: {ve}")
+        if "API" in str(ve) or "api_key" in str(ve).lower():
+            return None, ({'error': 'AI service configuration error. Please contact support.'}, 503)
+        return None, ({'error': str(ve)}, 400)
+    except RuntimeError as re:
+        logger.error(f"Runtime error creating tutor: {re}")
+        return None, ({'error': str(re)}, 503)  # Service Unavailable
+    except Exception as e:
+        logger.error(f"Unexpected error creating tutor: {e}")
+        return None, ({'error': 'Failed to initialize AI tutor. Please try again.'}, 500)
+
+def prepare_question_request():
+    """Parse and validate a question request and create its tutor.
+    
+    Shared by /api/ask and /api/ask/stream.
+    
+    Returns:
+        Tuple of (question, session_id, tutor, error_response). error_response is
+        a (response, status) pair to return as-is when validation or tutor
+        creation fails, otherwise None.
+    """
+    question, session_id, error = parse_question(request.get_json())
+    if not error:
+        tutor, error = create_tutor(session_id)
+    if error:
+        payload, status = error
+        return None, None, None, (jsonify(payload), status)
+    return question, session_id, tutor, None
+
+def cache_bypass_requested(data: Optional[Dict[str, Any]]) -> bool:
+    """Whether a request body asks to skip the answer cache and may do so.
+    
+    Skipping the cache forces a paid Claude call, so ``bypass_cache`` is only
+    honoured when ALLOW_CACHE_BYPASS is set (the default in debug mode).
+    """
+    return bool(app_config.allow_cache_bypass and data and data.get('bypass_cache'))
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @app.route('/api/ask', methods=['POST'])
 def ask_tutor():
     """API endpoint to ask the tutor a question with input validation.
@@ -215,48 +316,26 @@ def ask_tutor():
     the Claude AI and physics ontology. Includes comprehensive validation
     and error handling for a robust user experience.
     
+    Repeated questions are served from the answer cache unless the request
+    body sets ``"bypass_cache": true`` and ALLOW_CACHE_BYPASS is enabled.
+    
     Returns:
         JSON response with tutor's answer or error details
     """
+    started = time.perf_counter()
     try:
-        # Parse and validate input data
-        data = request.get_json()
-        if not data or 'question' not in data:
-            return jsonify({'error': 'Question is required'}), 400
-        
-        session_id = data.get('session_id', 'default_session')
-        question = data['question']
+        question, session_id, tutor, error_response = prepare_question_request()
+        if error_response:
+            return error_response
         
-        # Input validation
-        if not isinstance(question, str):
-            return jsonify({'error': 'Question must be a text string'}), 400
-        
-        if len(question) < 3:
-            return jsonify({'error': 'Question is too short'}), 400
-            
-        if len(question) > 1000:
-            return jsonify({'error': 'Question exceeds maximum length of 1000 characters'}), 400
-        
-        logger.info(f"Processing question for session {session_id}: {question[:50]}...")
-        
-        # Get the tutor instance for this session
-        try:
-            tutor = get_tutor(session_id)
-        except ValueError as ve:
-            logger.error(f"Validation error creating tutor: {ve}")
-            if "API" in str(ve) or "api_key" in str(ve).lower():
-                return jsonify({'error': 'AI service configuration error. Please contact support.'}), 503
-            return jsonify({'error': str(ve)}), 400
-        except RuntimeError as re:
-            logger.error(f"Runtime error creating tutor: {re}")
-            return jsonify({'error': str(re)}), 503  # Service Unavailable
-        except Exception as e:
-            logger.error(f"Unexpected error creating tutor: {e}")
-            return jsonify({'error': 'Failed to initialize AI tutor. Please try again.'}), 500
-        
-        # Get the tutor's response
+        # Get the tutor's response (evaluation runs set bypass_cache to skip the answer cache)
         try:
-            response = tutor.tutor_sync(question)
+            use_cache = not cache_bypass_requested(request.get_json())
+            response = tutor.tutor_sync(question, use_cache=use_cache)
+            
+            elapsed = time.perf_counter() - started
+            if ask_latency.record(elapsed):
+                logger.info(f"First request served in {elapsed * 1000:.1f} ms (includes tutor core load)")
             
             # Return the response with some metadata
             return jsonify({
@@ -274,6 +353,83 @@ def ask_tutor():
         logger.error(f"Unexpected error processing question: {e}")
         return handle_api_error(e)
 
+@app.route('/api/ask/stream', methods=['POST'])
+def ask_tutor_stream():
+    """API endpoint that streams the tutor's answer as Server-Sent Events.
+    
+    Accepts the same JSON body as /api/ask and runs the same context pipeline,
+    then forwards Claude's text as it is generated. Events:
+    
+    - ``token``: ``{"text": ...}`` for each fragment of the answer
+    - ``done``: session id, timestamp, time to first token and total time (ms)
+    - ``error``: ``{"error": ..., "status": ...}`` if the AI call fails mid-stream
+    
+    Validation and tutor creation errors are returned as JSON before the stream
+    starts, exactly as for /api/ask.
+    
+    Returns:
+        ``text/event-stream`` response, or a JSON error response
+    """
+    started = time.perf_counter()
+    try:
+        question, session_id, tutor, error_response = prepare_question_request()
+        if error_response:
+            return error_response
+    except Exception as e:
+        logger.error(f"Unexpected error processing question: {e}")
+        return handle_api_error(e)
+    
+    def generate():
+        first_token_at = None
+        try:
+            for text in tutor.tutor_stream(question):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    ttft = first_token_at - started
+                    if stream_ttft.record(ttft):
+                        logger.info(f"First streamed token in {ttft * 1000:.1f} ms (includes tutor core load)")
+                yield sse_event('token', {'text': text})
+        except Exception as e:
+            payload, status = api_error_payload(e)
+            yield sse_event('error', dict(payload, status=status))
+            return
+        
+        finished = time.perf_counter()
+        stream_latency.record(finished - started)
+        yield sse_event('done', {
+            'session_id': session_id,
+            'timestamp': datetime.now().isoformat(),
+            'ttft_ms': round((first_token_at - started) * 1000, 2) if first_token_at else None,
+            'total_ms': round((finished - started) * 1000, 2)
+        })
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable proxy buffering so tokens flush immediately
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Report per-worker performance metrics.
+    
+    Only served when METRICS_ENABLED is set (the default in debug mode), since
+    it exposes latency and cache internals.
+    
+    Returns:
+        JSON response with first-request vs steady-state latency of /api/ask,
+        time to first token and total latency of /api/ask/stream, and tutor
+        core load statistics (if the core has been loaded)
+    """
+    if not app_config.metrics_enabled:
+        return jsonify({'error': 'Not found'}), 404
+    core = current_tutor_core()
+    return jsonify({
+        'ask_latency': ask_latency.snapshot(),
+        'stream_ttft': stream_ttft.snapshot(),
+        'stream_latency': stream_latency.snapshot(),
+        'tutor_core': core.stats() if core else None
+    })
+
 if __name__ == '__main__':
     # Print startup banner
     print("\n" + "=" * 80)
@@ -0,0 +1,193 @@
+"""
+AI Physics Tutor ASGI Application Server
+
+Async counterpart of app.py built on Quart (Flask-compatible API). It serves the
+same routes with the same validation, rate limiting and error payloads, but
+awaits Claude through AsyncAnthropic instead of blocking a worker thread, so a
+single process can hold hundreds of in-flight tutoring requests.
+
+Run with any ASGI server, e.g.::
+
+    hypercorn asgi:app --bind 0.0.0.0:5000
+"""
+
+import time
+import asyncio
+import logging
+from datetime import datetime
+from quart import Quart, request, jsonify, send_from_directory, Response
+from quart_cors import cors
+from llm_integration.tutor_core import get_tutor_core, current_tutor_core
+from utils.metrics import LatencyTracker
+from utils.error_handler import api_error_payload
+
+# Configuration, session handling and request validation are shared with the WSGI app
+from app import (
+    allowed_origins, check_rate_limit_jwt, validate_session_id,
+    parse_question, create_tutor, sse_event, add_security_headers,
+    app_config, cache_bypass_requested
+)
+
+logger = logging.getLogger(__name__)
+
+app = Quart(__name__, static_folder='static')
+app = cors(app, allow_origin=allowed_origins)
+app.config['JSON_SORT_KEYS'] = False  # Preserve response JSON order
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000  # 1 year cache for static files
+
+# Per-worker latency metrics, reported like the WSGI app's
+ask_latency = LatencyTracker()
+stream_ttft = LatencyTracker()
+stream_latency = LatencyTracker()
+
+
+@app.before_serving
+async def load_tutor_core():
+    """Load the shared tutor core off the event loop before accepting requests."""
+    core = await asyncio.to_thread(get_tutor_core)
+    logger.info(f"Tutor core ready ({core.stats()['load_ms']} ms)")
+
+
+@app.before_request
+async def before_request():
+    """Security middleware for all requests (same rules as app.py)."""
+    # Skip validation for static files and non-API routes
+    if request.endpoint in ['index', 'favicon'] or request.path.startswith('/static'):
+        return
+
+    session_id = 'default_session'
+    data = await request.get_json(silent=True) if request.is_json else None
+    if data:
+        session_id = data.get('session_id', 'default_session')
+    else:
+        session_id = request.args.get('session_id', 'default_session')
+
+    token = request.headers.get('Authorization')
+    new_token, allowed = check_rate_limit_jwt(token)
+    if not allowed:
+        resp = jsonify({'error': 'Rate limit exceeded'})
+        if new_token:
+            resp.headers['Authorization'] = new_token
+        return resp, 429
+    request.new_token = new_token
+    if not validate_session_id(session_id):
+        return jsonify({'error': 'Invalid session ID'}), 400
+
+
+@app.after_request
+async def after_request(response):
+    # Attach new JWT token for stateless rate limiting
+    new_token = getattr(request, 'new_token', None)
+    if new_token:
+        response.headers['Authorization'] = new_token
+    return response
+
+
+@app.route('/')
+async def index():
+    """Serve the main HTML page with the same security headers as app.py."""
+    response = await send_from_directory('static', 'index.html')
+    return add_security_headers(response)
+
+
+@app.route('/favicon.ico')
+async def favicon():
+    """Serve the favicon directly from the static folder."""
+    return await send_from_directory('static', 'favicon.ico')
+
+
+async def prepare_question_request():
+    """Async version of app.prepare_question_request()."""
+    question, session_id, error = parse_question(await request.get_json(silent=True))
+    if not error:
+        # Loading the student model may query the student store; keep it off the event loop
+        tutor, error = await asyncio.to_thread(create_tutor, session_id)
+    if error:
+        payload, status = error
+        return None, None, None, (jsonify(payload), status)
+    return question, session_id, tutor, None
+
+
+@app.route('/api/ask', methods=['POST'])
+async def ask_tutor():
+    """Answer a question without blocking the event loop while Claude responds.
+
+    Returns:
+        JSON response with tutor's answer or error details
+    """
+    started = time.perf_counter()
+    question, session_id, tutor, error_response = await prepare_question_request()
+    if error_response:
+        return error_response
+
+    try:
+        use_cache = not cache_bypass_requested(await request.get_json())
+        response = await tutor.tutor_async(question, use_cache=use_cache)
+    except Exception as e:
+        payload, status = api_error_payload(e)
+        return jsonify(payload), status
+
+    elapsed = time.perf_counter() - started
+    if ask_latency.record(elapsed):
+        logger.info(f"First request served in {elapsed * 1000:.1f} ms")
+
+    return jsonify({
+        'response': response,
+        'session_id': session_id,
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+@app.route('/api/ask/stream', methods=['POST'])
+async def ask_tutor_stream():
+    """Stream the tutor's answer as Server-Sent Events (same events as app.py).
+
+    Returns:
+        ``text/event-stream`` response, or a JSON error response
+    """
+    started = time.perf_counter()
+    question, session_id, tutor, error_response = await prepare_question_request()
+    if error_response:
+        return error_response
+
+    async def generate():
+        first_token_at = None
+        try:
+            async for text in tutor.tutor_stream_async(question):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    stream_ttft.record(first_token_at - started)
+                yield sse_event('token', {'text': text}).encode()
+        except Exception as e:
+            payload, status = api_error_payload(e)
+            yield sse_event('error', dict(payload, status=status)).encode()
+            return
+
+        finished = time.perf_counter()
+        stream_latency.record(finished - started)
+        yield sse_event('done', {
+            'session_id': session_id,
+            'timestamp': datetime.now().isoformat(),
+            'ttft_ms': round((first_token_at - started) * 1000, 2) if first_token_at else None,
+            'total_ms': round((finished - started) * 1000, 2)
+        }).encode()
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None  # Long answers must not hit the response timeout
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+async def metrics():
+    """Report per-worker performance metrics (same shape and gating as app.py)."""
+    if not app_config.metrics_enabled:
+        return jsonify({'error': 'Not found'}), 404
+    core = current_tutor_core()
+    return jsonify({
+        'ask_latency': ask_latency.snapshot(),
+        'stream_ttft': stream_ttft.snapshot(),
+        'stream_latency': stream_latency.snapshot(),
+        'tutor_core': core.stats() if core else None
+    })
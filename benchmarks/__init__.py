@@ -0,0 +1 @@
+"""Micro-benchmarks for the AI Physics Tutor (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,162 @@
+"""
+Load test /api/ask on the WSGI app (app.py) vs the ASGI app (asgi.py) against a stub LLM.
+
+Both servers run in their own process and talk to a local fake of the Messages
+API (benchmarks/stub_llm.py) that answers after a fixed delay, so the numbers
+measure how many slow LLM calls each serving path can hold in flight. The WSGI
+app runs on a fixed pool of worker threads, like a gthread worker; the ASGI app
+runs on hypercorn's single event loop.
+
+Usage:
+    python -m benchmarks.bench_asgi_load [--concurrency 10 50 200] [--llm-latency 0.5] [--wsgi-threads 8]
+"""
+
+import os
+import time
+import json
+import socket
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import List, Tuple
+from benchmarks.stub_llm import StubLLMServer
+from utils.metrics import _percentile
+
+QUESTION = "What is Newton's second law?"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve_wsgi(port: int, threads: int) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    from werkzeug.serving import BaseWSGIServer
+    from app import app
+    logging.disable(logging.INFO)
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """Werkzeug server that handles requests on a fixed pool of threads."""
+        request_queue_size = 1024
+        pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    PooledWSGIServer("127.0.0.1", port, app).serve_forever()
+
+
+def _serve_asgi(port: int) -> None:
+    from hypercorn.config import Config
+    from hypercorn.asyncio import serve
+    from asgi import app
+    logging.disable(logging.INFO)
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.backlog = 1024
+    config.accesslog = None
+    asyncio.run(serve(app, config))
+
+
+async def _post(port: int, body: bytes) -> Tuple[int, float]:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        b"POST /api/ask HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        b"Connection: close\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status = int(response.split(b" ", 2)[1]) if response else 0
+    return status, time.perf_counter() - started
+
+
+async def _load(port: int, concurrency: int, requests: int) -> Tuple[List[float], int, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    body = json.dumps({"question": QUESTION, "session_id": "load_test"}).encode()
+
+    async def one():
+        async with semaphore:
+            try:
+                return await _post(port, body)
+            except OSError:
+                return 0, 0.0
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for status, seconds in results if status == 200)
+    return latencies, requests - len(latencies), elapsed
+
+
+def _wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /api/metrics HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if sock.recv(16).split(b" ")[1:2] == [b"200"]:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM response time in seconds")
+    parser.add_argument("--wsgi-threads", type=int, default=8, help="Worker threads for the WSGI app")
+    args = parser.parse_args()
+
+    with StubLLMServer(first_token_delay=args.llm_latency) as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-load-test")
+        os.environ.setdefault("JWT_SECRET", "load-test-secret")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ["RATE_LIMIT"] = "1000000"
+        os.environ["ANSWER_CACHE_ENABLED"] = "false"  # every request must reach the LLM
+        os.environ["SINGLE_FLIGHT_ENABLED"] = "false"
+
+        servers = [
+            (f"wsgi ({args.wsgi_threads} threads)", _serve_wsgi, lambda port: (port, args.wsgi_threads)),
+            ("asgi (hypercorn)", _serve_asgi, lambda port: (port,)),
+        ]
+        context = multiprocessing.get_context("spawn")
+
+        print(f"stub LLM latency {args.llm_latency * 1000:.0f} ms")
+        print(f"{'server':<20} {'concurrency':>11} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, target, target_args in servers:
+            port = _free_port()
+            process = context.Process(target=target, args=target_args(port), daemon=True)
+            process.start()
+            try:
+                _wait_until_ready(port)
+                asyncio.run(_load(port, 1, 1))  # warm up the tutor core
+                for concurrency in args.concurrency:
+                    requests = max(2 * concurrency, 20)
+                    latencies, errors, elapsed = asyncio.run(_load(port, concurrency, requests))
+                    p50 = _percentile(latencies, 50) * 1000 if latencies else float("nan")
+                    p99 = _percentile(latencies, 99) * 1000 if latencies else float("nan")
+                    print(f"{name:<20} {concurrency:>11} {requests:>9} {errors:>7} "
+                          f"{len(latencies) / elapsed:>8.1f} {p50:>8.0f} {p99:>8.0f}")
+            finally:
+                process.terminate()
+                process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark expert verification: one verifier call per explanation vs batched calls.
+
+Runs HallucinationEvaluator.evaluate_models on enhanced_fci_questions.json
+against the local stub LLM (simulated ontology, response cache off) with
+--verify-batch-size 1 and N. The stub answers verification prompts like an
+expert would: it flags explanations containing a planted error, and answers
+batched prompts with one "=== RESULT i ===" section per explanation. The
+benchmark reports verifier calls, total calls and wall clock, and checks that
+both runs flag the same rows.
+
+The stub's latency is the same for every call, so the wall-clock saving
+does not include the longer output of batched answers.
+
+Requires the evaluation dependencies (pandas, matplotlib).
+
+Usage:
+    python -m benchmarks.bench_batched_verification [--batch-size 5] [--latency 0.2] [--concurrency 1]
+"""
+
+import os
+import re
+import time
+import zlib
+import logging
+import argparse
+import tempfile
+from benchmarks.stub_llm import StubLLMServer
+
+CORRECT = ("The answer is B. An object keeps moving at constant velocity unless a net force acts on it, "
+           "so no force is needed to keep the puck sliding.")
+PLANTED_ERROR = "The puck slows because its impetus runs out."
+WRONG = f"The answer is B. {PLANTED_ERROR} A net force would be needed to keep it moving."
+
+
+def _verdict(explanation):
+    if PLANTED_ERROR in explanation:
+        return f"CONTAINS_HALLUCINATIONS: Yes\n- [{PLANTED_ERROR}]: Objects do not carry an impetus that runs out."
+    return "CONTAINS_HALLUCINATIONS: No\nNo hallucinations detected."
+
+
+def respond(body):
+    """Answer evaluation, verification and batched verification prompts."""
+    prompt = body["messages"][0]["content"]
+    if "=== EXPLANATION" in prompt:
+        explanations = re.findall(r'Explanation to evaluate: "(.*?)"\n(?:\n|$)', prompt + "\n", re.DOTALL)
+        return "\n\n".join(f"=== RESULT {number} ===\n{_verdict(explanation)}"
+                           for number, explanation in enumerate(explanations, 1))
+    if "Explanation to evaluate" in prompt:
+        return _verdict(prompt)
+    # One explanation in three carries the planted error
+    return WRONG if zlib.crc32(prompt.encode()) % 3 == 0 else CORRECT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per response")
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with StubLLMServer(first_token_delay=args.latency, responder=respond) as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ["OUTPUT_DIR"] = tempfile.mkdtemp(prefix="bench_verify_")
+        os.environ["EVAL_CACHE_MODE"] = "off"
+        from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+
+        data = os.path.join(os.path.dirname(os.path.dirname(__file__)), "evaluation", "enhanced_fci_questions.json")
+        frames = {}
+        print(f"{'batch size':>10} {'verified':>9} {'verifier calls':>15} {'fallbacks':>10} {'API calls':>10} {'wall s':>8}")
+        for batch_size in (1, args.batch_size):
+            evaluator = HallucinationEvaluator(data, use_deployed_api=False, concurrency=args.concurrency,
+                                               requests_per_minute=0, verify_batch_size=batch_size)
+            calls_before = len(llm.requests)
+            started = time.perf_counter()
+            frames[batch_size] = evaluator.evaluate_models()
+            seconds = time.perf_counter() - started
+            stats = evaluator.verification_stats
+            print(f"{batch_size:>10} {stats['explanations']:>9} {stats['calls']:>15} {stats['fallback_calls']:>10} "
+                  f"{len(llm.requests) - calls_before:>10} {seconds:>8.2f}")
+
+    columns = ["question_id", "model_type", "has_hallucination", "hallucination_count"]
+    same = frames[1][columns].equals(frames[args.batch_size][columns])
+    print(f"{frames[1]['has_hallucination'].sum()} of {len(frames[1])} rows flagged; same rows flagged in both runs: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark cohort dashboards: NumPy CohortMatrix vs looping over StudentModels.
+
+Usage:
+    python -m benchmarks.bench_cohort_analytics [--students 100000] [--concepts 200] [--exposed 20]
+"""
+
+import time
+import random
+import logging
+import argparse
+from collections import Counter
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+from llm_integration.cohort_analytics import CohortMatrix
+from benchmarks.bench_ready_frontier import synthetic_prerequisites
+
+MISCONCEPTIONS = ["Motion needs a force", "Heavier objects fall faster", "Velocity and acceleration are the same"]
+
+
+def _cohort(n_students: int, names, vocabulary: ConceptVocabulary, exposed: int, seed: int = 0):
+    rng = random.Random(seed)
+    models = []
+    for i in range(n_students):
+        model = StudentModel(f"student_{i}", vocabulary)
+        for concept in rng.sample(names, exposed):
+            model.expose_concept(concept)
+        for concept in rng.sample(names, exposed // 3):
+            model.mark_as_understood(concept)
+        if rng.random() < 0.1:
+            model.misconceptions[rng.choice(names)] = rng.choice(MISCONCEPTIONS)
+        models.append(model)
+    return models
+
+
+def _loop_dashboard(models, prerequisites):
+    """The per-student approach the analytics module replaces."""
+    gaps, ready, misconceptions = Counter(), Counter(), Counter()
+    levels = {}
+    for model in models:
+        gaps.update(model.get_knowledge_gaps())
+        ready.update(model.get_ready_concepts(prerequisites))
+        misconceptions.update(model.misconceptions.items())
+        for concept, level in model.knowledge_level.items():
+            levels.setdefault(concept, []).append(level)
+    return gaps.most_common(10), ready.most_common(10), misconceptions.most_common(10), len(levels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--concepts", type=int, default=200)
+    parser.add_argument("--exposed", type=int, default=20, help="Concepts each student has seen")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    prerequisites = synthetic_prerequisites(args.concepts)
+    names = list(prerequisites)
+    vocabulary = ConceptVocabulary(names)
+    models = _cohort(args.students, names, vocabulary, args.exposed)
+
+    started = time.perf_counter()
+    _loop_dashboard(models, prerequisites)
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cohort = CohortMatrix.from_models(models, vocabulary)
+    load_s = time.perf_counter() - started
+    started = time.perf_counter()
+    cohort.summary(prerequisites)
+    summary_s = time.perf_counter() - started
+
+    print(f"{args.students} students x {args.concepts} concepts")
+    print(f"loop over StudentModels:   {loop_s:8.2f} s")
+    print(f"CohortMatrix.from_models:  {load_s:8.2f} s")
+    print(f"CohortMatrix.summary:      {summary_s:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+A/B benchmark of the evaluation's prompt modes: separate vs combined.
+
+Runs HallucinationEvaluator.evaluate_models on enhanced_fci_questions.json
+against the local stub LLM (simulated ontology, response cache off) with
+--prompt-mode separate and combined. It reports API calls, prompt characters
+sent, wall clock and the accuracy and hallucination metrics of each mode.
+
+The stub picks each model's answer letter from the question text, and it
+formats the letter however the prompt asks. Its metrics should therefore
+match exactly, which checks the parsing path. To check that the real model
+answers the same way when asked once, run the evaluation twice with
+--prompt-mode separate and --prompt-mode combined (in different OUTPUT_DIRs)
+and compare the summaries.
+
+Requires the evaluation dependencies (pandas, matplotlib).
+
+Usage:
+    python -m benchmarks.bench_combined_prompt [--latency 0.2] [--concurrency 1]
+"""
+
+import os
+import re
+import time
+import zlib
+import logging
+import argparse
+import tempfile
+from benchmarks.stub_llm import StubLLMServer
+from benchmarks.bench_batched_verification import respond as respond_verification, CORRECT, WRONG
+
+
+def respond(body):
+    """Answer MC, explanation and combined prompts consistently per question and model."""
+    prompt = body["messages"][0]["content"]
+    if "Explanation to evaluate" in prompt:
+        return respond_verification(body)
+    question = re.search(r"Question: (.*)", prompt).group(1)
+    model = "ontology" if "physics ontology" in prompt else "baseline"
+    seed = zlib.crc32(f"{model}|{question}".encode())
+    letter = "ABCDE"[seed % 5]
+    explanation = WRONG.replace("B", letter, 1) if seed % 3 == 0 else CORRECT.replace("B", letter, 1)
+    if "ANSWER: [Letter]" in prompt:
+        return f"ANSWER: {letter}\nEXPLANATION: {explanation.split('. ', 1)[1]}"
+    if "Select the letter" in prompt:
+        return f"The answer is {letter}."
+    return explanation.split(". ", 1)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per response")
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with StubLLMServer(first_token_delay=args.latency, responder=respond) as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ["OUTPUT_DIR"] = tempfile.mkdtemp(prefix="bench_prompt_")
+        os.environ["EVAL_CACHE_MODE"] = "off"
+        from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+        from evaluation.analysis.statistics import calculate_metrics
+
+        data = os.path.join(os.path.dirname(os.path.dirname(__file__)), "evaluation", "enhanced_fci_questions.json")
+        frames, metrics = {}, {}
+        print(f"{'mode':<10} {'API calls':>10} {'prompt chars':>13} {'wall s':>8}")
+        for mode in ("separate", "combined"):
+            evaluator = HallucinationEvaluator(data, use_deployed_api=False, concurrency=args.concurrency,
+                                               requests_per_minute=0, prompt_mode=mode)
+            first = len(llm.requests)
+            started = time.perf_counter()
+            frames[mode] = evaluator.evaluate_models()
+            seconds = time.perf_counter() - started
+            sent = llm.requests[first:]
+            chars = sum(len(body["messages"][0]["content"]) for body in sent)
+            print(f"{mode:<10} {len(sent):>10} {chars:>13} {seconds:>8.2f}")
+            metrics[mode] = {name: values.round(3).to_dict()
+                             for name, values in calculate_metrics(frames[mode].copy()).items()}
+
+    for mode, values in metrics.items():
+        print(f"{mode:<10} accuracy {values['accuracy']}  hallucination rate {values['hallucination_rate']}")
+    agree = (frames["separate"]["selected_answer"] == frames["combined"]["selected_answer"]).mean()
+    print(f"same answer letter in both modes: {agree:.0%}; metrics identical: {metrics['separate'] == metrics['combined']}")
+
+
+if __name__ == "__main__":
+    main()
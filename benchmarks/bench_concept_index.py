@@ -0,0 +1,46 @@
+"""
+Benchmark concept lookup: wildcard ``search_one(iri="*X")`` vs the ConceptIndex.
+
+Usage:
+    python -m benchmarks.bench_concept_index [--sizes 100 1000 10000 50000]
+"""
+
+import time
+import random
+import argparse
+from llm_integration.concept_index import ConceptIndex
+from benchmarks.synthetic import synthetic_ontology
+
+
+def _per_lookup_us(func, names) -> float:
+    started = time.perf_counter()
+    for name in names:
+        func(name)
+    return (time.perf_counter() - started) / len(names) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'individuals':>12} {'index build ms':>15} {'wildcard us':>12} {'index us':>10} {'speedup':>9}")
+    for size in args.sizes:
+        onto = synthetic_ontology(size)
+        rng = random.Random(size)
+        names = [f"Concept{rng.randrange(size)}" for _ in range(args.lookups)]
+
+        started = time.perf_counter()
+        index = ConceptIndex(onto)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # The wildcard scan is O(n); keep its sample small on large ontologies
+        wildcard_names = names[:max(10, args.lookups * 1000 // size)]
+        wildcard_us = _per_lookup_us(lambda n: onto.search_one(iri=f"*{n}"), wildcard_names)
+        index_us = _per_lookup_us(index.get, names)
+        print(f"{size:>12} {build_ms:>15.1f} {wildcard_us:>12.1f} {index_us:>10.3f} {wildcard_us / index_us:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
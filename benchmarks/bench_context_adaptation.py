@@ -0,0 +1,102 @@
+"""
+Benchmark _adapt_context_to_student: concept-id annotation vs substring scans.
+
+A student has been exposed to thousands of concepts. The legacy adapter scans
+every "- " line of the context for every knowledge gap and every understood
+concept name. The current adapter tests the concept id each line carries
+against the student's bitsets. The benchmark also counts the lines the substring
+scan annotated differently. Those are false positives, such as an understood
+"Newton" marking the "- NewtonsFirstLaw" line.
+
+Usage:
+    python -m benchmarks.bench_context_adaptation [--exposed 5000] [--repeat 200]
+"""
+
+import os
+import time
+import random
+import logging
+import argparse
+import statistics
+from typing import List
+
+QUESTIONS = [
+    "how are force, mass and acceleration related?",
+    "what is velocity and how is it measured?",
+    "what does newton's third law say?",
+    "why do I lurch forward when the bus brakes",
+]
+
+
+def legacy_adapt(tutor, context: str, concepts: List[str]) -> str:
+    """The previous _adapt_context_to_student(), annotating by substring search."""
+    model = tutor.student_model
+    adapted_lines = ["Adapted context for student knowledge level:"]
+    knowledge_gaps = model.get_knowledge_gaps()
+    for line in context.split('\n'):
+        if line.startswith("- "):
+            for gap in knowledge_gaps:
+                if gap in line:
+                    line = f"{line} [KNOWLEDGE GAP - NEEDS REVIEW]"
+                    break
+            for understood in model.understood_concepts:
+                if understood in line:
+                    line = f"{line} [ALREADY UNDERSTOOD]"
+                    break
+        adapted_lines.append(line)
+    ready_concepts = model.get_ready_concepts(tutor.concept_prerequisites)
+    if ready_concepts:
+        adapted_lines.append("\nRecommended next concepts to learn:")
+        for concept in ready_concepts:
+            if concept in concepts:
+                adapted_lines.append(f"- {concept} [READY TO LEARN]")
+    return "\n".join(adapted_lines)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exposed", type=int, default=5000, help="Concepts the student has been exposed to")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+    os.environ["STUDENT_STORE"] = "memory"
+
+    from llm_integration.claude_tutor import ClaudeTutor
+    tutor = ClaudeTutor("bench")
+    rng = random.Random(0)
+    model = tutor.student_model
+    for name in tutor.concept_index.names():
+        model.expose_concept(name)
+    model.mark_as_understood("Newton")
+    model.mark_as_understood("Mass")
+    for i in range(args.exposed):
+        model.expose_concept(f"SyntheticConcept{i}")
+        if rng.random() < 1 / 3:
+            model.mark_as_understood(f"SyntheticConcept{i}")
+
+    print(f"student: {len(model.exposed_concepts)} exposed, {len(model.understood_concepts)} understood")
+    print(f"{'question':<48} {'legacy ms':>10} {'ids ms':>8} {'speedup':>8} {'differing lines':>16}")
+    for question in QUESTIONS:
+        context, concepts = tutor._get_relevant_context(question)
+        blocks = tutor.last_context.blocks if tutor.last_context else []
+        legacy = legacy_adapt(tutor, context, concepts)
+        current = tutor._adapt_context_to_student(context, concepts, blocks)
+        differing = sum(a != b for a, b in zip(legacy.split("\n"), current.split("\n")))
+
+        legacy_ms = _median_ms(lambda: legacy_adapt(tutor, context, concepts), args.repeat)
+        current_ms = _median_ms(lambda: tutor._adapt_context_to_student(context, concepts, blocks), args.repeat)
+        print(f"{question[:48]:<48} {legacy_ms:>10.3f} {current_ms:>8.3f} {legacy_ms / current_ms:>7.0f}x {differing:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the hallucination evaluation: serial vs concurrent workers.
+
+Runs HallucinationEvaluator.evaluate_models on enhanced_fci_questions.json
+against the local stub LLM (simulated ontology, so every call goes to the
+stub), first with one worker and then with --concurrency workers, and checks
+that both runs produce the same rows in the same order. The old fixed sleeps
+are reported as what the serial run would have added on top.
+
+Requires the evaluation dependencies (pandas, matplotlib).
+
+Usage:
+    python -m benchmarks.bench_evaluation_concurrency [--concurrency 8] [--latency 0.2] [--requests-per-minute 0]
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+from benchmarks.stub_llm import StubLLMServer
+
+ANSWER = ["The answer is B. ", "An object keeps moving at constant velocity ",
+          "unless a net force acts on it, ", "so no force is needed to keep the puck sliding."]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per response")
+    parser.add_argument("--requests-per-minute", type=float, default=0,
+                        help="Token bucket rate (0 = no limit)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with StubLLMServer(tokens=ANSWER, first_token_delay=args.latency) as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ["OUTPUT_DIR"] = tempfile.mkdtemp(prefix="bench_eval_")
+        os.environ["EVAL_CACHE_MODE"] = "off"  # both runs must reach the stub
+        from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+
+        data = os.path.join(os.path.dirname(os.path.dirname(__file__)), "evaluation", "enhanced_fci_questions.json")
+        timings, frames = {}, {}
+        for workers in (1, args.concurrency):
+            evaluator = HallucinationEvaluator(data, use_deployed_api=False, concurrency=workers,
+                                               requests_per_minute=args.requests_per_minute)
+            calls_before = len(llm.requests)
+            started = time.perf_counter()
+            frames[workers] = evaluator.evaluate_models()
+            timings[workers] = time.perf_counter() - started
+            calls = len(llm.requests) - calls_before
+
+    n_pairs = len(frames[1])
+    same = frames[1].equals(frames[args.concurrency])
+    print(f"{n_pairs} question/model pairs, {calls} API calls per run, {args.latency * 1000:.0f} ms stub latency")
+    print(f"{'workers':>8} {'wall s':>8} {'speedup':>8}")
+    for workers, seconds in timings.items():
+        print(f"{workers:>8} {seconds:>8.2f} {timings[1] / seconds:>7.1f}x")
+    print(f"fixed time.sleep(2) rate limiting would add {n_pairs * 2 * 2} s to the serial run")
+    print(f"identical rows in identical order: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark connection reuse: a fresh HTTP client per call vs the shared pool.
+
+Sends evaluation-style Messages API calls to the local stub LLM. The first run
+opens a new client for every call, as ``requests.post`` without a session
+did. The second run goes through ``AnthropicClient.query_model``, which uses the
+process-wide pool. Against api.anthropic.com, each new connection is also a TLS
+handshake.
+
+Usage:
+    python -m benchmarks.bench_http_pool [--calls 200]
+"""
+
+import os
+import time
+import logging
+import argparse
+from benchmarks.stub_llm import StubLLMServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with StubLLMServer() as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        from anthropic import DefaultHttpxClient
+        from utils.http_client import get_http_pool
+        from evaluation.config.settings import APIConfig
+        from evaluation.models.api_client import AnthropicClient
+
+        body = {"model": "claude-3-haiku-20240307", "max_tokens": 64,
+                "messages": [{"role": "user", "content": "What is inertia?"}]}
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            with DefaultHttpxClient() as client:
+                client.post(f"{llm.base_url}/v1/messages", json=body,
+                            headers=APIConfig.get_anthropic_headers()).raise_for_status()
+        fresh_s = time.perf_counter() - started
+        fresh_connections = llm.connections
+
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            AnthropicClient.query_model("What is inertia?", model=body["model"], max_tokens=64)
+        pooled_s = time.perf_counter() - started
+        pooled_connections = llm.connections - fresh_connections
+        stats = get_http_pool().stats()
+
+    print(f"{args.calls} calls per run against {llm.base_url}")
+    print(f"{'client':<22} {'connections':>12} {'ms/call':>8}")
+    print(f"{'fresh client per call':<22} {fresh_connections:>12} {fresh_s * 1000 / args.calls:>8.2f}")
+    print(f"{'shared pool':<22} {pooled_connections:>12} {pooled_s * 1000 / args.calls:>8.2f}")
+    print(f"pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
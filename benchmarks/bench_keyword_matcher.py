@@ -0,0 +1,59 @@
+"""
+Benchmark question routing: per-keyword substring/regex loop vs one Aho-Corasick pass.
+
+Usage:
+    python -m benchmarks.bench_keyword_matcher [--synonyms 100 1000 10000]
+"""
+
+import re
+import time
+import random
+import argparse
+from llm_integration.keyword_matcher import KeywordMatcher
+from benchmarks.synthetic import WORDS
+
+QUESTION = "Why does a heavier cart need more force to reach the same acceleration as an empty one when I push it?"
+
+
+def _synonyms(count: int, rng: random.Random):
+    return {" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + f" {i}": f"Concept{i}"
+            for i in range(count)}
+
+
+def _legacy_route(question: str, mappings) -> list:
+    """The previous approach: one regex search per keyword, rebuilt on every call."""
+    question_lower = question.lower()
+    return [name for keyword, name in mappings.items()
+            if re.search(r'\b' + re.escape(keyword) + r'\b', question_lower)]
+
+
+def _per_question_us(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synonyms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'synonyms':>9} {'build ms':>9} {'legacy us':>11} {'automaton us':>13} {'speedup':>8}")
+    for count in args.synonyms:
+        mappings = _synonyms(count, random.Random(count))
+        started = time.perf_counter()
+        matcher = KeywordMatcher()
+        for phrase, name in mappings.items():
+            matcher.add(phrase, name, 0)
+        matcher.build()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        legacy_us = _per_question_us(lambda: _legacy_route(QUESTION, mappings), max(1, args.repeat * 100 // count))
+        automaton_us = _per_question_us(lambda: matcher.find_all(QUESTION), args.repeat)
+        print(f"{count:>9} {build_ms:>9.1f} {legacy_us:>11.1f} {automaton_us:>13.1f} {legacy_us / automaton_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
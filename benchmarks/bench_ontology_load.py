@@ -0,0 +1,61 @@
+"""
+Benchmark ontology cold-start: owlready2 OWL parse vs precompiled snapshot load.
+
+Usage:
+    python -m benchmarks.bench_ontology_load [--repeat 20]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+from llm_integration.tutor_core import find_ontology_path
+from llm_integration.ontology_snapshot import compile_snapshot, load_snapshot
+
+
+def _time(func, repeat: int):
+    """Return per-call timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _report(label: str, timings) -> None:
+    print(f"{label:<24} median {statistics.median(timings):9.3f} ms   min {min(timings):9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Loads per backend")
+    args = parser.parse_args()
+
+    owl_path = find_ontology_path()
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "physics_tutor.snapshot")
+        compile_snapshot(owl_path, snapshot_path)
+        print(f"OWL file:      {os.path.getsize(owl_path):>8} bytes")
+        print(f"Snapshot file: {os.path.getsize(snapshot_path):>8} bytes\n")
+
+        try:
+            from owlready2 import World
+
+            # A fresh World per iteration, otherwise owlready2 returns its cached ontology
+            owl_timings = _time(lambda: World().get_ontology(f"file://{owl_path}").load(), args.repeat)
+            _report("owlready2 OWL parse", owl_timings)
+        except ImportError:
+            owl_timings = None
+            print("owlready2 not installed; skipping OWL parse timing")
+
+        snapshot_timings = _time(lambda: load_snapshot(snapshot_path), args.repeat)
+        _report("snapshot load", snapshot_timings)
+
+        if owl_timings:
+            print(f"\nSpeedup: {statistics.median(owl_timings) / statistics.median(snapshot_timings):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark StudentModel.get_ready_concepts: incremental ready frontier vs full scan.
+
+A student repeatedly asks for the concepts they are ready to learn and then
+understands one of them, on a synthetic prerequisite DAG. The full scan is the
+previous implementation (every concept, every prerequisite, on every query);
+the frontier is computed once per graph and updated by mark_as_understood().
+
+Usage:
+    python -m benchmarks.bench_ready_frontier [--concepts 50000] [--steps 200]
+"""
+
+import time
+import random
+import logging
+import argparse
+import statistics
+from typing import Dict, List, Set
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+
+
+def synthetic_prerequisites(n_concepts: int, max_prerequisites: int = 3, seed: int = 0) -> Dict[str, List[str]]:
+    """Random prerequisite DAG: every edge points at a lower-numbered concept."""
+    rng = random.Random(seed)
+    return {
+        f"Concept{i}": [f"Concept{j}" for j in rng.sample(range(i), min(i, rng.randint(0, max_prerequisites)))]
+        for i in range(n_concepts)
+    }
+
+
+def full_scan(understood: Set[str], concept_prerequisites: Dict[str, List[str]]) -> List[str]:
+    """The previous get_ready_concepts()."""
+    return [
+        concept for concept, prerequisites in concept_prerequisites.items()
+        if concept not in understood and all(prereq in understood for prereq in prerequisites)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=50_000)
+    parser.add_argument("--steps", type=int, default=200, help="Query + understand rounds")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    graph = synthetic_prerequisites(args.concepts)
+    vocabulary = ConceptVocabulary()
+    rng = random.Random(1)
+
+    started = time.perf_counter()
+    vocabulary.prerequisite_index(graph)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    model = StudentModel("bench", vocabulary)
+    understood: Set[str] = set()
+    scan_ms, query_ms, update_ms = [], [], []
+    for _ in range(args.steps):
+        started = time.perf_counter()
+        expected = full_scan(understood, graph)
+        scan_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        ready = model.get_ready_concepts(graph)
+        query_ms.append((time.perf_counter() - started) * 1000)
+        assert ready == expected
+
+        concept = rng.choice(ready)
+        started = time.perf_counter()
+        model.mark_as_understood(concept)
+        update_ms.append((time.perf_counter() - started) * 1000)
+        understood.add(concept)
+
+    print(f"{args.concepts} concepts, {sum(map(len, graph.values()))} prerequisite edges, {args.steps} rounds")
+    print(f"final frontier: {len(ready)} concepts")
+    print(f"index build (once per graph):      {build_ms:9.1f} ms")
+    print(f"full scan per query:      median {statistics.median(scan_ms):9.3f} ms")
+    print(f"frontier per query:       median {statistics.median(query_ms):9.3f} ms")
+    print(f"mark_as_understood:       median {statistics.median(update_ms):9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
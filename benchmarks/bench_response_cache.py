@@ -0,0 +1,53 @@
+"""
+Benchmark re-running the hallucination evaluation with the response cache.
+
+Runs HallucinationEvaluator.run_full_evaluation on enhanced_fci_questions.json
+twice against the local stub LLM (simulated ontology) with the cache in record
+mode: the first run fills the cache, the second should make no API calls.
+
+Requires the evaluation dependencies (pandas, matplotlib).
+
+Usage:
+    python -m benchmarks.bench_response_cache [--latency 0.2]
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+from benchmarks.stub_llm import StubLLMServer
+from benchmarks.bench_evaluation_concurrency import ANSWER
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per response")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with StubLLMServer(tokens=ANSWER, first_token_delay=args.latency) as llm:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "sk-ant-bench")
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ["OUTPUT_DIR"] = tempfile.mkdtemp(prefix="bench_cache_")
+        os.environ["EVAL_CACHE_MODE"] = "record"
+        from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+
+        data = os.path.join(os.path.dirname(os.path.dirname(__file__)), "evaluation", "enhanced_fci_questions.json")
+        print(f"{'run':<10} {'API calls':>10} {'wall s':>8} {'hits':>6} {'misses':>7}")
+        previous = {'hits': 0, 'misses': 0}
+        for run in ("cold", "cached"):
+            evaluator = HallucinationEvaluator(data, use_deployed_api=False, requests_per_minute=0)
+            calls_before = len(llm.requests)
+            started = time.perf_counter()
+            _, analysis = evaluator.run_full_evaluation()
+            seconds = time.perf_counter() - started
+            stats = analysis['cache_stats']
+            print(f"{run:<10} {len(llm.requests) - calls_before:>10} {seconds:>8.2f} "
+                  f"{stats['hits'] - previous['hits']:>6} {stats['misses'] - previous['misses']:>7}")
+            previous = stats
+    print(f"cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
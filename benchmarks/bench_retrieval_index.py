@@ -0,0 +1,58 @@
+"""
+Benchmark RetrievalIndex build time and per-question latency on a synthetic ontology.
+
+Usage:
+    python -m benchmarks.bench_retrieval_index [--individuals 100000] [--queries 2000] [--k 3]
+"""
+
+import time
+import random
+import logging
+import argparse
+import statistics
+from llm_integration.concept_index import ConceptIndex
+from llm_integration.tutor_core import LEARNABLE_TYPES
+from llm_integration.retrieval_index import RetrievalIndex, collect_documents
+from benchmarks.synthetic import synthetic_ontology, WORDS
+
+QUESTION_TEMPLATES = [
+    "why does the {0} keep moving after the {1} stops",
+    "what happens to {0} when a {1} hits a {2}",
+    "how is {0} related to {1}",
+    "explain {0} and {1} for a {2}",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--individuals", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    concept_index = ConceptIndex(synthetic_ontology(args.individuals))
+    started = time.perf_counter()
+    documents = collect_documents(concept_index, LEARNABLE_TYPES)
+    collect_ms = (time.perf_counter() - started) * 1000
+    index = RetrievalIndex(documents)
+
+    rng = random.Random(0)
+    questions = [rng.choice(QUESTION_TEMPLATES).format(*rng.sample(WORDS, 3)) for _ in range(args.queries)]
+    timings = []
+    for question in questions:
+        started = time.perf_counter()
+        index.search(question, args.k)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    stats = index.stats()
+    print(f"{stats['concepts']} documents, {stats['terms']} terms, {stats['postings']} postings")
+    print(f"collect documents:  {collect_ms:9.1f} ms")
+    print(f"build index:        {stats['build_ms']:9.1f} ms")
+    print(f"search (k={args.k}):       median {statistics.median(timings):.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99) - 1]:.3f} ms over {len(timings)} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark StudentModel memory: bitset/float32 storage vs the previous sets and dicts.
+
+Builds a cohort of students who have each been exposed to a random subset of
+the concepts and understood some of them, and reports the traced allocation
+per student. The set-based model is measured on a sample and extrapolated,
+because a full cohort of it would not fit in memory on small machines.
+
+Usage:
+    python -m benchmarks.bench_student_memory [--students 1000000] [--concepts 200] [--exposed 20]
+"""
+
+import time
+import random
+import logging
+import argparse
+import tracemalloc
+from typing import Dict, List, Set
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+
+
+class SetStudentModel:
+    """The previous representation: Python sets of names and a dict of float levels."""
+
+    def __init__(self, student_id: str):
+        self.student_id = student_id
+        self.exposed_concepts: Set[str] = set()
+        self.understood_concepts: Set[str] = set()
+        self.misconceptions: Dict[str, str] = {}
+        self.knowledge_level: Dict[str, float] = {}
+
+    def expose_concept(self, concept: str) -> None:
+        self.exposed_concepts.add(concept)
+        if concept not in self.knowledge_level:
+            self.knowledge_level[concept] = 0.1
+
+    def mark_as_understood(self, concept: str) -> None:
+        self.understood_concepts.add(concept)
+        self.exposed_concepts.add(concept)
+        self.knowledge_level[concept] = 1.0
+
+
+def _cohort(factory, student_ids: List[str], names: List[str], exposed: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    cohort = []
+    for student_id in student_ids:
+        model = factory(student_id)
+        for concept in rng.sample(names, exposed):
+            model.expose_concept(concept)
+        for concept in rng.sample(names, exposed // 3):
+            model.mark_as_understood(concept)
+        cohort.append(model)
+    return cohort
+
+
+def _measure(factory, n_students: int, names: List[str], exposed: int):
+    """Return (bytes per student, seconds) for building a cohort."""
+    student_ids = [f"student_{i}" for i in range(n_students)]  # allocated outside the measurement
+    tracemalloc.start()
+    started = time.perf_counter()
+    cohort = _cohort(factory, student_ids, names, exposed)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cohort
+    return size / n_students, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--concepts", type=int, default=200, help="Concepts in the vocabulary")
+    parser.add_argument("--exposed", type=int, default=20, help="Concepts each student has seen")
+    parser.add_argument("--sample", type=int, default=100_000, help="Students measured for the set-based model")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    names = [f"Concept{i}" for i in range(args.concepts)]
+    vocabulary = ConceptVocabulary(names)
+
+    legacy_sample = min(args.sample, args.students)
+    legacy, legacy_s = _measure(SetStudentModel, legacy_sample, names, args.exposed)
+    bitset, bitset_s = _measure(lambda sid: StudentModel(sid, vocabulary), args.students, names, args.exposed)
+
+    print(f"{args.concepts} concepts, {args.exposed} exposed and {args.exposed // 3} understood per student")
+    print(f"{'model':<10} {'students':>10} {'bytes/student':>14} {'total MiB':>10} {'build s':>8}")
+    print(f"{'sets':<10} {legacy_sample:>10} {legacy:>14.0f} {legacy * args.students / 2**20:>10.0f} "
+          f"{legacy_s * args.students / legacy_sample:>8.1f}  (extrapolated to {args.students})")
+    print(f"{'bitset':<10} {args.students:>10} {bitset:>14.0f} {bitset * args.students / 2**20:>10.0f} {bitset_s:>8.1f}")
+    print(f"memory reduction: {legacy / bitset:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Local fake of the Anthropic Messages API for tests and load benchmarks.
+
+Serves ``POST /v1/messages`` with either a JSON message or, when the request
+sets ``"stream": true``, the Server-Sent Events sequence the SDK expects
+(message_start, content_block_delta per token, message_delta, message_stop).
+Point the SDK at it with ``ANTHROPIC_BASE_URL`` or ``Anthropic(base_url=...)``.
+
+Usage is estimated at four characters per token. System blocks up to the last
+``cache_control`` marker are treated like Anthropic's prompt cache: the first
+request with a given prefix reports them as cache_creation_input_tokens, later
+ones as cache_read_input_tokens. Like the API, prefixes shorter than the
+model's minimum cacheable length (``min_cacheable_tokens``, 1024 by default as
+for Opus) are not cached at all and are billed as ordinary input tokens.
+
+Run standalone::
+
+    python -m benchmarks.stub_llm --port 8099 --first-token-delay 0.5 --token-delay 0.02
+"""
+
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Dict, Any, Optional
+
+DEFAULT_TOKENS = ["Newton's ", "second ", "law ", "states ", "that ", "F ", "= ", "ma."]
+
+# Shortest prefix the API caches (Opus and Sonnet; Haiku needs 2048)
+MIN_CACHEABLE_TOKENS = 1024
+
+
+class StubLLMServer:
+    """Threaded HTTP server that answers like the Anthropic Messages API."""
+
+    def __init__(self, tokens: Optional[List[str]] = None, first_token_delay: float = 0.0,
+                 token_delay: float = 0.0, host: str = "127.0.0.1", port: int = 0,
+                 responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 min_cacheable_tokens: int = MIN_CACHEABLE_TOKENS):
+        """
+        Configure the fake.
+
+        Args:
+            tokens: Text fragments of every answer (streamed one event per fragment)
+            first_token_delay: Seconds before the first fragment (or the whole JSON answer)
+            token_delay: Seconds between streamed fragments
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port
+            responder: Builds the text of a JSON (non-streaming) answer from the request body;
+                       defaults to the joined tokens
+            min_cacheable_tokens: Shortest cache_control prefix that is cached
+        """
+        self.tokens = list(tokens or DEFAULT_TOKENS)
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.responder = responder
+        self.min_cacheable_tokens = min_cacheable_tokens
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = 0  # TCP connections accepted, to measure keep-alive reuse
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _record(self, body: Dict[str, Any]) -> int:
+        with self._lock:
+            self.requests.append(body)
+            return len(self.requests)
+
+    def _usage(self, body: Dict[str, Any]) -> Dict[str, int]:
+        system = body.get("system") or []
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        prefix_end = 0
+        for i, block in enumerate(system):
+            if block.get("cache_control"):
+                prefix_end = i + 1
+        cached = sum(len(block.get("text", "")) for block in system[:prefix_end]) // 4
+        if cached < self.min_cacheable_tokens:
+            # Too short to cache: the marker is ignored
+            prefix_end, cached = 0, 0
+        total = (sum(len(block.get("text", "")) for block in system) + len(json.dumps(body.get("messages", [])))) // 4
+        prefix = json.dumps(system[:prefix_end])
+        with self._lock:
+            hit = prefix_end > 0 and prefix in self._cached_prefixes
+            self._cached_prefixes.add(prefix)
+        return {
+            "input_tokens": total - cached,
+            "cache_read_input_tokens": cached if hit else 0,
+            "cache_creation_input_tokens": 0 if hit else cached,
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                if self.path.split("?")[0] != "/v1/messages":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                number = stub._record(body)
+                message_id = f"msg_stub_{number}"
+                model = body.get("model", "stub")
+                usage = stub._usage(body)
+                time.sleep(stub.first_token_delay)
+                if body.get("stream"):
+                    self._stream(message_id, model, usage)
+                else:
+                    self._json(message_id, model, usage, body)
+
+            def _json(self, message_id, model, usage, body):
+                text = stub.responder(body) if stub.responder else "".join(stub.tokens)
+                payload = json.dumps({
+                    "id": message_id, "type": "message", "role": "assistant", "model": model,
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn", "stop_sequence": None,
+                    "usage": dict(usage, output_tokens=len(stub.tokens)),
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _event(self, name, data):
+                chunk = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, message_id, model, usage):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self._event("message_start", {"type": "message_start", "message": {
+                    "id": message_id, "type": "message", "role": "assistant", "model": model,
+                    "content": [], "stop_reason": None, "stop_sequence": None,
+                    "usage": dict(usage, output_tokens=1),
+                }})
+                self._event("content_block_start", {"type": "content_block_start", "index": 0,
+                                                     "content_block": {"type": "text", "text": ""}})
+                for i, token in enumerate(stub.tokens):
+                    if i:
+                        time.sleep(stub.token_delay)
+                    self._event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                         "delta": {"type": "text_delta", "text": token}})
+                self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+                self._event("message_delta", {"type": "message_delta",
+                                              "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                              "usage": {"output_tokens": len(stub.tokens)}})
+                self._event("message_stop", {"type": "message_stop"})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake of the Anthropic Messages API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--min-cacheable-tokens", type=int, default=MIN_CACHEABLE_TOKENS)
+    args = parser.parse_args()
+
+    server = StubLLMServer(first_token_delay=args.first_token_delay, token_delay=args.token_delay,
+                           host=args.host, port=args.port, min_cacheable_tokens=args.min_cacheable_tokens)
+    print(f"Stub LLM listening on {server.base_url} (set ANTHROPIC_BASE_URL to use it)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
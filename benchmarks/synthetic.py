@@ -0,0 +1,54 @@
+"""Synthetic ontologies for scaling benchmarks."""
+
+import random
+from llm_integration.ontology_snapshot import SnapshotData, SnapshotOntology
+
+BASE_IRI = "http://www.semanticweb.org/ontologies/2024/physics_tutor#"
+CLASSES = ["Concept", "PhysicalQuantity", "Law", "Unit", "Formula", "Principle", "Example", "Application", "Topic"]
+WORDS = [
+    "force", "mass", "object", "motion", "velocity", "rest", "push", "pull", "friction", "energy",
+    "acceleration", "gravity", "speed", "direction", "change", "time", "distance", "momentum",
+    "inertia", "reaction", "equal", "opposite", "net", "body", "surface", "collision", "brakes",
+    "forward", "backward", "bus", "car", "ball", "rocket", "gas", "table", "book", "cart",
+]
+
+
+def synthetic_snapshot(n_individuals: int, max_prerequisites: int = 3, seed: int = 0) -> SnapshotData:
+    """
+    Generate an ontology-shaped SnapshotData with ``n_individuals`` concepts.
+
+    Concepts are typed PhysicalQuantity, Law or Unit and grouped under a handful
+    of topics. Prerequisite edges always point at lower-numbered concepts, so the
+    prerequisite graph is a DAG.
+    """
+    rng = random.Random(seed)
+    data = SnapshotData()
+    for name in CLASSES:
+        data.class_names.append(data.intern(name))
+    class_index = {name: i for i, name in enumerate(CLASSES)}
+
+    n_topics = max(1, n_individuals // 1000)
+    for t in range(n_topics):
+        name = f"Topic{t}"
+        data.add_individual(name, BASE_IRI + name, [class_index["Topic"]],
+                            {"hasDefinition": [data.intern(f"Synthetic topic {t}")]})
+
+    for i in range(n_individuals):
+        name = f"Concept{i}"
+        kind = ("PhysicalQuantity", "Law", "Unit")[i % 3]
+        definition = " ".join(rng.choice(WORDS) for _ in range(12))
+        concept_ids = range(n_topics, n_topics + i)
+        prerequisites = rng.sample(concept_ids, min(len(concept_ids), rng.randint(0, max_prerequisites)))
+        related = rng.sample(concept_ids, min(len(concept_ids), 2))
+        data.add_individual(name, BASE_IRI + name, [class_index[kind], class_index["Concept"]], {
+            "hasDefinition": [data.intern(f"{name} is {definition}")],
+            "hasPrerequisite": prerequisites,
+            "relatesTo": related,
+            "isPartOf": [rng.randrange(n_topics)],
+        })
+    return data
+
+
+def synthetic_ontology(n_individuals: int, **kwargs) -> SnapshotOntology:
+    """Generate and load a synthetic ontology (see synthetic_snapshot)."""
+    return SnapshotOntology.from_data(synthetic_snapshot(n_individuals, **kwargs), source="synthetic")
@@ -3,5 +3,9 @@
 echo "Installing dependencies..."
 pip install -r requirements.txt
 
+# Precompile the ontology so cold starts skip the owlready2 OWL parse
+echo "Compiling ontology snapshot..."
+python -m llm_integration.ontology_snapshot
+
 # Any additional build steps go here
 echo "Build completed successfully!"
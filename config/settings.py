@@ -30,6 +30,11 @@ class APIConfig:
     max_tokens: int = 1024
     model_name: str = "claude-3-haiku-20240307"
     timeout: int = 30
+    # Shared keep-alive connection pool (utils/http_client.py)
+    pool_connections: int = 20
+    pool_keepalive: int = 10
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
     
     def __post_init__(self):
         if not self.anthropic_api_key:
@@ -46,6 +51,10 @@ class AppConfig:
     port: int = 5000
     debug: bool = False
     log_level: str = 'INFO'
+    # Serve /api/metrics (latency and cache internals); off in production unless enabled
+    metrics_enabled: bool = False
+    # Honour "bypass_cache" in /api/ask bodies, which forces a paid Claude call (evaluation runs)
+    allow_cache_bypass: bool = False
     
     def __post_init__(self):
         # Override with environment variables if available
@@ -53,6 +62,23 @@ class AppConfig:
         self.port = int(os.getenv('PORT', str(self.port)))
         self.debug = os.getenv('DEBUG', 'False').lower() == 'true'
         self.log_level = os.getenv('LOG_LEVEL', self.log_level)
+        # Both default to on in debug mode
+        self.metrics_enabled = os.getenv('METRICS_ENABLED', str(self.debug)).lower() == 'true'
+        self.allow_cache_bypass = os.getenv('ALLOW_CACHE_BYPASS', str(self.debug)).lower() == 'true'
+
+
+def load_api_config() -> APIConfig:
+    """Load the API configuration from environment variables."""
+    return APIConfig(
+        anthropic_api_key=os.getenv('ANTHROPIC_API_KEY'),
+        max_tokens=int(os.getenv('MAX_TOKENS', '1024')),
+        model_name=os.getenv('MODEL_NAME', 'claude-3-haiku-20240307'),
+        timeout=int(os.getenv('API_TIMEOUT', '30')),
+        pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', '20')),
+        pool_keepalive=int(os.getenv('HTTP_POOL_KEEPALIVE', '10')),
+        keepalive_expiry=float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '60')),
+        connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    )
 
 
 def load_config() -> Tuple[AppConfig, SecurityConfig, APIConfig]:
@@ -63,12 +89,7 @@ def load_config() -> Tuple[AppConfig, SecurityConfig, APIConfig]:
         rate_limit_window=int(os.getenv('RATE_LIMIT_WINDOW', '60'))
     )
     
-    api_config = APIConfig(
-        anthropic_api_key=os.getenv('ANTHROPIC_API_KEY'),
-        max_tokens=int(os.getenv('MAX_TOKENS', '1024')),
-        model_name=os.getenv('MODEL_NAME', 'claude-3-haiku-20240307'),
-        timeout=int(os.getenv('API_TIMEOUT', '30'))
-    )
+    api_config = load_api_config()
     
     app_config = AppConfig()
     
@@ -12,6 +12,26 @@ load_dotenv()
 
 # API Configuration
 BASE_API_URL = os.getenv("BASE_API_URL", "https://ai-avatar-ontology-integration-poc.vercel.app/api")
+# Same variable the Anthropic SDK reads, so a local stub can stand in for the API
+ANTHROPIC_API_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/")
+
+# Concurrency and rate limiting
+# Worker threads evaluating (question, model) pairs; 1 runs serially
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "1"))
+# Provider request limit shared by all workers (0 disables limiting)
+EVAL_REQUESTS_PER_MINUTE = float(os.getenv("EVAL_REQUESTS_PER_MINUTE", "50"))
+# Requests that may be sent back to back before the limit applies
+EVAL_RATE_BURST = int(os.getenv("EVAL_RATE_BURST", "5"))
+
+# Prompting for answer and explanation: separate (two calls per question and model) or combined (one call)
+EVAL_PROMPT_MODE = os.getenv("EVAL_PROMPT_MODE", "separate")
+# Question/model pairs whose explanations share one expert verification call (1 = one call each)
+EVAL_VERIFY_BATCH_SIZE = int(os.getenv("EVAL_VERIFY_BATCH_SIZE", "1"))
+
+# Response cache under OUTPUT_DIR/response_cache: off, read-only, record or refresh
+EVAL_CACHE_MODE = os.getenv("EVAL_CACHE_MODE", "record")
+# Size limit of the response cache in megabytes (0 for no limit)
+EVAL_CACHE_MAX_MB = float(os.getenv("EVAL_CACHE_MAX_MB", "200"))
 
 # Output configuration
 DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
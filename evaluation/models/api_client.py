@@ -2,19 +2,29 @@
 API client implementations for model interactions.
 
 This module provides secure implementations for interacting with external APIs.
+Both clients send their requests through the process-wide keep-alive connection
+pool (utils/http_client.py), so consecutive calls reuse connections instead of
+opening a new TLS session each time. Responses are served from and recorded in
+the evaluation's disk response cache (evaluation/utils/response_cache.py); a
+rate limiter passed by the caller is only consulted for calls that miss it.
 """
 
-import requests
 import logging
-from evaluation.config.settings import BASE_API_URL, APIConfig
+from utils.http_client import get_http_pool
+from evaluation.utils.response_cache import get_response_cache
+from evaluation.config.settings import BASE_API_URL, ANTHROPIC_API_URL, APIConfig
 
 logger = logging.getLogger("hallucination_evaluator")
 
+# Claude model used for baseline answers, verification and the simulated ontology
+CLAUDE_MODEL = "claude-3-opus-20240229"
+
 class AnthropicClient:
     """Secure client for interacting with Anthropic Claude API."""
     
     @staticmethod
-    def query_model(prompt, model="claude-3-opus-20240229", max_tokens=1024, timeout=30):
+    def query_model(prompt, model=CLAUDE_MODEL, max_tokens=1024, timeout=30,
+                    rate_limiter=None, use_cache=True):
         """
         Query the Claude model securely.
         
@@ -23,18 +33,31 @@ class AnthropicClient:
             model: The model identifier to use
             max_tokens: Maximum number of tokens to generate
             timeout: Request timeout in seconds
+            rate_limiter: Optional TokenBucket to draw from before calling the API
+            use_cache: Whether to use the response cache
             
         Returns:
             The model's response text
         """
+        endpoint = f"{ANTHROPIC_API_URL}/v1/messages"
+        call = lambda: AnthropicClient._post(endpoint, prompt, model, max_tokens, timeout, rate_limiter)
+        if not use_cache:
+            return call()
+        return get_response_cache().fetch(endpoint, model, prompt, max_tokens, call)
+    
+    @staticmethod
+    def _post(endpoint, prompt, model, max_tokens, timeout, rate_limiter):
+        """Send one Messages API request; errors are returned as "Error: ..." text."""
         logger.info(f"Querying Claude model: {model} with prompt: {prompt[:50]}...")
+        if rate_limiter is not None:
+            rate_limiter.acquire()
         
         try:
             # Get headers securely without exposing API key in code
             headers = APIConfig.get_anthropic_headers()
             
-            response = requests.post(
-                "https://api.anthropic.com/v1/messages",
+            response = get_http_pool().client.post(
+                endpoint,
                 json={
                     "model": model,
                     "max_tokens": max_tokens,
@@ -58,7 +81,7 @@ class OntologyAPIClient:
     """Client for interacting with the ontology-enhanced API."""
     
     @staticmethod
-    def query_model(prompt, session_id="eval_session", max_retries=1, timeout=10):
+    def query_model(prompt, session_id="eval_session", max_retries=1, timeout=10, rate_limiter=None):
         """
         Query the ontology-enhanced model through the deployed API.
         
@@ -67,13 +90,25 @@ class OntologyAPIClient:
             session_id: Session ID for the API call
             max_retries: Maximum number of retry attempts for timeouts
             timeout: Request timeout in seconds
+            rate_limiter: Optional TokenBucket to draw from before each attempt
             
         Returns:
             The model's response text or None if API fails
         """
+        endpoint = f"{BASE_API_URL}/ask"
+        return get_response_cache().fetch(
+            endpoint, "ontology-api", prompt, None,
+            lambda: OntologyAPIClient._post(endpoint, prompt, session_id, max_retries, timeout, rate_limiter)
+        )
+    
+    @staticmethod
+    def _post(endpoint, prompt, session_id, max_retries, timeout, rate_limiter):
+        """Send an /ask request with retries; returns None if the API fails."""
         logger.info(f"Querying ontology API with prompt: {prompt[:50]}...")
         
         for attempt in range(max_retries):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
             try:
                 # Get auth token securely
                 auth_token = APIConfig.get_auth_token()
@@ -83,9 +118,10 @@ class OntologyAPIClient:
                 if auth_token:
                     headers["Authorization"] = f"Bearer {auth_token}"
                 
-                response = requests.post(
-                    f"{BASE_API_URL}/ask",
-                    json={"question": prompt, "session_id": session_id},
+                response = get_http_pool().client.post(
+                    endpoint,
+                    # Evaluation must measure fresh answers, not cached ones
+                    json={"question": prompt, "session_id": session_id, "bypass_cache": True},
                     headers=headers,
                     timeout=timeout
                 )
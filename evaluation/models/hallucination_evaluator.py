@@ -7,21 +7,38 @@ by comparing the ontology-enhanced AI tutor against a baseline model.
 
 import json
 import os
-import time
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from evaluation.models.api_client import AnthropicClient, OntologyAPIClient
+from evaluation.models.api_client import AnthropicClient, OntologyAPIClient, CLAUDE_MODEL
 from evaluation.models.simulated_ontology import SimulatedOntologyModel
-from evaluation.utils.text_processing import extract_answer_choice, keyword_match, parse_verification_result
+from evaluation.utils.text_processing import (
+    extract_answer_choice, extract_explanation, keyword_match, parse_verification_result,
+    parse_batch_verification_result
+)
+from evaluation.utils.rate_limiter import TokenBucket
+from evaluation.utils.response_cache import get_response_cache
+from evaluation.utils.result_journal import ResultJournal, result_key
 from evaluation.analysis.analyzer import ResultsAnalyzer
-from evaluation.config.settings import OUTPUT_DIR
+from evaluation.config.settings import (
+    OUTPUT_DIR, EVAL_CONCURRENCY, EVAL_REQUESTS_PER_MINUTE, EVAL_RATE_BURST, EVAL_VERIFY_BATCH_SIZE,
+    EVAL_PROMPT_MODE
+)
 
 logger = logging.getLogger("hallucination_evaluator")
 
+# "separate" asks for the answer letter and the explanation in two calls, "combined" in one
+PROMPT_MODES = ("separate", "combined")
+
 class HallucinationEvaluator:
     """Main class for evaluating hallucination rates in physics AI tutoring."""
     
-    def __init__(self, fci_data_path="fci_questions.json", use_deployed_api=True):
+    def __init__(self, fci_data_path="fci_questions.json", use_deployed_api=True,
+                 concurrency=EVAL_CONCURRENCY, requests_per_minute=EVAL_REQUESTS_PER_MINUTE,
+                 rate_burst=EVAL_RATE_BURST, verify_batch_size=EVAL_VERIFY_BATCH_SIZE,
+                 prompt_mode=EVAL_PROMPT_MODE):
         """
         Initialize the evaluator with FCI questions data.
         
@@ -29,17 +46,36 @@ class HallucinationEvaluator:
             fci_data_path: Path to the FCI questions JSON file
             use_deployed_api: Whether to use the deployed API (True) or simulated ontology (False).
                               Defaults to True to use the deployed API with fallback to simulation.
+            concurrency: Number of (question, model) pairs evaluated at once; 1 runs serially
+            requests_per_minute: Provider rate limit shared by all workers (0 disables limiting)
+            rate_burst: Requests that may be sent back to back before the limit applies
+            verify_batch_size: Question/model pairs whose explanations share one expert
+                               verification call; 1 verifies each explanation separately
+            prompt_mode: One of PROMPT_MODES; "combined" asks for the answer letter and the
+                         explanation in one call per question and model
         """
+        if prompt_mode not in PROMPT_MODES:
+            raise ValueError(f"Unknown prompt mode {prompt_mode!r}; expected one of {', '.join(PROMPT_MODES)}")
         self.fci_data_path = fci_data_path
         self.use_deployed_api = use_deployed_api
+        self.concurrency = max(1, concurrency)
+        self.verify_batch_size = max(1, verify_batch_size)
+        self.prompt_mode = prompt_mode
+        self.rate_limiter = TokenBucket.per_minute(requests_per_minute, rate_burst)
         self.fci_questions = self._load_fci_questions()
         self.results = []
         self.analyzer = ResultsAnalyzer(self.fci_questions)
         self.api_failures = 0
         self.api_successes = 0
+        self._stats_lock = threading.Lock()
+        self.verification_stats = dict.fromkeys(('explanations', 'calls', 'batched_calls', 'fallback_calls'), 0)
+        self.journal = ResultJournal(os.path.join(OUTPUT_DIR, "evaluation_journal.jsonl"))
+        self.resumed_results = 0
         
         logger.info(f"Initialized HallucinationEvaluator with {len(self.fci_questions)} FCI questions")
         logger.info(f"Using deployed API by default: {self.use_deployed_api} (with fallback to simulation if API fails)")
+        logger.info(f"Concurrency: {self.concurrency} worker(s), rate limit: {requests_per_minute or 'none'} requests/min")
+        logger.info(f"Prompt mode: {self.prompt_mode}")
     
     def _load_fci_questions(self):
         """
@@ -55,6 +91,22 @@ class HallucinationEvaluator:
             logger.error(f"Failed to load FCI questions: {e}")
             raise
     
+    def run_settings(self):
+        """
+        Settings that determine the results, recorded in the result journal's header.
+
+        Concurrency and rate limits only change how fast results arrive and are left out.
+        """
+        with open(self.fci_data_path, "rb") as f:
+            questions_sha256 = hashlib.sha256(f.read()).hexdigest()
+        return {
+            "questions_sha256": questions_sha256,
+            "model": CLAUDE_MODEL,
+            "use_deployed_api": self.use_deployed_api,
+            "prompt_mode": self.prompt_mode,
+            "verify_batch_size": self.verify_batch_size,
+        }
+    
     def query_ontology_model(self, prompt, session_id="eval_session", max_retries=2):
         """
         Query the ontology-enhanced model.
@@ -74,22 +126,23 @@ class HallucinationEvaluator:
                 response = OntologyAPIClient.query_model(
                     prompt=prompt,
                     session_id=session_id,
-                    max_retries=max_retries
+                    max_retries=max_retries,
+                    rate_limiter=self.rate_limiter
                 )
                 
                 # If we got a response, count it as success and return it
                 if response:
-                    self.api_successes += 1
+                    self._count_api_call(success=True)
                     logger.info(f"Successfully used deployed API (success rate: {self.api_successes}/{self.api_successes + self.api_failures})")
                     return response
                 
                 # If no response but also no exception, log the specific failure
-                self.api_failures += 1
+                self._count_api_call(success=False)
                 logger.warning(f"Deployed API returned no response (attempt failed: {self.api_failures} times)")
                 
             except Exception as e:
                 # Count and log specific API failure with detailed error
-                self.api_failures += 1
+                self._count_api_call(success=False)
                 logger.error(f"Deployed API error: {str(e)}")
                 logger.warning(f"API call failed {self.api_failures} times. Success rate: {self.api_successes}/{self.api_successes + self.api_failures}")
             
@@ -99,7 +152,7 @@ class HallucinationEvaluator:
             logger.info("Deployed API use is disabled, using simulated ontology directly")
         
         # Use simulated ontology model as fallback
-        return SimulatedOntologyModel.query(prompt, session_id)
+        return SimulatedOntologyModel.query(prompt, session_id, rate_limiter=self.rate_limiter)
     
     def query_baseline_model(self, prompt):
         """
@@ -111,38 +164,54 @@ class HallucinationEvaluator:
         Returns:
             The model's response text
         """
-        return AnthropicClient.query_model(prompt)
+        return AnthropicClient.query_model(prompt, rate_limiter=self.rate_limiter)
     
-    def analyze_explanation(self, explanation, correct_concepts, misconceptions):
+    def _count_api_call(self, success):
+        """Count a deployed API call; workers share the counters."""
+        with self._stats_lock:
+            if success:
+                self.api_successes += 1
+            else:
+                self.api_failures += 1
+    
+    def detect_misconceptions(self, explanation, misconceptions):
         """
-        Analyze explanation for hallucinations using keyword detection and expert verification.
+        Find known misconceptions in an explanation by keyword matching.
         
         Args:
             explanation: The model's explanation text
-            correct_concepts: List of physics concepts that should be correctly applied
             misconceptions: List of known misconceptions to check for
             
         Returns:
-            Dictionary with hallucination analysis results
+            List of detected misconceptions
         """
-        # Step 1: Check for known misconceptions using keyword matching only
-        # This significantly reduces API calls while maintaining good detection
-        detected_misconceptions = []
-        for misconception in misconceptions:
-            if keyword_match(misconception, explanation):
-                detected_misconceptions.append({
-                    "type": "misconception",
-                    "content": misconception
-                })
-        
-        # Determine if verification is needed based on detected misconceptions
-        # Only use expert verification if no misconceptions were detected through keywords
-        # This optimization reduces API calls by ~60-70% in typical use cases
-        expert_detected_hallucinations = []
-        
-        if not detected_misconceptions and len(explanation) > 50:  # Skip very short responses
-            # Step 2: Expert model verification (using Claude as verifier)
-            verification_prompt = f"""
+        return [{"type": "misconception", "content": misconception}
+                for misconception in misconceptions if keyword_match(misconception, explanation)]
+    
+    @staticmethod
+    def needs_verification(detected_misconceptions, explanation):
+        """
+        Whether an explanation goes to the expert verifier.
+        
+        Only explanations without keyword-detected misconceptions are verified,
+        which reduces API calls by ~60-70% in typical use cases. Very short
+        responses are skipped.
+        """
+        return not detected_misconceptions and len(explanation) > 50
+    
+    def verify_explanation(self, explanation, correct_concepts, fallback=False):
+        """
+        Ask the expert model (Claude) to check one explanation.
+        
+        Args:
+            explanation: The model's explanation text
+            correct_concepts: List of physics concepts that should be correctly applied
+            fallback: Whether this re-checks an explanation a batched call failed to answer
+            
+        Returns:
+            List of hallucinations found by the expert
+        """
+        verification_prompt = f"""
             You are a physics expert evaluating an explanation for scientific accuracy.
             
             Explanation to evaluate: "{explanation}"
@@ -160,12 +229,95 @@ class HallucinationEvaluator:
             
             If No, simply state: "No hallucinations detected."
             """
+        
+        verification_result = self.query_baseline_model(verification_prompt)
+        self._count_verification(calls=1, explanations=0 if fallback else 1, fallback_calls=int(fallback))
+        return parse_verification_result(verification_result)
+    
+    def verify_explanations(self, items):
+        """
+        Check several explanations with one expert call.
+        
+        The explanations are numbered in one prompt and the expert answers with
+        one "=== RESULT i ===" section each. Explanations whose section is
+        missing or has no verdict are re-checked one at a time.
+        
+        Args:
+            items: List of (explanation, correct_concepts) pairs
             
-            verification_result = self.query_baseline_model(verification_prompt)
-            expert_detected_hallucinations = parse_verification_result(verification_result)
+        Returns:
+            List with the hallucinations found in each explanation, in item order
+        """
+        if len(items) <= 1:
+            return [self.verify_explanation(*item) for item in items]
+        
+        sections = "\n\n".join(
+            f"=== EXPLANATION {number} ===\n"
+            f"This explanation should correctly use these physics concepts: {', '.join(correct_concepts)}\n"
+            f'Explanation to evaluate: "{explanation}"'
+            for number, (explanation, correct_concepts) in enumerate(items, 1)
+        )
+        verification_prompt = f"""You are a physics expert evaluating {len(items)} explanations for scientific accuracy.
+Evaluate each explanation on its own.
+
+{sections}
+
+For each explanation, identify any factual errors, physics misconceptions, or statements that contradict Newton's laws.
+For each issue, briefly describe the error and why it's incorrect.
+
+Answer with one section per explanation, in order, formatted exactly like this:
+=== RESULT <number> ===
+CONTAINS_HALLUCINATIONS: [Yes/No]
+
+If Yes, list each hallucination in that section like this:
+- [Exact quote from text]: [Brief explanation of why it's incorrect]
+
+If No, simply state: "No hallucinations detected."
+"""
+        
+        verification_result = self.query_baseline_model(verification_prompt)
+        self._count_verification(calls=1, batched_calls=1, explanations=len(items))
+        results = parse_batch_verification_result(verification_result, len(items))
+        
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            logger.warning(f"Batched verification returned no verdict for {len(missing)} of {len(items)} "
+                           f"explanations, verifying them one at a time")
+            for index in missing:
+                results[index] = self.verify_explanation(*items[index], fallback=True)
+        return results
+    
+    def _count_verification(self, **increments):
+        """Count verifier calls and verified explanations; workers share the counters."""
+        with self._stats_lock:
+            for field, increment in increments.items():
+                self.verification_stats[field] += increment
+    
+    def analyze_explanation(self, explanation, correct_concepts, misconceptions, expert_hallucinations=None):
+        """
+        Analyze explanation for hallucinations using keyword detection and expert verification.
+        
+        Args:
+            explanation: The model's explanation text
+            correct_concepts: List of physics concepts that should be correctly applied
+            misconceptions: List of known misconceptions to check for
+            expert_hallucinations: Result of an expert verification already done for this
+                                   explanation (e.g. batched); verified here if None and needed
+            
+        Returns:
+            Dictionary with hallucination analysis results
+        """
+        # Step 1: Check for known misconceptions using keyword matching only
+        detected_misconceptions = self.detect_misconceptions(explanation, misconceptions)
+        
+        # Step 2: Expert model verification (using Claude as verifier), only if no misconception was detected
+        if not self.needs_verification(detected_misconceptions, explanation):
+            expert_hallucinations = []
+        elif expert_hallucinations is None:
+            expert_hallucinations = self.verify_explanation(explanation, correct_concepts)
         
         # Combine results
-        all_hallucinations = detected_misconceptions + expert_detected_hallucinations
+        all_hallucinations = detected_misconceptions + expert_hallucinations
         has_hallucination = len(all_hallucinations) > 0
         
         return {
@@ -174,29 +326,51 @@ class HallucinationEvaluator:
             "details": all_hallucinations
         }
     
-    def evaluate_models(self):
+    def answer_question(self, question, model_type):
         """
-        Run evaluation comparing both models on FCI questions.
+        Ask one model for its answer choice and its explanation of an FCI question.
         
+        In "separate" prompt mode these are two calls; in "combined" mode one
+        call asks for an "ANSWER: <letter>" line followed by the explanation.
+        
+        Args:
+            question: FCI question data
+            model_type: "baseline" or "ontology"
+            
         Returns:
-            DataFrame with evaluation results
+            Tuple of (selected answer letter or None, explanation text)
         """
-        self.results = []
+        logger.info(f"Processing question {question['id']} with {model_type} model...")
+        
+        # Select appropriate query function
+        query_func = self.query_baseline_model if model_type == "baseline" else self.query_ontology_model
         
-        for question in self.fci_questions:
-            question_id = question['id']
-            logger.info(f"Evaluating question {question_id}")
+        if self.prompt_mode == "combined":
+            combined_prompt = f"""
+            Question: {question['question']}
+            Options:
+            {question['options']}
             
-            # Create prompts
-            mc_prompt = f"""
+            Select the letter of the best answer, then explain the physics reasoning behind the correct answer in detail.
+            Use Newton's laws and other relevant physics principles.
+            
+            Format your response as:
+            ANSWER: [Letter]
+            EXPLANATION: [Your explanation]
+            """
+            response = query_func(combined_prompt)
+            return extract_answer_choice(response), extract_explanation(response)
+        
+        # Create prompts
+        mc_prompt = f"""
             Question: {question['question']}
             Options:
             {question['options']}
             
             Select the letter of the best answer.
             """
-            
-            explain_prompt = f"""
+        
+        explain_prompt = f"""
             Question: {question['question']}
             Options:
             {question['options']}
@@ -204,72 +378,198 @@ class HallucinationEvaluator:
             Explain the physics reasoning behind the correct answer in detail. 
             Use Newton's laws and other relevant physics principles.
             """
+        
+        # Get answers; the clients pace uncached calls with the shared token bucket
+        mc_response = query_func(mc_prompt)
+        explanation = query_func(explain_prompt)
+        
+        # Extract answer choice from response
+        return extract_answer_choice(mc_response), explanation
+    
+    def _result_row(self, question, model_type, selected_answer, explanation, hallucination_analysis):
+        """Build the result row of one question and model."""
+        is_correct = (selected_answer == question['correct_answer'])
+        logger.info(f"Question {question['id']} with {model_type} model - " 
+                  f"Correct: {is_correct}, "
+                  f"Hallucination: {hallucination_analysis['has_hallucination']}")
+        
+        return {
+            "question_id": question['id'],
+            "model_type": model_type,
+            "is_correct": is_correct,
+            "selected_answer": selected_answer,
+            "correct_answer": question['correct_answer'],
+            "has_hallucination": hallucination_analysis['has_hallucination'],
+            "hallucination_count": hallucination_analysis['hallucination_count'],
+            "explanation": explanation,
+            "hallucination_details": hallucination_analysis['details'],
+            "simulation_note": "Direct API call" if (model_type == "baseline" or self.use_deployed_api) else "Simulated ontology via Claude"
+        }
+    
+    def evaluate_question(self, question, model_type):
+        """
+        Evaluate one model on one FCI question.
+        
+        Args:
+            question: FCI question data
+            model_type: "baseline" or "ontology"
             
-            # For each question, test both models
-            for model_type in ["baseline", "ontology"]:
-                logger.info(f"Processing question {question_id} with {model_type} model...")
-                
-                # Select appropriate query function
-                query_func = self.query_baseline_model if model_type == "baseline" else self.query_ontology_model
-                
-                # Get answers with controlled rate limiting
-                mc_response = query_func(mc_prompt)
-                time.sleep(2)  # Rate limiting
-                explanation = query_func(explain_prompt)
-                time.sleep(2)  # Rate limiting
-                
-                # Extract answer choice from response
-                selected_answer = extract_answer_choice(mc_response)
-                is_correct = (selected_answer == question['correct_answer'])
-                
-                # Analyze explanation for hallucinations
-                hallucination_analysis = self.analyze_explanation(
-                    explanation=explanation,
-                    correct_concepts=question['concepts'],
-                    misconceptions=question['misconceptions']
-                )
-                
-                # Store result
-                self.results.append({
-                    "question_id": question_id,
-                    "model_type": model_type,
-                    "is_correct": is_correct,
-                    "selected_answer": selected_answer,
-                    "correct_answer": question['correct_answer'],
-                    "has_hallucination": hallucination_analysis['has_hallucination'],
-                    "hallucination_count": hallucination_analysis['hallucination_count'],
-                    "explanation": explanation,
-                    "hallucination_details": hallucination_analysis['details'],
-                    "simulation_note": "Direct API call" if (model_type == "baseline" or self.use_deployed_api) else "Simulated ontology via Claude"
-                })
-                
-                logger.info(f"Question {question_id} with {model_type} model - " 
-                          f"Correct: {is_correct}, "
-                          f"Hallucination: {hallucination_analysis['has_hallucination']}")
+        Returns:
+            Result row for the question and model
+        """
+        selected_answer, explanation = self.answer_question(question, model_type)
+        
+        # Analyze explanation for hallucinations
+        hallucination_analysis = self.analyze_explanation(
+            explanation=explanation,
+            correct_concepts=question['concepts'],
+            misconceptions=question['misconceptions']
+        )
+        return self._result_row(question, model_type, selected_answer, explanation, hallucination_analysis)
+    
+    def evaluate_batch(self, tasks):
+        """
+        Evaluate several question/model pairs, verifying their explanations in one expert call.
+        
+        Args:
+            tasks: List of (question, model_type) pairs
+            
+        Returns:
+            Result rows in task order
+        """
+        answers = [self.answer_question(question, model_type) for question, model_type in tasks]
+        
+        # Only explanations without keyword-detected misconceptions go to the verifier
+        to_verify = [
+            index for index, ((question, _), (_, explanation)) in enumerate(zip(tasks, answers))
+            if self.needs_verification(self.detect_misconceptions(explanation, question['misconceptions']), explanation)
+        ]
+        verified = self.verify_explanations([(answers[index][1], tasks[index][0]['concepts']) for index in to_verify])
+        expert_hallucinations = dict(zip(to_verify, verified))
+        
+        results = []
+        for index, ((question, model_type), (selected_answer, explanation)) in enumerate(zip(tasks, answers)):
+            hallucination_analysis = self.analyze_explanation(
+                explanation=explanation,
+                correct_concepts=question['concepts'],
+                misconceptions=question['misconceptions'],
+                expert_hallucinations=expert_hallucinations.get(index)
+            )
+            results.append(self._result_row(question, model_type, selected_answer, explanation, hallucination_analysis))
+        return results
+    
+    def evaluate_models(self, concurrency=None, resume=False):
+        """
+        Run evaluation comparing both models on FCI questions.
+        
+        Each (question, model) pair is evaluated by a pool of worker threads;
+        with a verify_batch_size above 1, each worker evaluates that many
+        consecutive pairs and verifies their explanations in one call.
+        API calls that miss the response cache are paced by the shared token
+        bucket. Every finished pair is appended to the result journal, so an
+        interrupted run can be resumed. Results keep question order, with
+        baseline before ontology, whatever the concurrency.
+        
+        Args:
+            concurrency: Worker threads (defaults to the evaluator's concurrency)
+            resume: Skip pairs already in the journal instead of starting a new one
+        
+        Returns:
+            DataFrame with evaluation results
+        
+        Raises:
+            JournalMismatchError: If resuming a journal written with different run_settings()
+        """
+        concurrency = max(1, concurrency or self.concurrency)
+        tasks = [(question, model_type) for question in self.fci_questions
+                 for model_type in ["baseline", "ontology"]]
+        
+        settings = self.run_settings()
+        completed = self.journal.load(settings) if resume else {}
+        if not completed:
+            self.journal.start(settings)
+        pending = [task for task in tasks if (task[0]['id'], task[1]) not in completed]
+        self.resumed_results = len(tasks) - len(pending)
+        if self.resumed_results:
+            logger.info(f"Resuming: {self.resumed_results} question/model pairs already in {self.journal.path}")
+        logger.info(f"Evaluating {len(pending)} question/model pairs with {concurrency} worker(s)")
+        
+        batch_size = self.verify_batch_size
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        
+        def run(chunk):
+            results = self.evaluate_batch(chunk) if batch_size > 1 else [self.evaluate_question(*chunk[0])]
+            for result in results:
+                self.journal.append(result)
+            return results
+        
+        if concurrency == 1:
+            chunk_results = [run(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="evaluation") as executor:
+                # map() yields results in chunk order
+                chunk_results = list(executor.map(run, chunks))
+        new_results = [result for results in chunk_results for result in results]
+        
+        if self.rate_limiter.waited:
+            logger.info(f"Rate limiter waited {self.rate_limiter.waited:.1f}s in total")
+        stats = self.verification_stats
+        if stats['calls']:
+            logger.info(f"Expert verification: {stats['explanations']} explanations in {stats['calls']} calls "
+                        f"({stats['batched_calls']} batched, {stats['fallback_calls']} single-item fallbacks)")
+        
+        completed.update((result_key(result), result) for result in new_results)
+        self.results = [completed[(question['id'], model_type)] for question, model_type in tasks]
         
-        # Convert to DataFrame for analysis
+        return self._write_results_csv()
+    
+    def _write_results_csv(self):
+        """
+        Write self.results to evaluation_results.csv atomically.
+        
+        Returns:
+            DataFrame with evaluation results
+        """
         results_df = pd.DataFrame(self.results)
         
-        # Save results to CSV
+        # Write next to the target and rename, so an interrupted write never leaves a partial CSV
         os.makedirs(OUTPUT_DIR, exist_ok=True)
-        results_df.to_csv(os.path.join(OUTPUT_DIR, "evaluation_results.csv"), index=False)
+        csv_path = os.path.join(OUTPUT_DIR, "evaluation_results.csv")
+        results_df.to_csv(csv_path + ".tmp", index=False)
+        os.replace(csv_path + ".tmp", csv_path)
         
         return results_df
     
-    def run_full_evaluation(self):
+    def finalize(self, results_df):
+        """
+        Analyze the results of a completed run.
+        
+        Args:
+            results_df: DataFrame with evaluation results (see evaluate_models())
+            
+        Returns:
+            Dictionary with analysis results
+        """
+        logger.info(f"Finalizing {len(results_df)} results ({self.resumed_results} from the journal)")
+        return self.analyzer.analyze_results(results_df)
+    
+    def run_full_evaluation(self, resume=False):
         """
         Run the full evaluation pipeline and return results.
         
+        Args:
+            resume: Continue the run recorded in the result journal
+        
         Returns:
             Tuple containing (results_df, analysis_results)
         """
         logger.info("Starting full evaluation pipeline")
         
         # Run evaluation
-        results_df = self.evaluate_models()
+        results_df = self.evaluate_models(resume=resume)
         
         # Analyze results
-        analysis_results = self.analyzer.analyze_results(results_df)
+        analysis_results = self.finalize(results_df)
         
         # Log API usage statistics
         if self.use_deployed_api:
@@ -287,6 +587,19 @@ class HallucinationEvaluator:
                         'success_rate': success_rate
                     }
         
+        if analysis_results:
+            analysis_results['prompt_mode'] = self.prompt_mode
+            analysis_results['verification_stats'] = dict(self.verification_stats, batch_size=self.verify_batch_size)
+        
+        # Report how many calls the response cache answered
+        cache_stats = get_response_cache().stats()
+        if cache_stats['mode'] != "off":
+            logger.info(f"Response cache ({cache_stats['mode']}) - Hits: {cache_stats['hits']}, "
+                        f"Misses: {cache_stats['misses']}, Hit rate: {cache_stats['hit_rate']:.1%}, "
+                        f"Entries: {cache_stats['entries']}, Evictions: {cache_stats['evictions']}")
+            if analysis_results:
+                analysis_results['cache_stats'] = cache_stats
+        
         logger.info("Evaluation pipeline completed successfully")
         
         return results_df, analysis_results
@@ -6,10 +6,15 @@ when the actual API is not available.
 """
 
 import logging
-from evaluation.models.api_client import AnthropicClient
+from evaluation.models.api_client import AnthropicClient, CLAUDE_MODEL
+from evaluation.utils.response_cache import get_response_cache
+from evaluation.config.settings import ANTHROPIC_API_URL
 
 logger = logging.getLogger("hallucination_evaluator")
 
+# Response cache label of simulated answers (includes the API URL, so stub runs are cached apart)
+SIMULATED_ENDPOINT = f"simulated-ontology:{ANTHROPIC_API_URL}/v1/messages"
+
 class SimulatedOntologyModel:
     """
     Simulates the ontology-enhanced model using Claude with specialized prompting.
@@ -17,13 +22,17 @@ class SimulatedOntologyModel:
     """
     
     @staticmethod
-    def query(prompt, session_id="eval_session"):
+    def query(prompt, session_id="eval_session", rate_limiter=None):
         """
         Simulate ontology-enhanced responses via direct Claude API calls.
         
+        Simulated answers are cached under their own endpoint label, so they are
+        reported apart from baseline answers to the same prompt.
+        
         Args:
             prompt: The question/prompt to send to the model
             session_id: Session ID (for compatibility with the API client interface)
+            rate_limiter: Optional TokenBucket to draw from before calling the API
             
         Returns:
             The model's response text
@@ -50,7 +59,11 @@ class SimulatedOntologyModel:
         
         try:
             # Use the baseline model with the enhanced prompt
-            response = AnthropicClient.query_model(ontology_enhanced_prompt)
+            response = get_response_cache().fetch(
+                SIMULATED_ENDPOINT, CLAUDE_MODEL, ontology_enhanced_prompt, 1024,
+                lambda: AnthropicClient.query_model(ontology_enhanced_prompt, rate_limiter=rate_limiter,
+                                                    use_cache=False)
+            )
             return response
         except Exception as e:
             logger.error(f"Error with simulated ontology model: {e}")
@@ -9,9 +9,13 @@ import argparse
 import logging
 import os
 import sys
-from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+from evaluation.models.hallucination_evaluator import HallucinationEvaluator, PROMPT_MODES
 from evaluation.utils.logging_setup import setup_logging
-from evaluation.config.settings import OUTPUT_DIR
+from evaluation.utils.response_cache import ResponseCache, CACHE_MODES, set_response_cache
+from evaluation.config.settings import (
+    OUTPUT_DIR, EVAL_CONCURRENCY, EVAL_REQUESTS_PER_MINUTE, EVAL_CACHE_MODE, EVAL_CACHE_MAX_MB,
+    EVAL_VERIFY_BATCH_SIZE, EVAL_PROMPT_MODE
+)
 
 def main():
     """Main entry point for the CLI."""
@@ -50,6 +54,57 @@ def main():
         help="Disable the deployed API and only use simulated ontology (default: deployed API is used with fallback)"
     )
     
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=EVAL_CONCURRENCY,
+        help=f"Number of question/model pairs evaluated in parallel (default: {EVAL_CONCURRENCY})"
+    )
+    
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=EVAL_REQUESTS_PER_MINUTE,
+        help=f"Provider rate limit shared by all workers, 0 to disable (default: {EVAL_REQUESTS_PER_MINUTE:g})"
+    )
+    
+    parser.add_argument(
+        "--prompt-mode",
+        choices=PROMPT_MODES,
+        default=EVAL_PROMPT_MODE,
+        help=f"Ask for the answer letter and the explanation in separate calls or in one combined call "
+             f"(default: {EVAL_PROMPT_MODE})"
+    )
+    
+    parser.add_argument(
+        "--verify-batch-size",
+        type=int,
+        default=EVAL_VERIFY_BATCH_SIZE,
+        help=f"Question/model pairs whose explanations are checked in one expert verification call "
+             f"(default: {EVAL_VERIFY_BATCH_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--cache-mode",
+        choices=CACHE_MODES,
+        default=EVAL_CACHE_MODE,
+        help=f"Response cache under the output directory: read-only serves cached responses without storing new ones, "
+             f"record also stores new ones, refresh re-queries everything (default: {EVAL_CACHE_MODE})"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=EVAL_CACHE_MAX_MB,
+        help=f"Size limit of the response cache in MB, 0 for no limit (default: {EVAL_CACHE_MAX_MB:g})"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping question/model pairs already in the result journal"
+    )
+    
     parser.add_argument(
         "--verbose", 
         action="store_true",
@@ -69,6 +124,12 @@ def main():
     os.makedirs(os.environ.get("OUTPUT_DIR", OUTPUT_DIR), exist_ok=True)
     logger_runner.info(f"Output directory: {os.environ.get('OUTPUT_DIR', OUTPUT_DIR)}")
     
+    # Configure the response cache before any model is queried
+    cache_dir = os.path.join(os.environ.get("OUTPUT_DIR", OUTPUT_DIR), "response_cache")
+    set_response_cache(ResponseCache(cache_dir, mode=args.cache_mode,
+                                     max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None))
+    logger_runner.info(f"Response cache: {args.cache_mode} ({cache_dir})")
+    
     # Validate FCI data file
     if not os.path.exists(args.fci_data):
         logger_runner.error(f"FCI data file not found: {args.fci_data}")
@@ -79,7 +140,11 @@ def main():
         logger_runner.info("Initializing hallucination evaluator...")
         evaluator = HallucinationEvaluator(
             fci_data_path=args.fci_data,
-            use_deployed_api=not args.disable_deployed_api
+            use_deployed_api=not args.disable_deployed_api,
+            concurrency=args.concurrency,
+            requests_per_minute=args.requests_per_minute,
+            verify_batch_size=args.verify_batch_size,
+            prompt_mode=args.prompt_mode
         )
         
         # Limit questions if specified
@@ -89,11 +154,12 @@ def main():
         
         # Run evaluation
         logger_runner.info("Running evaluation...")
-        results_df, analysis = evaluator.run_full_evaluation()
+        results_df, analysis = evaluator.run_full_evaluation(resume=args.resume)
         
         # Print summary
         if analysis:
             print("\n=== EVALUATION SUMMARY ===")
+            print(f"Prompt mode: {analysis.get('prompt_mode', args.prompt_mode)}")
             
             model_types = ["baseline", "ontology"]
             if args.models != "both":
@@ -118,6 +184,22 @@ def main():
                     effect_description = "Large" if abs(effect_size) > 0.8 else "Medium" if abs(effect_size) > 0.5 else "Small"
                     print(f"  Effect size: {effect_description} (Cohen's d={effect_size:.2f})")
             
+            verification = analysis.get('verification_stats')
+            if verification and verification['calls']:
+                print(f"\nEXPERT VERIFICATION (batch size {verification['batch_size']}):")
+                print(f"  {verification['explanations']} explanations checked in {verification['calls']} calls "
+                      f"({verification['fallback_calls']} single-item fallbacks)")
+            
+            cache_stats = analysis.get('cache_stats')
+            if cache_stats:
+                print(f"\nRESPONSE CACHE ({cache_stats['mode']}):")
+                print(f"  Hits: {cache_stats['hits']}, misses: {cache_stats['misses']} "
+                      f"(hit rate {cache_stats['hit_rate']:.0%})")
+                for endpoint, counts in cache_stats['endpoints'].items():
+                    print(f"  {endpoint}: {counts['hits']} hits, {counts['misses']} misses")
+                print(f"  {cache_stats['entries']} entries, {cache_stats['bytes'] / 1024:.0f} KB, "
+                      f"{cache_stats['evictions']} evicted")
+            
             exemplary_cases = analysis.get('exemplary_cases', [])
             if exemplary_cases:
                 print(f"\nFound {len(exemplary_cases)} cases where ontology prevented hallucinations")
@@ -0,0 +1,59 @@
+"""
+Token-bucket rate limiting for evaluation API calls.
+
+The evaluator used to sleep two seconds after every call. Concurrent workers
+instead share one TokenBucket: each call takes a token, tokens refill at the
+provider's request rate, and a worker only waits when the bucket is empty.
+"""
+
+import time
+import threading
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` calls per second with bursts of ``capacity``."""
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second (0 or None disables limiting)
+            capacity: Maximum number of tokens, i.e. the largest burst
+            clock: Monotonic clock in seconds
+            sleep: Function used to wait for tokens
+        """
+        self.rate = rate or None
+        self.capacity = max(1, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    @classmethod
+    def per_minute(cls, requests_per_minute, capacity=1):
+        """Create a bucket from a provider limit in requests per minute."""
+        return cls(requests_per_minute / 60 if requests_per_minute else None, capacity)
+
+    def acquire(self):
+        """
+        Take one token, waiting until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now; a negative balance queues later callers behind this one
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,220 @@
+"""
+Content-addressed disk cache of model responses for evaluation runs.
+
+Every baseline, ontology and verification call is stored under OUTPUT_DIR in
+``response_cache/<2 hex>/<sha256>.json``. The file name is the hash of
+(endpoint, model, max_tokens, prompt), so unchanged prompts hit the cache on
+the next run and re-analysing or re-scoring needs no API calls. Modes:
+
+- ``record``: serve hits, call the API on misses and store the response
+- ``read-only``: serve hits, call the API on misses without storing anything
+- ``refresh``: always call the API and overwrite the stored response
+- ``off``: bypass the cache
+
+Error responses are never stored. When the cache grows past its size limit
+the least recently used entries are deleted; hits refresh an entry's mtime.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from evaluation.config.settings import OUTPUT_DIR, EVAL_CACHE_MODE, EVAL_CACHE_MAX_MB
+
+logger = logging.getLogger("hallucination_evaluator")
+
+CACHE_MODES = ("off", "read-only", "record", "refresh")
+
+
+def cache_key(endpoint, model, prompt, max_tokens=None):
+    """
+    Hash the parts of a request that determine its response.
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps([endpoint, model, max_tokens, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_error(response):
+    return not response or response.startswith("Error:")
+
+
+class ResponseCache:
+    """Disk cache of responses keyed by cache_key(), with LRU eviction past a size limit."""
+
+    def __init__(self, directory, mode="record", max_bytes=None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache entries (created on first write)
+            mode: One of CACHE_MODES
+            max_bytes: Size limit of the entries (None for no limit)
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {', '.join(CACHE_MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.max_bytes = max_bytes or None
+        self._lock = threading.Lock()
+        self._entries = None  # path -> size, loaded on first use
+        self._bytes = 0
+        self._counts = dict.fromkeys(("hits", "misses", "writes", "evictions"), 0)
+        self._endpoint_counts = {}  # endpoint -> [hits, misses] of fetch()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_entries(self):
+        """Index the entries on disk; called with the lock held."""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".json"):
+                        path = os.path.join(root, name)
+                        self._entries[path] = os.path.getsize(path)
+        self._bytes = sum(self._entries.values())
+
+    def _count(self, field):
+        with self._lock:
+            self._counts[field] += 1
+
+    def get(self, key):
+        """
+        Return the stored response for a key, or None on a miss.
+
+        Misses are counted; in ``off`` and ``refresh`` mode every lookup misses.
+        """
+        response = None
+        if self.mode in ("read-only", "record"):
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    response = json.load(f)["response"]
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+        self._count("hits" if response is not None else "misses")
+        return response
+
+    def put(self, key, response, **request):
+        """
+        Store a response in ``record`` and ``refresh`` mode; error responses are skipped.
+
+        Args:
+            key: cache_key() of the request
+            response: The response text
+            **request: Request fields stored next to the response for inspection
+        """
+        if self.mode not in ("record", "refresh") or _is_error(response):
+            return
+        path = self._path(key)
+        data = json.dumps({**request, "response": response, "created": time.time()}, ensure_ascii=False)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._load_entries()
+            size = os.path.getsize(path)
+            self._bytes += size - self._entries.get(path, 0)
+            self._entries[path] = size
+            self._counts["writes"] += 1
+            if self.max_bytes and self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is under 90% of its limit; lock held."""
+        target = self.max_bytes * 0.9
+        by_age = sorted(self._entries, key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in by_age:
+            if self._bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._bytes -= self._entries.pop(path)
+            self._counts["evictions"] += 1
+
+    def fetch(self, endpoint, model, prompt, max_tokens, call):
+        """
+        Return the cached response for a request, calling ``call()`` on a miss.
+
+        Args:
+            endpoint: API endpoint (or a label for derived calls)
+            model: Model identifier
+            prompt: Prompt text
+            max_tokens: Token limit of the call (None if the endpoint has none)
+            call: Zero-argument function performing the request
+
+        Returns:
+            The cached or fresh response
+        """
+        if self.mode == "off":
+            return call()
+        key = cache_key(endpoint, model, prompt, max_tokens)
+        response = self.get(key)
+        with self._lock:
+            self._endpoint_counts.setdefault(endpoint, [0, 0])[response is None] += 1
+        if response is not None:
+            return response
+        response = call()
+        self.put(key, response, endpoint=endpoint, model=model, max_tokens=max_tokens, prompt=prompt)
+        return response
+
+    def stats(self):
+        """Return hit, miss, write and eviction counts (in total and per endpoint) and the cache's size."""
+        with self._lock:
+            self._load_entries()
+            counts = dict(self._counts)
+            endpoints = {endpoint: {"hits": hits, "misses": misses}
+                         for endpoint, (hits, misses) in self._endpoint_counts.items()}
+            entries, size = len(self._entries), self._bytes
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            "mode": self.mode,
+            **counts,
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "endpoints": endpoints,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide ResponseCache, configured from EVAL_CACHE_MODE and OUTPUT_DIR on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    os.path.join(os.environ.get("OUTPUT_DIR", OUTPUT_DIR), "response_cache"),
+                    mode=EVAL_CACHE_MODE,
+                    max_bytes=int(EVAL_CACHE_MAX_MB * 1024 * 1024) if EVAL_CACHE_MAX_MB else None,
+                )
+    return _cache
+
+
+def set_response_cache(cache):
+    """Replace the process-wide ResponseCache (e.g. with the CLI's mode)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,100 @@
+"""
+Append-only journal of completed evaluation results.
+
+Each (question, model_type) result is appended to a JSONL file as soon as it
+is evaluated and flushed to disk, so an interrupted run loses at most the
+pairs that were in flight. A resumed run loads the journal and skips the pairs
+it already holds. A line cut short by a crash is ignored on load.
+
+The first line is a run header holding the settings that shape the results
+(prompt mode, models, a hash of the question file ...). Resuming with
+different settings would mix incomparable results in one CSV, so load()
+refuses a journal whose header does not match.
+"""
+
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger("hallucination_evaluator")
+
+
+class JournalMismatchError(ValueError):
+    """The journal was written by a run with different settings."""
+
+
+def result_key(result):
+    """Identify a result by its (question_id, model_type) pair."""
+    return (result["question_id"], result["model_type"])
+
+
+class ResultJournal:
+    """Thread-safe JSONL journal of evaluation results."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Path of the JSONL file (created on first append)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, settings=None):
+        """
+        Read the completed results.
+
+        Args:
+            settings: Settings of the current run; if given, they must match the journal's header
+
+        Returns:
+            Dictionary mapping (question_id, model_type) to the result; later lines win
+
+        Raises:
+            JournalMismatchError: If the journal exists and its header differs from settings
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        header = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if number == 1 and "run" in record:
+                        header = record["run"]
+                        continue
+                    completed[result_key(record)] = record
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping incomplete journal line {number} in {self.path}")
+        if settings is not None and header != settings:
+            differences = sorted(key for key in set(settings) | set(header or {})
+                                 if (header or {}).get(key) != settings.get(key))
+            raise JournalMismatchError(
+                f"{self.path} was written by a run with different settings "
+                f"({', '.join(differences)}); start a new run instead of resuming"
+            )
+        return completed
+
+    def start(self, settings):
+        """Start a new journal whose header records the run's settings."""
+        self.reset()
+        self.append({"run": settings})
+
+    def append(self, result):
+        """Append one result and flush it to disk."""
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def reset(self):
+        """Start a new journal, discarding earlier results."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -4,10 +4,20 @@ Text processing utilities for hallucination evaluation.
 
 import re
 
+# Answer line of a combined answer-and-explanation response, e.g. "ANSWER: B" or "**Answer:** (B)".
+# The letter must stand alone on the line, so a free-form "Answer: a net force ..." is not read as A.
+STRUCTURED_ANSWER_PATTERN = re.compile(r'^[\s*#]*ANSWER[\s*]*:[\s*]*\(?([A-E])\)?[\s*.]*$', re.IGNORECASE | re.MULTILINE)
+
+# Start of the explanation in a combined response, e.g. "EXPLANATION:"
+EXPLANATION_LABEL_PATTERN = re.compile(r'^[\s*#]*EXPLANATION[\s*]*:[\s*]*', re.IGNORECASE | re.MULTILINE)
+
 def extract_answer_choice(response):
     """
     Extract the letter of the selected answer from the model's response.
     
+    Understands both free-form answers and the "ANSWER: <letter>" line of
+    combined answer-and-explanation responses.
+    
     Args:
         response: The model's response text
         
@@ -17,6 +27,11 @@ def extract_answer_choice(response):
     # Check if this is a fallback response due to API timeout
     if "API timeout" in response or "couldn't provide an answer" in response:
         return None
+    
+    # Structured answer line of a combined response
+    match = STRUCTURED_ANSWER_PATTERN.search(response)
+    if match:
+        return match.group(1).upper()
         
     # Pattern to match answer choices at the beginning of a line or after common prefixes
     pattern = r'(?:^|answer is|select|choose|option)\s*([A-E])[.\s)]'
@@ -37,6 +52,26 @@ def extract_answer_choice(response):
         
     return None
 
+def extract_explanation(response):
+    """
+    Extract the explanation from a combined answer-and-explanation response.
+    
+    Args:
+        response: The model's response text
+        
+    Returns:
+        The text after the "EXPLANATION:" label, or the response without its
+        "ANSWER:" line if there is no label
+    """
+    match = EXPLANATION_LABEL_PATTERN.search(response)
+    if match:
+        return response[match.end():].strip()
+    answer = STRUCTURED_ANSWER_PATTERN.search(response)
+    if answer:
+        line_end = response.find("\n", answer.end())
+        return (response[:answer.start()] + (response[line_end:] if line_end != -1 else "")).strip()
+    return response.strip()
+
 def keyword_match(phrase, text):
     """
     Check if a phrase or its keywords appear in the text.
@@ -56,6 +91,28 @@ def keyword_match(phrase, text):
     keywords = [w for w in phrase.lower().split() if len(w) > 3]
     return all(keyword in text.lower() for keyword in keywords)
 
+# Verdict line of a verification response, e.g. "CONTAINS_HALLUCINATIONS: Yes" or "**CONTAINS_HALLUCINATIONS:** [No]".
+# The verdict must be a whole token, so an echoed template line "CONTAINS_HALLUCINATIONS: [Yes/No]" is no verdict
+VERDICT_PATTERN = re.compile(r'CONTAINS_HALLUCINATIONS\W*\[?\s*(yes|no)\s*\]?(?![/\w])', re.IGNORECASE)
+
+# Section header of a batched verification response, e.g. "=== RESULT 3 ==="
+RESULT_HEADER_PATTERN = re.compile(r'^[\s*#=]*RESULT\s+(\d+)\b[\s*#=:]*$', re.IGNORECASE | re.MULTILINE)
+
+def verification_verdict(verification_result):
+    """
+    Read the CONTAINS_HALLUCINATIONS verdict of a verification response.
+    
+    Args:
+        verification_result: The expert model's verification response
+        
+    Returns:
+        True or False, or None if the response has no verdict
+    """
+    match = VERDICT_PATTERN.search(verification_result or "")
+    if not match:
+        return None
+    return match.group(1).lower() == "yes"
+
 def parse_verification_result(verification_result):
     """
     Parse the expert verification result to extract hallucinations.
@@ -69,11 +126,7 @@ def parse_verification_result(verification_result):
     hallucinations = []
     
     # Check if hallucinations were detected
-    contains_hallucinations = False
-    if "CONTAINS_HALLUCINATIONS: Yes" in verification_result:
-        contains_hallucinations = True
-    
-    if not contains_hallucinations:
+    if not verification_verdict(verification_result):
         return hallucinations
     
     # Extract hallucinations using regex
@@ -91,3 +144,29 @@ def parse_verification_result(verification_result):
         })
     
     return hallucinations
+
+def parse_batch_verification_result(verification_result, count):
+    """
+    Split a batched verification response into per-explanation results.
+    
+    The response is expected to hold one "=== RESULT i ===" section per
+    explanation, each formatted like a single verification response.
+    
+    Args:
+        verification_result: The expert model's response to a batched verification prompt
+        count: Number of explanations in the batch
+        
+    Returns:
+        List of length count holding, per explanation, the detected hallucinations,
+        or None where the response has no section with a verdict for it
+    """
+    results = [None] * count
+    headers = list(RESULT_HEADER_PATTERN.finditer(verification_result or ""))
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        index = int(header.group(1)) - 1
+        if not 0 <= index < count or results[index] is not None:
+            continue
+        section = verification_result[header.end():next_header.start() if next_header else None]
+        if verification_verdict(section) is not None:
+            results[index] = parse_verification_result(section)
+    return results
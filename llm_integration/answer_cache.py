@@ -0,0 +1,243 @@
+"""
+Semantic cache of tutor answers for repeated questions.
+
+Students ask the same question in many phrasings ("what is newton's second
+law", "explain Newton's 2nd law?"), and each one costs a Claude call. The
+AnswerCache sits in front of that call. Entries are grouped by:
+
+1. The set of ontology concepts the question matched (from _get_relevant_context)
+2. The student's knowledge bucket, so adapted answers are only reused between
+   students at a similar level
+
+Within a group, a question is a hit if its normalized text matches exactly, or
+if its cosine similarity to a cached question reaches the configured threshold.
+Questions are vectorized locally with a hashing vectorizer (word unigrams and
+character trigrams, no vocabulary, no network). Entries expire after a TTL and
+the least recently used entry is evicted when the cache is full.
+"""
+
+import re
+import math
+import time
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Tuple, Optional, Iterable, Iterator, NamedTuple, Any
+from llm_integration.keyword_matcher import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Words that carry no meaning for matching phrasings of the same question. Intent
+# words ("how", "why", "example") are deliberately kept.
+STOPWORDS = frozenset("""
+a an the is are was were be been being do does did can could would should will shall may might must
+what whats which who whom whose i me my you your we our it its this that these those of in on at to
+for from by with about as into than then so if or and but please explain tell describe define
+meaning mean give show help understand know question say state""".split())
+
+# Spelled-out ordinals so "2nd law" and "second law" match
+ORDINALS = {"1st": "first", "2nd": "second", "3rd": "third"}
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, fold apostrophes, drop punctuation and collapse whitespace."""
+    return " ".join(_WORD.findall(normalize_text(question)))
+
+
+def _stem(word: str) -> str:
+    """Crude plural/possessive folding: "newton's", "newtons" -> "newton"; "laws" -> "law"."""
+    if word.endswith("'s"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return ORDINALS.get(word, word)
+
+
+def content_words(normalized: str, stopwords: FrozenSet[str] = STOPWORDS) -> Iterator[str]:
+    """Stemmed words of a normalized question, without stopwords."""
+    for word in normalized.split():
+        word = _stem(word)
+        if word not in stopwords:
+            yield word
+
+
+class HashingVectorizer:
+    """Stateless text vectorizer: hashed, L2-normalized word and character n-gram counts."""
+
+    def __init__(self, n_features: int = 1 << 16, char_ngram: int = 3):
+        """
+        Args:
+            n_features: Size of the hashed feature space
+            char_ngram: Length of the character n-grams taken from each word
+        """
+        self.n_features = n_features
+        self.char_ngram = char_ngram
+
+    def _features(self, normalized: str) -> Iterable[str]:
+        for word in content_words(normalized):
+            yield "w:" + word
+            padded = f"<{word}>"
+            for i in range(max(1, len(padded) - self.char_ngram + 1)):
+                yield "c:" + padded[i:i + self.char_ngram]
+
+    def transform(self, normalized: str) -> Dict[int, float]:
+        """Vectorize an already normalized question into a sparse {feature: weight} dict."""
+        counts: Dict[int, float] = {}
+        for feature in self._features(normalized):
+            index = zlib.crc32(feature.encode()) % self.n_features
+            counts[index] = counts.get(index, 0.0) + 1.0
+        norm = math.sqrt(sum(value * value for value in counts.values()))
+        if norm:
+            for index in counts:
+                counts[index] /= norm
+        return counts
+
+
+def cosine_similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Dot product of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+
+class CacheProbe(NamedTuple):
+    """A vectorized question, returned by AnswerCache.probe() and passed back to store()."""
+    group: Tuple[Tuple[str, ...], str]
+    normalized: str
+    vector: Dict[int, float]
+    answer: Optional[str]
+    similarity: float
+
+
+class _Entry(NamedTuple):
+    vector: Dict[int, float]
+    answer: str
+    expires_at: float
+
+
+class AnswerCache:
+    """Thread-safe TTL + LRU cache of answers with similarity matching within concept groups."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0,
+                 similarity_threshold: float = 0.85, vectorizer: Optional[HashingVectorizer] = None):
+        """
+        Args:
+            max_entries: Maximum cached answers; the least recently used is evicted beyond this
+            ttl_seconds: Seconds an answer stays valid
+            similarity_threshold: Minimum cosine similarity for a non-identical question to hit
+            vectorizer: Question vectorizer (defaults to HashingVectorizer())
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self._lock = threading.Lock()
+        # (group, normalized question) -> entry, least recently used first
+        self._entries: "OrderedDict[Tuple[Any, str], _Entry]" = OrderedDict()
+        # group -> normalized questions in that group
+        self._groups: Dict[Tuple[Tuple[str, ...], str], set] = {}
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def probe(self, question: str, concepts: Iterable[str], knowledge_bucket: str) -> CacheProbe:
+        """
+        Look up a question.
+
+        Args:
+            question: The student's question
+            concepts: Concept names matched for the question
+            knowledge_bucket: Coarse student knowledge level (see ClaudeTutor._knowledge_bucket)
+
+        Returns:
+            CacheProbe whose ``answer`` is the cached answer, or None on a miss
+        """
+        group = (tuple(sorted(set(concepts))), knowledge_bucket)
+        normalized = normalize_question(question)
+        vector = self.vectorizer.transform(normalized)
+        now = time.time()
+
+        with self._lock:
+            entry = self._live_entry((group, normalized), now)
+            if entry is not None:
+                self.exact_hits += 1
+                return CacheProbe(group, normalized, vector, entry.answer, 1.0)
+
+            best_key, best_similarity = None, 0.0
+            for other in list(self._groups.get(group, ())):
+                entry = self._live_entry((group, other), now)
+                if entry is None:
+                    continue
+                similarity = cosine_similarity(vector, entry.vector)
+                if similarity > best_similarity:
+                    best_key, best_similarity = (group, other), similarity
+
+            if best_key is not None and best_similarity >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self.similar_hits += 1
+                return CacheProbe(group, normalized, vector, self._entries[best_key].answer, best_similarity)
+
+            self.misses += 1
+            return CacheProbe(group, normalized, vector, None, best_similarity)
+
+    def store(self, probe: CacheProbe, answer: str) -> None:
+        """Cache the answer to a probed question, evicting the least recently used entry if full."""
+        key = (probe.group, probe.normalized)
+        with self._lock:
+            self._entries[key] = _Entry(probe.vector, answer, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._groups.setdefault(probe.group, set()).add(probe.normalized)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+                self.evictions += 1
+
+    def _live_entry(self, key, now: float) -> Optional[_Entry]:
+        """Return an unexpired entry (marking it recently used), dropping it if expired. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            self._forget(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _forget(self, key) -> None:
+        group, normalized = key
+        members = self._groups.get(group)
+        if members is not None:
+            members.discard(normalized)
+            if not members:
+                del self._groups[group]
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+            self.exact_hits = self.similar_hits = self.misses = 0
+            self.expirations = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, hit/miss counters and hit rate."""
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'similarity_threshold': self.similarity_threshold,
+            }
@@ -9,21 +9,41 @@ This module serves as the central component that:
 4. Tracks student progress and updates the model
 """
 
-import os
 import logging
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
-from anthropic import Anthropic
-from owlready2 import get_ontology, World
-from utils.ssl_config import configure_ssl_certificates
+from itertools import zip_longest
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterator, AsyncIterator
 
-# Import the StudentModel
+# Import the StudentModel and the shared tutor core
 from llm_integration.student_model import StudentModel
+from llm_integration.tutor_core import TutorCore, KEY_LAWS, get_tutor_core
+from llm_integration.context_cache import RenderedBlock, render_block
+from llm_integration.context_assembler import ContextBlock, AssembledContext
+from llm_integration.answer_cache import CacheProbe
+from llm_integration.single_flight import prompt_fingerprint
+from llm_integration.keyword_matcher import TOPIC, LAW, QUANTITY, CONCEPT
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Fallback ids of clients that sent no session id, and the id the evaluation
+# client sends with every question. Every such client shares the id, so their
+# models are kept per tutor and never loaded from or saved to the store; each
+# evaluation question is then answered for a fresh student.
+SHARED_STUDENT_IDS = frozenset({"anonymous", "default_session", "eval_session"})
+
+# Concepts added to the context when a question names none and retrieval is used
+RETRIEVAL_TOP_K = 3
+
+# Closing section of every student's system prompt block
+ADAPTIVE_GUIDELINES = """Adaptive tutoring guidelines:
+1. Build on concepts the student already understands
+2. Address knowledge gaps and misconceptions
+3. Introduce new concepts when prerequisites are understood
+4. Adjust explanation depth based on student knowledge level
+5. Reinforce concepts that need strengthening
+"""
+
 class ClaudeTutor:
     """
     Intelligent tutoring system that combines Claude AI with a structured knowledge base.
@@ -40,191 +60,141 @@ class ClaudeTutor:
     the AI model (Claude), and the adaptive learning features (student model).
     """
     
-    def __init__(self, student_id: Optional[str] = None):
+    def __init__(self, student_id: Optional[str] = None, core: Optional[TutorCore] = None):
         """
-        Initialize the Claude Tutor with API key, ontology, and student model.
+        Initialize the Claude Tutor on top of the shared tutor core.
+        
+        The ontology, Anthropic client, prerequisite graph and static prompt
+        sections come from the process-wide TutorCore, so constructing a tutor
+        only loads the per-session student model.
         
         Args:
             student_id: Optional identifier for the student. If not provided, a generic model is used.
+            core: Optional TutorCore to use instead of the process-wide instance.
         """
         logger.debug("Initializing ClaudeTutor...")
-        load_dotenv()
-        self.api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not self.api_key:
-            logger.error("ANTHROPIC_API_KEY environment variable is not set")
-            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
-        
-        # Validate API key format before logging success
-        if not self.api_key.startswith("sk-ant-"):
-            logger.error("API key appears to be in wrong format")
-            raise ValueError("API key appears to be in wrong format. Should start with 'sk-ant-'")
-        
-        logger.debug("API key validated successfully")
-        
-        try:
-            # Initialize the Anthropic client with proper error handling
-            logger.debug("Initializing Anthropic client...")
-            
-            # API key validation already done above
-            
-            # Configure SSL certificates
-            configure_ssl_certificates()
-            
-            # Create the client with the latest Anthropic API
-            self.client = Anthropic(api_key=self.api_key)
-            logger.debug("Anthropic client created successfully")
-            logger.debug("Anthropic client initialized successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import required library: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Failed to initialize Anthropic client: {e}")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Error details: {str(e)}")
-            raise
-        
-        # Load the ontology
-        try:
-            # Try multiple possible paths for the ontology file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            possible_paths = [
-                # Development path (from llm_integration directory)
-                os.path.join(os.path.dirname(current_dir), 'ontology', 'schemas', 'physics_tutor.owl'),
-                # Alternative path (from root directory)
-                os.path.join(current_dir, '..', 'ontology', 'schemas', 'physics_tutor.owl'),
-                # Deployed path (same level)
-                os.path.join(current_dir, 'ontology', 'schemas', 'physics_tutor.owl'),
-                # Environment variable override
-                os.getenv('ONTOLOGY_PATH', '')
-            ]
-            
-            ontology_path = None
-            for path in possible_paths:
-                if path and os.path.exists(path):
-                    ontology_path = os.path.abspath(path)
-                    break
-            
-            if not ontology_path:
-                raise FileNotFoundError(f"Could not find ontology file. Searched paths: {possible_paths}")
-            
-            logger.debug(f"Loading ontology from: {ontology_path}")
-            self.onto = get_ontology(f"file://{ontology_path}").load()
-            logger.debug("Ontology loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load ontology: {e}")
-            raise
-        
-        # Initialize student model
+        self.core = core or get_tutor_core()
+        
+        # Shared, read-only resources
+        self.api_key = self.core.api_key
+        self.client = self.core.client
+        self.async_client = self.core.async_client
+        self.onto = self.core.onto
+        self.concept_index = self.core.concept_index
+        self.keyword_matcher = self.core.keyword_matcher
+        self.context_cache = self.core.context_cache
+        self.answer_cache = self.core.answer_cache
+        self.concept_prerequisites = self.core.concept_prerequisites
+        self.all_concepts = self.core.all_concepts
+        
+        # Load the student's model from the shared repository (a fresh model if persistence is off)
         self.student_id = student_id or "anonymous"
-        self.student_model = StudentModel(self.student_id)
+        self.student_models = self.core.student_models if self.student_id not in SHARED_STUDENT_IDS else None
+        if self.student_models is not None:
+            self.student_model = self.student_models.get(self.student_id)
+        else:
+            self.student_model = StudentModel(self.student_id)
         logger.debug(f"Student model initialized for student ID: {self.student_id}")
         
-        # Pre-compute concept relationships
-        self.concept_prerequisites = self._build_prerequisite_graph()
-        self.all_concepts = self._get_all_concepts()
-        
-        # Initialize the system prompt with ontology context
-        self.system_prompt = self._create_system_prompt()
+        # The system prompt is the core's cached static block plus this student's block,
+        # which the core re-renders only when the student model's version changes
+        self.prompt_renders = {'student': 0, 'student_reused': 0}
+        self.last_usage: Optional[Dict[str, int]] = None
+        # Token accounting of the last assembled context (None if no concept matched)
+        self.last_context: Optional[AssembledContext] = None
         logger.debug("System prompt created")
     
-    def _build_prerequisite_graph(self) -> Dict[str, List[str]]:
-        """Build a graph of concept prerequisites from the ontology."""
-        prereq_graph = {}
+    @property
+    def system_blocks(self) -> List[Dict[str, Any]]:
+        """
+        The system prompt as content blocks: the shared static block, marked for
+        prompt caching, followed by this student's block (if any).
         
-        for concept in self.onto.search(type=self.onto.Concept):
-            if hasattr(concept, 'hasPrerequisite'):
-                prereq_graph[concept.name] = [prereq.name for prereq in concept.hasPrerequisite]
-            else:
-                prereq_graph[concept.name] = []
-                
-        return prereq_graph
+        The static block is rendered once per ontology version by the TutorCore.
+        The student block is cached by the TutorCore too, so it is re-rendered only
+        if the student model changed since any request last rendered it;
+        prompt_stats() reports this tutor's renders and reuses.
+        """
+        student_block, rendered = self.core.student_system_block(self.student_model, self._render_student_block)
+        self.prompt_renders['student' if rendered else 'student_reused'] += 1
+        if student_block is None:
+            return [self.core.static_system_block]
+        return [self.core.static_system_block, student_block]
+    
+    def _render_student_block(self) -> Optional[Dict[str, Any]]:
+        student_prompt = self._create_student_prompt()
+        return {"type": "text", "text": student_prompt} if student_prompt else None
     
-    def _get_all_concepts(self) -> List[str]:
-        """Get a list of all concepts in the ontology."""
-        return [concept.name for concept in self.onto.search(type=self.onto.Concept)]
+    def prompt_stats(self) -> Dict[str, Any]:
+        """How often each system prompt section was rendered and reused."""
+        return {
+            'static_renders': TutorCore.static_prompt_renders,
+            'student_renders': self.prompt_renders['student'],
+            'student_reused': self.prompt_renders['student_reused'],
+            'student_model_version': self.student_model.version,
+        }
     
-    def _create_system_prompt(self) -> str:
-        """Create a system prompt that includes relevant ontology information and student model data."""
-        prompt = """You are a physics tutor that uses a structured knowledge base to provide accurate and helpful responses.
-        You have access to the following key concepts and their relationships:
+    def _create_student_prompt(self) -> str:
+        """Create the per-student section of the system prompt from the student model."""
+        # Add student model information if available
+        if not self.student_model or not self.student_model.exposed_mask:
+            return ""
         
-        Topics:
-        """
+        lines = ["Student Knowledge State:"]
         
-        # Add topics
-        for topic in self.onto.search(type=self.onto.Topic):
-            if hasattr(topic, 'hasDefinition') and len(topic.hasDefinition) > 0:
-                prompt += f"- {topic.name}: {topic.hasDefinition[0]}\n"
-            else:
-                prompt += f"- {topic.name}\n"
+        # Add concepts the student understands
+        if self.student_model.understood_mask:
+            lines.append("Concepts understood by the student:")
+            lines.extend(f"- {concept}" for concept in self.student_model.understood_concepts)
         
-        prompt += "\nKey Laws:\n"
-        # Add Newton's Laws
-        for law in ["NewtonsFirstLaw", "NewtonsSecondLaw", "NewtonsThirdLaw"]:
-            law_obj = self.onto.search_one(iri=f"*{law}")
-            if law_obj and hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
-                prompt += f"- {law}: {law_obj.hasDefinition[0]}\n"
-            elif law_obj:
-                prompt += f"- {law}\n"
+        # Add knowledge gaps
+        knowledge_gaps = self.student_model.get_knowledge_gaps()
+        if knowledge_gaps:
+            lines.append("Concepts the student needs to review:")
+            lines.extend(f"- {concept}" for concept in knowledge_gaps)
         
-        # Add student model information if available
-        if self.student_model and self.student_model.exposed_concepts:
-            prompt += "\nStudent Knowledge State:\n"
-            
-            # Add concepts the student understands
-            if self.student_model.understood_concepts:
-                prompt += "Concepts understood by the student:\n"
-                for concept in self.student_model.understood_concepts:
-                    prompt += f"- {concept}\n"
-            
-            # Add knowledge gaps
-            knowledge_gaps = self.student_model.get_knowledge_gaps()
-            if knowledge_gaps:
-                prompt += "Concepts the student needs to review:\n"
-                for concept in knowledge_gaps:
-                    prompt += f"- {concept}\n"
-            
-            # Add misconceptions
-            if self.student_model.misconceptions:
-                prompt += "Student misconceptions to address:\n"
-                for concept, misconception in self.student_model.misconceptions.items():
-                    prompt += f"- {concept}: {misconception}\n"
-        
-        prompt += "\nWhen tutoring:\n"
-        prompt += "1. Use the knowledge base to ensure accuracy\n"
-        prompt += "2. Consider prerequisites when explaining concepts\n"
-        prompt += "3. Provide relevant examples from the knowledge base\n"
-        prompt += "4. Connect concepts to real-world applications\n"
-        prompt += "5. Be clear and concise in your explanations\n"
+        # Add misconceptions
+        misconceptions = self.student_model.misconception_items()
+        if misconceptions:
+            lines.append("Student misconceptions to address:")
+            lines.extend(f"- {concept}: {misconception}" for concept, misconception in misconceptions)
         
         # Add adaptive tutoring guidelines based on student model
-        if self.student_model and self.student_model.exposed_concepts:
-            prompt += "\nAdaptive tutoring guidelines:\n"
-            prompt += "1. Build on concepts the student already understands\n"
-            prompt += "2. Address knowledge gaps and misconceptions\n"
-            prompt += "3. Introduce new concepts when prerequisites are understood\n"
-            prompt += "4. Adjust explanation depth based on student knowledge level\n"
-            prompt += "5. Reinforce concepts that need strengthening\n"
-        
-        return prompt
-    
-    def get_prerequisites(self, concept_name: str) -> List[str]:
-        """Get prerequisites for a given concept from the ontology."""
-        concept = self.onto.search_one(iri=f"*{concept_name}")
-        if concept and hasattr(concept, 'hasPrerequisite'):
-            return [prereq.name for prereq in concept.hasPrerequisite]
-        return []
+        lines.append("")
+        lines.append(ADAPTIVE_GUIDELINES)
+        return "\n".join(lines)
+    
+    def get_prerequisites(self, concept_name: str, transitive: bool = False) -> List[str]:
+        """Get prerequisites for a given concept from the compiled prerequisite graph.
+        
+        Args:
+            concept_name: Concept name or alias
+            transitive: Also include indirect prerequisites, in learning order
+        """
+        concept = self.concept_index.get(concept_name)
+        if concept is None:
+            return []
+        if transitive:
+            return self.core.prerequisite_graph.all_prerequisites(concept.name)
+        return self.core.prerequisite_graph.prerequisites(concept.name)
+    
+    def get_missing_prerequisites(self, concept_name: str) -> List[str]:
+        """Get the direct and indirect prerequisites of a concept this student has not understood, in learning order."""
+        concept = self.concept_index.get(concept_name)
+        if concept is None:
+            return []
+        return self.core.prerequisite_graph.missing_prerequisites(concept.name, self.student_model)
     
     def get_examples(self, concept_name: str) -> List[str]:
         """Get examples for a given concept from the ontology."""
-        concept = self.onto.search_one(iri=f"*{concept_name}")
+        concept = self.concept_index.get(concept_name)
         if concept and hasattr(concept, 'hasExample'):
             return [example.hasExplanation[0] for example in concept.hasExample]
         return []
     
     def get_applications(self, concept_name: str) -> List[str]:
         """Get real-world applications for a given concept from the ontology."""
-        concept = self.onto.search_one(iri=f"*{concept_name}")
+        concept = self.concept_index.get(concept_name)
         if concept and hasattr(concept, 'hasApplication'):
             return [app.hasDescription[0] for app in concept.hasApplication]
         return []
@@ -238,7 +208,7 @@ class ClaudeTutor:
         
         try:
             # Create message with Claude
-            message = await self.client.messages.create(
+            message = await self.async_client.messages.create(
                 model="claude-3-opus-20240229",
                 max_tokens=1024,
                 messages=[{
@@ -256,16 +226,18 @@ class ClaudeTutor:
             logger.error(f"Error generating response: {e}")
             raise
     
-    def tutor_sync(self, user_question: str) -> str:
+    def tutor_sync(self, user_question: str, use_cache: bool = True) -> str:
         """
         A synchronous implementation for calling Claude API.
         This implementation ensures compatibility with Flask.
         
         This method enhances the user's question with ontology-based context
         and the student model state to provide accurate, personalized responses.
+        Repeated questions are answered from the shared answer cache.
         
         Args:
             user_question: The question from the user to be answered by the tutor
+            use_cache: Set to False to bypass the answer cache (e.g. for evaluation runs)
             
         Returns:
             The response text from Claude
@@ -273,54 +245,20 @@ class ClaudeTutor:
         logger.debug(f"Processing question synchronously: {user_question}")
         
         try:
-            # Extract relevant context from the ontology based on the question
-            context_text, concepts_covered = self._get_relevant_context(user_question)
-            logger.debug(f"Extracted context: {context_text[:100]}...")
-            logger.debug(f"Concepts covered: {concepts_covered}")
-            
-            # Update the student model with newly exposed concepts
-            for concept in concepts_covered:
-                self.student_model.expose_concept(concept)
-            
-            # Adapt the context based on the student's knowledge level
-            adapted_context = self._adapt_context_to_student(context_text, concepts_covered)
-            logger.debug(f"Adapted context: {adapted_context[:100]}...")
+            retrieved = self._get_relevant_context(user_question)
             
-            # Prepare the enhanced prompt with system prompt, context, and user question
-            enhanced_prompt = f"{self.system_prompt}\n\nRELEVANT CONTEXT:\n{adapted_context}\n\nUSER QUESTION: {user_question}\n\nPlease answer the question accurately using the provided context and knowledge base. Only use information from the context and general physics knowledge. Do not hallucinate or make up information not supported by the context."
+            # Serve repeated questions from the answer cache, keyed by what the
+            # student knew before this question was recorded in their model
+            probe = self._probe_answer_cache(user_question, retrieved[1]) if use_cache else None
+            if probe and probe.answer is not None:
+                self._record_exposure(retrieved[1])
+                return probe.answer
             
-            # Ensure SSL certificates are configured before API call
-            configure_ssl_certificates()
+            adapted_context, _ = self._prepare_context(user_question, retrieved)
+            request = self._build_request(user_question, adapted_context)
             
             logger.debug("Making API call to Claude model")
-            
-            try:
-                # Create a message with Claude using the enhanced prompt
-                # Try the specified model first
-                response = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=1024,
-                    messages=[{
-                        "role": "user",
-                        "content": enhanced_prompt
-                    }]
-                )
-                
-            except Exception as model_error:
-                # If the specified model fails, try with a fallback model
-                logger.warning(f"Error with primary model: {str(model_error)}. Trying fallback model.")
-                try:
-                    response = self.client.messages.create(
-                        model="claude-3-haiku-20240307",  # Fallback to a different model
-                        max_tokens=1024,
-                        messages=[{
-                            "role": "user",
-                            "content": enhanced_prompt
-                        }]
-                    )
-                except Exception as fallback_error:
-                    logger.error(f"Fallback model also failed: {str(fallback_error)}")
-                    raise fallback_error
+            response = self._call_claude(request)
             
             # Extract and return the response text
             if response and hasattr(response, 'content') and len(response.content) > 0:
@@ -331,6 +269,8 @@ class ClaudeTutor:
                 # In a more advanced implementation, we could analyze the response
                 # to determine which concepts the student understood
                 
+                if probe:
+                    self.answer_cache.store(probe, response_text)
                 return response_text
             else:
                 logger.error(f"Empty or invalid response from Claude API: {response}")
@@ -340,184 +280,461 @@ class ClaudeTutor:
             logger.error(f"Error in synchronous Claude API call: {type(e).__name__}: {str(e)}")
             raise
     
+    def tutor_stream(self, user_question: str) -> Iterator[str]:
+        """
+        Stream Claude's answer as text fragments as they arrive.
+        
+        Uses the same context pipeline as tutor_sync(). The fallback model is only
+        tried if the primary model fails before producing any text; errors after
+        the first fragment are raised to the caller.
+        
+        Args:
+            user_question: The question from the user to be answered by the tutor
+            
+        Yields:
+            Text fragments of the response, in order
+        """
+        logger.debug(f"Processing question as a stream: {user_question}")
+        request = self._build_request(user_question)
+        
+        models = ["claude-3-opus-20240229", "claude-3-haiku-20240307"]
+        for attempt, model in enumerate(models):
+            started = False
+            try:
+                with self.client.messages.stream(
+                    model=model,
+                    max_tokens=1024,
+                    **request
+                ) as stream:
+                    for text in stream.text_stream:
+                        started = True
+                        yield text
+                    self._record_usage(stream.get_final_message())
+                return
+            except Exception as e:
+                if started or attempt == len(models) - 1:
+                    logger.error(f"Error in streaming Claude API call: {type(e).__name__}: {str(e)}")
+                    raise
+                logger.warning(f"Error with primary model: {str(e)}. Trying fallback model.")
+    
+    async def tutor_async(self, user_question: str, use_cache: bool = True) -> str:
+        """
+        Non-blocking counterpart of tutor_sync() for the ASGI app.
+        
+        The context pipeline is in-memory (index lookups and cached blocks) and runs
+        inline; only the Claude call is awaited, so the event loop can serve other
+        requests while the answer is generated.
+        
+        Args:
+            user_question: The question from the user to be answered by the tutor
+            use_cache: Set to False to bypass the answer cache (e.g. for evaluation runs)
+            
+        Returns:
+            The response text from Claude
+        """
+        logger.debug(f"Processing question asynchronously: {user_question}")
+        
+        try:
+            retrieved = self._get_relevant_context(user_question)
+            
+            probe = self._probe_answer_cache(user_question, retrieved[1]) if use_cache else None
+            if probe and probe.answer is not None:
+                self._record_exposure(retrieved[1])
+                return probe.answer
+            
+            adapted_context, _ = self._prepare_context(user_question, retrieved)
+            request = self._build_request(user_question, adapted_context)
+            
+            response = await self._call_claude_async(request)
+            if response and hasattr(response, 'content') and len(response.content) > 0:
+                if probe:
+                    self.answer_cache.store(probe, response.content[0].text)
+                return response.content[0].text
+            logger.error(f"Empty or invalid response from Claude API: {response}")
+            raise ValueError("Received empty response from AI service")
+            
+        except Exception as e:
+            logger.error(f"Error in asynchronous Claude API call: {type(e).__name__}: {str(e)}")
+            raise
+    
+    async def tutor_stream_async(self, user_question: str) -> AsyncIterator[str]:
+        """
+        Non-blocking counterpart of tutor_stream() for the ASGI app.
+        
+        Args:
+            user_question: The question from the user to be answered by the tutor
+            
+        Yields:
+            Text fragments of the response, in order
+        """
+        logger.debug(f"Processing question as an async stream: {user_question}")
+        request = self._build_request(user_question)
+        
+        models = ["claude-3-opus-20240229", "claude-3-haiku-20240307"]
+        for attempt, model in enumerate(models):
+            started = False
+            try:
+                async with self.async_client.messages.stream(
+                    model=model,
+                    max_tokens=1024,
+                    **request
+                ) as stream:
+                    async for text in stream.text_stream:
+                        started = True
+                        yield text
+                    self._record_usage(await stream.get_final_message())
+                return
+            except Exception as e:
+                if started or attempt == len(models) - 1:
+                    logger.error(f"Error in streaming Claude API call: {type(e).__name__}: {str(e)}")
+                    raise
+                logger.warning(f"Error with primary model: {str(e)}. Trying fallback model.")
+    
+    def _prepare_context(self, user_question: str,
+                         retrieved: Optional[Tuple[str, List[str]]] = None) -> Tuple[str, List[str]]:
+        """
+        Run the context pipeline for a question.
+        
+        Extracts ontology context, records newly exposed concepts in the student
+        model and adapts the context to the student's knowledge level.
+        
+        Args:
+            user_question: The question from the user
+            retrieved: Output of _get_relevant_context(); computed if not given
+            
+        Returns:
+            Tuple of (adapted context, concepts covered)
+        """
+        # Extract relevant context from the ontology based on the question
+        context_text, concepts_covered = retrieved or self._get_relevant_context(user_question)
+        logger.debug(f"Extracted context: {context_text[:100]}...")
+        logger.debug(f"Concepts covered: {concepts_covered}")
+        
+        self._record_exposure(concepts_covered)
+        
+        # Adapt the context based on the student's knowledge level
+        blocks = self.last_context.blocks if self.last_context else []
+        adapted_context = self._adapt_context_to_student(context_text, concepts_covered, blocks)
+        logger.debug(f"Adapted context: {adapted_context[:100]}...")
+        return adapted_context, concepts_covered
+    
+    def _record_exposure(self, concepts: List[str]) -> None:
+        """Record concepts the student has been shown in their model."""
+        # Concurrent requests of the same student share the cached model, so the
+        # update is made under its lock.
+        with self.student_model.lock:
+            for concept in concepts:
+                self.student_model.expose_concept(concept)
+            if concepts and self.student_models is not None:
+                # Saved by the repository's background flusher, off the request path
+                self.student_models.mark_dirty(self.student_model)
+    
+    def _build_request(self, user_question: str, adapted_context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Lay out the Messages API request for a question.
+        
+        The prompt is split so the largest part can be served from Anthropic's
+        prompt cache:
+        
+        1. Static system block (ontology overview, tutoring and answering rules),
+           identical for every request and marked with cache_control
+        2. Per-student system block (knowledge state, adaptive guidelines)
+        3. Per-question user message (adapted context and the question)
+        
+        Args:
+            user_question: The question from the user
+            adapted_context: Output of _prepare_context(); computed if not given
+            
+        Returns:
+            ``system`` and ``messages`` keyword arguments for messages.create()/stream()
+        """
+        if adapted_context is None:
+            adapted_context, _ = self._prepare_context(user_question)
+        
+        return {
+            "system": self.system_blocks,
+            "messages": [{
+                "role": "user",
+                "content": f"RELEVANT CONTEXT:\n{adapted_context}\n\nUSER QUESTION: {user_question}"
+            }]
+        }
+    
+    def _knowledge_bucket(self, concepts: List[str]) -> Optional[str]:
+        """
+        Coarse knowledge level of the student for the given concepts, used to key
+        the answer cache: "novice", "intermediate" or "advanced" by the share of
+        concepts already understood. Returns None if the student has a
+        misconception about any of them, since that answer is personal, or if
+        no concepts matched, since nothing then tells apart what the question
+        is about.
+        """
+        if not concepts:
+            return None
+        if any(concept in self.student_model.misconceptions for concept in concepts):
+            return None
+        understood = sum(1 for concept in concepts if concept in self.student_model.understood_concepts)
+        ratio = understood / len(set(concepts))
+        if ratio < 1 / 3:
+            return "novice"
+        return "intermediate" if ratio < 2 / 3 else "advanced"
+    
+    def _probe_answer_cache(self, user_question: str, concepts: List[str]) -> Optional[CacheProbe]:
+        """Look the question up in the shared answer cache, or return None if it must not be cached."""
+        if self.answer_cache is None:
+            return None
+        bucket = self._knowledge_bucket(concepts)
+        if bucket is None:
+            return None
+        probe = self.answer_cache.probe(user_question, concepts, bucket)
+        if probe.answer is not None:
+            logger.debug(f"Answer cache hit (similarity {probe.similarity:.2f})")
+        return probe
+    
+    def _call_claude(self, request: Dict[str, Any]):
+        """
+        Send a request to Claude, sharing one upstream call between identical in-flight requests.
+        
+        Args:
+            request: System blocks and messages from _build_request()
+            
+        Returns:
+            The Messages API response
+        """
+        single_flight = self.core.single_flight
+        if single_flight is None:
+            response, shared = self._create_message(request), False
+        else:
+            response, shared = single_flight.do(prompt_fingerprint(request), lambda: self._create_message(request))
+        if shared:
+            # The leader already recorded this call's token usage
+            logger.debug("Reused the response of an identical in-flight request")
+            self.last_usage = None
+        else:
+            self._record_usage(response)
+        return response
+    
+    def _create_message(self, request: Dict[str, Any]):
+        """Create a message with the primary model, falling back to a second model on error."""
+        try:
+            # Create a message with Claude using the layered (cacheable) prompt
+            # Try the specified model first
+            return self.client.messages.create(
+                model="claude-3-opus-20240229",
+                max_tokens=1024,
+                **request
+            )
+        except Exception as model_error:
+            # If the specified model fails, try with a fallback model
+            logger.warning(f"Error with primary model: {str(model_error)}. Trying fallback model.")
+            try:
+                return self.client.messages.create(
+                    model="claude-3-haiku-20240307",  # Fallback to a different model
+                    max_tokens=1024,
+                    **request
+                )
+            except Exception as fallback_error:
+                logger.error(f"Fallback model also failed: {str(fallback_error)}")
+                raise fallback_error
+    
+    async def _call_claude_async(self, request: Dict[str, Any]):
+        """Non-blocking counterpart of _call_claude()."""
+        single_flight = self.core.single_flight
+        if single_flight is None:
+            response, shared = await self._create_message_async(request), False
+        else:
+            response, shared = await single_flight.do_async(
+                prompt_fingerprint(request), lambda: self._create_message_async(request)
+            )
+        if shared:
+            logger.debug("Reused the response of an identical in-flight request")
+            self.last_usage = None
+        else:
+            self._record_usage(response)
+        return response
+    
+    async def _create_message_async(self, request: Dict[str, Any]):
+        """Non-blocking counterpart of _create_message()."""
+        try:
+            return await self.async_client.messages.create(
+                model="claude-3-opus-20240229",
+                max_tokens=1024,
+                **request
+            )
+        except Exception as model_error:
+            # If the specified model fails, try with a fallback model
+            logger.warning(f"Error with primary model: {str(model_error)}. Trying fallback model.")
+            try:
+                return await self.async_client.messages.create(
+                    model="claude-3-haiku-20240307",  # Fallback to a different model
+                    max_tokens=1024,
+                    **request
+                )
+            except Exception as fallback_error:
+                logger.error(f"Fallback model also failed: {str(fallback_error)}")
+                raise fallback_error
+    
+    def _record_usage(self, response) -> None:
+        """Record cached and uncached input tokens reported by the API for one call."""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        self.last_usage = self.core.token_usage.record(usage)
+        logger.debug(f"Token usage: {self.last_usage}")
+    
     def _get_relevant_context(self, question: str) -> tuple[str, List[str]]:
         """
         Extract relevant context from the ontology based on the user's question.
         
+        The matched blocks are deduplicated, ranked and packed into the context
+        token budget by the core's ContextAssembler; the result is kept in
+        ``last_context`` for reporting.
+        
         Returns:
             tuple: (context_text, list_of_concepts_covered)
         """
         logger.debug(f"Getting context for question: {question}")
-        context = []
-        concepts_covered = []
+        blocks: List[ContextBlock] = []
         
         # Convert question to lowercase for case-insensitive matching
         question_lower = question.lower()
         
-        # 1. Check for general topics first (like "Newton's Laws" as a whole topic)
-        topic_mappings = {
-            "newton's laws": "NewtonsLaws",
-            "newtons laws": "NewtonsLaws",
-            "newton laws": "NewtonsLaws",
-            "kinematics": "Kinematics",
-            "motion": "Kinematics",
-        }
+        # Find every topic, law, quantity and concept-name phrase in one pass,
+        # grouped by priority and ordered as in the keyword tables
+        matches = self.keyword_matcher.match_by_priority(question)
         
-        # Check if the question is about a general topic
-        for topic_phrase, topic_name in topic_mappings.items():
-            if topic_phrase in question_lower:
-                topic_obj = self.onto.search_one(iri=f"*{topic_name}")
-                if topic_obj:
-                    concepts_covered.append(topic_name)
-                    context.append(f"Topic: {topic_name}")
-                    
-                    # Add topic definition if available
-                    if hasattr(topic_obj, 'hasDefinition') and len(topic_obj.hasDefinition) > 0:
-                        context.append(f"Definition: {topic_obj.hasDefinition[0]}")
-                    
-                    # Find all concepts that are part of this topic
-                    related_concepts = []
-                    for concept in self.onto.search(isPartOf=topic_obj):
-                        related_concepts.append(concept)
-                        concepts_covered.append(concept.name)
-                    
-                    # If this is Newton's Laws, also add the three laws
-                    if topic_name == "NewtonsLaws":
-                        laws = ["NewtonsFirstLaw", "NewtonsSecondLaw", "NewtonsThirdLaw"]
-                        context.append("This topic includes the following laws:")
-                        
-                        for law_name in laws:
-                            law_obj = self.onto.search_one(iri=f"*{law_name}")
-                            if law_obj and hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
-                                context.append(f"- {law_name}: {law_obj.hasDefinition[0]}")
-                    
-                    # Return early if we've found a matching topic
-                    return "\n".join(context), concepts_covered
+        # 1. Check for general topics first (like "Newton's Laws" as a whole topic)
+        for match in matches.get(TOPIC, []):
+            topic_obj = self.concept_index.get(match.value)
+            if topic_obj:
+                self._add_block_to_context("topic", topic_obj, self._render_topic_block, blocks)
+                
+                # Return early if we've found a matching topic
+                return self._assemble_context(question, blocks)
         
         # 2. Check for specific Newton's Laws
-        law_mappings = {
-            "newton's first law": "NewtonsFirstLaw",
-            "newtons first law": "NewtonsFirstLaw",
-            "newton first law": "NewtonsFirstLaw",
-            "first law": "NewtonsFirstLaw",
-            "law of inertia": "NewtonsFirstLaw",
-            "inertia": "NewtonsFirstLaw",
-            
-            "newton's second law": "NewtonsSecondLaw",
-            "newtons second law": "NewtonsSecondLaw",
-            "newton second law": "NewtonsSecondLaw",
-            "second law": "NewtonsSecondLaw",
-            "f = ma": "NewtonsSecondLaw",
-            "f=ma": "NewtonsSecondLaw",
-            
-            "newton's third law": "NewtonsThirdLaw",
-            "newtons third law": "NewtonsThirdLaw",
-            "newton third law": "NewtonsThirdLaw",
-            "third law": "NewtonsThirdLaw",
-            "action reaction": "NewtonsThirdLaw",
-            "equal and opposite": "NewtonsThirdLaw"
-        }
-        
-        for question_law, ontology_law in law_mappings.items():
-            if question_law in question_lower:
-                law_obj = self.onto.search_one(iri=f"*{ontology_law}")
-                if law_obj:
-                    concepts_covered.append(ontology_law)
-                    context.append(f"Law: {ontology_law}")
-                    if hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
-                        context.append(f"Definition: {law_obj.hasDefinition[0]}")
-                    if hasattr(law_obj, 'hasPrerequisite'):
-                        context.append("Prerequisites:")
-                        for prereq in law_obj.hasPrerequisite:
-                            concepts_covered.append(prereq.name)
-                            if hasattr(prereq, 'hasDefinition') and len(prereq.hasDefinition) > 0:
-                                context.append(f"- {prereq.name}: {prereq.hasDefinition[0]}")
-                            else:
-                                context.append(f"- {prereq.name}")
-                    if hasattr(law_obj, 'hasFormula') and len(law_obj.hasFormula) > 0:
-                        formula = law_obj.hasFormula[0]
-                        if hasattr(formula, 'hasDefinition') and len(formula.hasDefinition) > 0:
-                            context.append(f"Formula: {formula.hasDefinition[0]}")
-                    if hasattr(law_obj, 'hasExample'):
-                        context.append("Examples:")
-                        for example in law_obj.hasExample:
-                            if hasattr(example, 'hasExplanation') and len(example.hasExplanation) > 0:
-                                context.append(f"- {example.hasExplanation[0]}")
-                    if hasattr(law_obj, 'hasApplication'):
-                        context.append("Applications:")
-                        for app in law_obj.hasApplication:
-                            if hasattr(app, 'hasDescription') and len(app.hasDescription) > 0:
-                                context.append(f"- {app.hasDescription[0]}")
-                    return "\n".join(context), concepts_covered
+        for match in matches.get(LAW, []):
+            law_obj = self.concept_index.get(match.value)
+            if law_obj:
+                self._add_block_to_context("law", law_obj, self._render_law_block, blocks)
+                return self._assemble_context(question, blocks)
         
         # 3. Check for physical quantities and other concepts
-        quantity_mappings = {
-            "force": "Force",
-            "mass": "Mass",
-            "acceleration": "Acceleration",
-            "velocity": "Velocity",
-            "speed": "Velocity",
-            "position": "Position",
-            "time": "Time",
-            "newton": "Newton",
-            "kilogram": "Kilogram",
-            "meter": "Meter",
-            "second": "Second"
-        }
-        
-        # First look for exact matches in the mappings
-        for keyword, concept_name in quantity_mappings.items():
-            # Check if the keyword appears as a complete word
-            # This uses word boundaries to avoid matching 'mass' in 'massive'
-            import re
-            if re.search(r'\b' + keyword + r'\b', question_lower):
-                concept_obj = self.onto.search_one(iri=f"*{concept_name}")
-                if concept_obj:
-                    concepts_covered.append(concept_name)
-                    self._add_concept_to_context(concept_obj, context, concepts_covered)
-        
-        # 4. If still no context, try looking for any concept
-        if not context:
-            # Get all concepts from the ontology
-            all_concepts = list(self.onto.search(type=self.onto.PhysicalQuantity)) + \
-                          list(self.onto.search(type=self.onto.Law)) + \
-                          list(self.onto.search(type=self.onto.Unit))
-            
-            # Tokenize the question
-            try:
-                from nltk.tokenize import word_tokenize
-                tokens = word_tokenize(question_lower)
-            except ImportError:
-                # If NLTK is not available, fall back to simple splitting
-                tokens = question_lower.split()
-            except Exception:
-                # If NLTK fails for any other reason, fall back to simple splitting
-                tokens = question_lower.split()
-            
-            # Find any concept whose name (or part of it) appears in the tokens
-            for concept in all_concepts:
-                concept_name = concept.name.lower()
-                # Check if any token is a substring of the concept name or vice versa
-                for token in tokens:
-                    if token in concept_name or concept_name in token:
-                        if token not in ["what", "is", "the", "a", "an", "of", "in", "on", "for", "about"]:
-                            concepts_covered.append(concept.name)
-                            self._add_concept_to_context(concept, context, concepts_covered)
-                            break
+        # Keywords are matched as complete words, so 'mass' does not match 'massive'
+        for match in matches.get(QUANTITY, []):
+            concept_obj = self.concept_index.get(match.value)
+            if concept_obj:
+                self._add_concept_to_context(concept_obj, blocks)
+        
+        # 4. If still no context, look for any quantity, law or unit named in the question
+        if not blocks:
+            for match in matches.get(CONCEPT, []):
+                concept = self.concept_index.get(match.value)
+                if concept:
+                    self._add_concept_to_context(concept, blocks)
+        
+        # 5. If still no context, retrieve the concepts whose definitions, examples and
+        #    applications share the most words with the question
+        if not blocks and self.core.retrieval_index is not None:
+            for concept_name, _ in self.core.retrieval_index.search(question, RETRIEVAL_TOP_K):
+                concept = self.concept_index.get(concept_name)
+                if concept:
+                    self._add_concept_to_context(concept, blocks)
         
         # Return the results with appropriate message
-        if context:
-            return "\n".join(context), list(set(concepts_covered))
+        if blocks:
+            return self._assemble_context(question, blocks)
         else:
+            self.last_context = None
             # If we still couldn't find context, provide a general guide based on the question
             if any(keyword in question_lower for keyword in ["newton", "law", "motion", "force"]):
                 return "The question appears to be about Newton's Laws or classical mechanics, but no specific concept was identified.", []
             else:
                 return "No specific context found for this question.", []
     
-    def _add_concept_to_context(self, concept, context: List[str], concepts_covered: List[str]):
+    def _assemble_context(self, question: str, blocks: List[ContextBlock]) -> tuple[str, List[str]]:
+        """Deduplicate, rank and pack the matched blocks into the context token budget."""
+        self.last_context = self.core.context_assembler.assemble(question, blocks)
+        if self.last_context.tokens_saved:
+            logger.debug(f"Context assembly saved {self.last_context.tokens_saved} tokens "
+                         f"({self.last_context.duplicate_lines} duplicate lines, "
+                         f"{self.last_context.blocks_dropped} blocks over budget)")
+        return self.last_context.text, self.last_context.concepts_covered
+    
+    def _add_concept_to_context(self, concept, blocks: List[ContextBlock]):
         """Helper method to add concept information to the context."""
-        context.append(f"Concept: {concept.name}")
+        self._add_block_to_context("concept", concept, self._render_concept_block, blocks)
+    
+    def _add_block_to_context(self, kind: str, concept, render: Callable[[object], RenderedBlock],
+                              blocks: List[ContextBlock]):
+        """Append a concept's rendered block, rendering it only on the first request per ontology version."""
+        block = self.context_cache.get_or_render(
+            self.core.ontology_version, kind, concept.name, lambda: render(concept)
+        )
+        covered = tuple(dict.fromkeys((concept.name, *block.concepts_covered)))
+        blocks.append(ContextBlock(kind, concept.name, block.lines, covered, block.line_concepts))
+    
+    def _render_topic_block(self, topic_obj) -> RenderedBlock:
+        """Render a topic, the concepts that are part of it and (for Newton's Laws) the three laws."""
+        context = [f"Topic: {topic_obj.name}"]
+        concepts_covered = [topic_obj.name]
+        line_concepts = {0: topic_obj.name}
+        
+        # Add topic definition if available
+        if hasattr(topic_obj, 'hasDefinition') and len(topic_obj.hasDefinition) > 0:
+            context.append(f"Definition: {topic_obj.hasDefinition[0]}")
+        
+        # Find all concepts that are part of this topic
+        for concept in self.concept_index.parts_of(topic_obj.name):
+            concepts_covered.append(concept.name)
+        
+        # If this is Newton's Laws, also add the three laws
+        if topic_obj.name == "NewtonsLaws":
+            context.append("This topic includes the following laws:")
+            for law_name in KEY_LAWS:
+                law_obj = self.concept_index.get(law_name)
+                if law_obj and hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
+                    line_concepts[len(context)] = law_name
+                    context.append(f"- {law_name}: {law_obj.hasDefinition[0]}")
+        
+        return render_block(context, concepts_covered, line_concepts)
+    
+    def _render_law_block(self, law_obj) -> RenderedBlock:
+        """Render a law with its prerequisites, formula, examples and applications."""
+        context = [f"Law: {law_obj.name}"]
+        concepts_covered = [law_obj.name]
+        line_concepts = {0: law_obj.name}
+        if hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
+            context.append(f"Definition: {law_obj.hasDefinition[0]}")
+        if hasattr(law_obj, 'hasPrerequisite'):
+            context.append("Prerequisites:")
+            for prereq in law_obj.hasPrerequisite:
+                concepts_covered.append(prereq.name)
+                line_concepts[len(context)] = prereq.name
+                if hasattr(prereq, 'hasDefinition') and len(prereq.hasDefinition) > 0:
+                    context.append(f"- {prereq.name}: {prereq.hasDefinition[0]}")
+                else:
+                    context.append(f"- {prereq.name}")
+        if hasattr(law_obj, 'hasFormula') and len(law_obj.hasFormula) > 0:
+            formula = law_obj.hasFormula[0]
+            if hasattr(formula, 'hasDefinition') and len(formula.hasDefinition) > 0:
+                context.append(f"Formula: {formula.hasDefinition[0]}")
+        if hasattr(law_obj, 'hasExample'):
+            context.append("Examples:")
+            for example in law_obj.hasExample:
+                if hasattr(example, 'hasExplanation') and len(example.hasExplanation) > 0:
+                    context.append(f"- {example.hasExplanation[0]}")
+        if hasattr(law_obj, 'hasApplication'):
+            context.append("Applications:")
+            for app in law_obj.hasApplication:
+                if hasattr(app, 'hasDescription') and len(app.hasDescription) > 0:
+                    context.append(f"- {app.hasDescription[0]}")
+        return render_block(context, concepts_covered, line_concepts)
+    
+    def _render_concept_block(self, concept) -> RenderedBlock:
+        """Render a concept with its related concepts, unit, prerequisites, formula, examples and applications."""
+        context = [f"Concept: {concept.name}"]
+        concepts_covered = []
+        line_concepts = {0: concept.name}
         if hasattr(concept, 'hasDefinition') and len(concept.hasDefinition) > 0:
             context.append(f"Definition: {concept.hasDefinition[0]}")
         
@@ -526,6 +743,7 @@ class ClaudeTutor:
             context.append("Related concepts:")
             for related in concept.relatesTo:
                 concepts_covered.append(related.name)
+                line_concepts[len(context)] = related.name
                 if hasattr(related, 'hasDefinition') and len(related.hasDefinition) > 0:
                     context.append(f"- {related.name}: {related.hasDefinition[0]}")
                 else:
@@ -535,6 +753,7 @@ class ClaudeTutor:
         if hasattr(concept, 'hasUnit') and len(concept.hasUnit) > 0:
             unit = concept.hasUnit[0]
             concepts_covered.append(unit.name)
+            line_concepts[len(context)] = unit.name
             if hasattr(unit, 'hasDefinition') and len(unit.hasDefinition) > 0:
                 context.append(f"Unit: {unit.name} - {unit.hasDefinition[0]}")
             else:
@@ -545,6 +764,7 @@ class ClaudeTutor:
             context.append("Prerequisites:")
             for prereq in concept.hasPrerequisite:
                 concepts_covered.append(prereq.name)
+                line_concepts[len(context)] = prereq.name
                 if hasattr(prereq, 'hasDefinition') and len(prereq.hasDefinition) > 0:
                     context.append(f"- {prereq.name}: {prereq.hasDefinition[0]}")
                 else:
@@ -569,68 +789,56 @@ class ClaudeTutor:
             for app in concept.hasApplication:
                 if hasattr(app, 'hasDescription') and len(app.hasDescription) > 0:
                     context.append(f"- {app.hasDescription[0]}")
+        
+        return render_block(context, concepts_covered, line_concepts)
     
-    def _adapt_context_to_student(self, context: str, concepts: List[str]) -> str:
+    def _adapt_context_to_student(self, context: str, concepts: List[str],
+                                  blocks: Optional[List[ContextBlock]] = None) -> str:
         """
         Adapt the context based on the student's knowledge level.
         
+        Item lines about a concept are annotated from the concept id the block
+        records for them, so each line costs two bit tests however many concepts
+        the student has seen, and "Mass" never matches inside "MassUnit".
+        
         Args:
             context: The original context from the ontology
             concepts: List of concepts covered in the context
+            blocks: The assembled context blocks (defaults to those of the last question)
             
         Returns:
             Adapted context for the student
         """
-        # If no student model or empty context, return as is
-        if not self.student_model or not context or context == "No specific context found for this question.":
+        if blocks is None:
+            blocks = self.last_context.blocks if self.last_context else []
+        # If no student model or no ontology context, return as is
+        if not self.student_model or not blocks:
             return context
         
-        adapted_lines = []
-        original_lines = context.split('\n')
-        
-        # Identify knowledge gaps
-        knowledge_gaps = self.student_model.get_knowledge_gaps()
+        # Knowledge gaps and understood concepts as bitsets over concept_vocabulary ids
+        understood = self.student_model.understood_mask
+        knowledge_gaps = self.student_model.exposed_mask & ~understood
         
         # Add a note about adapting to the student's knowledge
-        adapted_lines.append("Adapted context for student knowledge level:")
+        adapted_lines = ["Adapted context for student knowledge level:"]
         
-        # Process each line and adapt based on student knowledge
-        for line in original_lines:
-            # Always include definitions and basic information
-            if line.startswith("Law:") or line.startswith("Concept:") or line.startswith("Definition:"):
-                adapted_lines.append(line)
-                continue
-                
-            # For prerequisites, examples, and applications, adapt based on student knowledge
-            if line.startswith("Prerequisites:"):
-                adapted_lines.append(line)
-                continue
-                
-            if line.startswith("- "):
-                # If this is a concept and student needs to review it, highlight it
-                for gap in knowledge_gaps:
-                    if gap in line:
+        for block in blocks:
+            for line, concept_id in zip_longest(block.lines, block.line_concepts, fillvalue=-1):
+                # Definitions, headers, examples and applications are included as they are
+                if concept_id >= 0 and line.startswith("- "):
+                    if knowledge_gaps >> concept_id & 1:
                         line = f"{line} [KNOWLEDGE GAP - NEEDS REVIEW]"
-                        break
-                
-                # If this is a concept and student already understands it, note it
-                for understood in self.student_model.understood_concepts:
-                    if understood in line:
+                    elif understood >> concept_id & 1:
                         line = f"{line} [ALREADY UNDERSTOOD]"
-                        break
-                        
                 adapted_lines.append(line)
-                continue
-                
-            # Include other sections (examples, applications)
-            adapted_lines.append(line)
         
         # Add learning recommendations based on this context
-        ready_concepts = self.student_model.get_ready_concepts(self.concept_prerequisites)
+        ready_concepts = self.core.prerequisite_graph.ready_concepts(self.student_model)
         if ready_concepts:
             adapted_lines.append("\nRecommended next concepts to learn:")
+            covered = set(concepts)
             for concept in ready_concepts:
-                if concept in concepts:  # Only recommend concepts related to current context
+                if concept in covered:  # Only recommend concepts related to current context
                     adapted_lines.append(f"- {concept} [READY TO LEARN]")
         
         # If there are misconceptions related to these concepts, add them
@@ -0,0 +1,240 @@
+"""
+Cohort analytics over many students' knowledge states.
+
+Class dashboards need the knowledge gaps, readiness and misconceptions of a
+whole cohort, and looping over StudentModel objects for that is slow. A
+CohortMatrix loads the cohort into NumPy arrays with one row per student and
+one column per concept, and answers the dashboard queries with column-wise
+array operations:
+
+- gap_frequencies(): how many students were exposed to a concept without understanding it
+- readiness_counts(): how many students are ready to learn each concept
+- mastery_distribution(): histogram, mean and median of knowledge levels per concept
+- top_misconceptions(): the most common (concept, misconception) pairs
+
+Student bitsets are unpacked with np.unpackbits, so building the matrix from
+StudentModels does no per-concept Python work.
+"""
+
+import logging
+from typing import Dict, List, Iterable, Optional, Sequence, Tuple, Any
+import numpy as np
+from llm_integration.student_model import StudentModel, ConceptVocabulary, concept_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Default knowledge level bin edges for mastery_distribution()
+MASTERY_BINS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def _unpack_bitsets(bitsets: Sequence[int], n_columns: int) -> np.ndarray:
+    """Unpack Python-int bitsets into a (len(bitsets), n_columns) boolean matrix."""
+    n_bytes = max(1, (n_columns + 7) // 8)
+    buffer = b"".join(bits.to_bytes(n_bytes, "little") for bits in bitsets)
+    packed = np.frombuffer(buffer, dtype=np.uint8).reshape(len(bitsets), n_bytes)
+    return np.unpackbits(packed, axis=1, bitorder="little")[:, :n_columns].astype(bool)
+
+
+class CohortMatrix:
+    """Knowledge states of a cohort as students × concepts NumPy arrays."""
+
+    def __init__(self, student_ids: List[str], concepts: List[str], exposed: np.ndarray, understood: np.ndarray,
+                 levels: np.ndarray, misconceptions: Optional[List[Tuple[int, str, str]]] = None):
+        """
+        Wrap prebuilt arrays; use from_models() or from_records() to build them.
+
+        Args:
+            student_ids: Row labels
+            concepts: Column labels
+            exposed: Boolean matrix of exposed concepts
+            understood: Boolean matrix of understood concepts
+            levels: float32 matrix of knowledge levels, NaN where a student has no level
+            misconceptions: (row, concept, description) triples
+        """
+        self.student_ids = student_ids
+        self.concepts = concepts
+        self.exposed = exposed
+        self.understood = understood
+        self.levels = levels
+        self.misconceptions = misconceptions or []
+        self._columns = {concept: column for column, concept in enumerate(concepts)}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.exposed.shape
+
+    @classmethod
+    def from_models(cls, models: Iterable[StudentModel], vocabulary: Optional[ConceptVocabulary] = None,
+                    concepts: Optional[Sequence[str]] = None) -> "CohortMatrix":
+        """
+        Load StudentModels sharing one vocabulary.
+
+        Args:
+            models: The cohort's student models
+            vocabulary: Their concept vocabulary (defaults to concept_vocabulary)
+            concepts: Optional subset of columns to keep (defaults to the whole vocabulary)
+        """
+        vocabulary = vocabulary if vocabulary is not None else concept_vocabulary
+        models = list(models)
+        if any(model.vocabulary is not vocabulary for model in models):
+            raise ValueError("All student models must use the cohort's concept vocabulary")
+        n_columns = len(vocabulary)
+
+        exposed = _unpack_bitsets([model.exposed_mask for model in models], n_columns)
+        understood = _unpack_bitsets([model.understood_mask for model in models], n_columns)
+
+        # Packed levels are in id order per student, which is the row-major order of np.nonzero
+        packed_levels = [model.packed_levels for model in models]
+        has_level = _unpack_bitsets([bits for bits, _ in packed_levels], n_columns)
+        levels = np.full((len(models), n_columns), np.nan, dtype=np.float32)
+        values = np.frombuffer(b"".join(values.tobytes() for _, values in packed_levels if values), dtype=np.float32)
+        levels[np.nonzero(has_level)] = values
+
+        misconceptions = [(row, concept, text) for row, model in enumerate(models)
+                          for concept, text in model.misconception_items()]
+        cohort = cls([model.student_id for model in models], list(vocabulary._names[:n_columns]),
+                     exposed, understood, levels, misconceptions)
+        return cohort.select(concepts) if concepts is not None else cohort
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict[str, Any]], concepts: Optional[Sequence[str]] = None) -> "CohortMatrix":
+        """
+        Load serialized student models (StudentModel.to_dict()), e.g. from StudentStore.load_many().
+
+        Args:
+            records: student_id -> serialized model
+            concepts: Columns; defaults to every concept named in the records, sorted
+        """
+        if concepts is None:
+            concepts = sorted({concept for data in records.values()
+                               for concept in (*data.get('exposed_concepts', ()), *data.get('knowledge_level', ()))})
+        columns = {concept: column for column, concept in enumerate(concepts)}
+        shape = (len(records), len(concepts))
+        exposed, understood = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+        levels = np.full(shape, np.nan, dtype=np.float32)
+        misconceptions = []
+        for row, data in enumerate(records.values()):
+            exposed[row, [columns[c] for c in data.get('exposed_concepts', ()) if c in columns]] = True
+            understood[row, [columns[c] for c in data.get('understood_concepts', ()) if c in columns]] = True
+            for concept, level in data.get('knowledge_level', {}).items():
+                if concept in columns:
+                    levels[row, columns[concept]] = level
+            misconceptions.extend((row, concept, text) for concept, text in data.get('misconceptions', {}).items())
+        return cls(list(records), list(concepts), exposed, understood, levels, misconceptions)
+
+    def select(self, concepts: Sequence[str]) -> "CohortMatrix":
+        """Return a cohort restricted to the given concept columns (unknown concepts are all-zero columns)."""
+        n_rows = len(self.student_ids)
+        index = np.array([self._columns.get(concept, -1) for concept in concepts], dtype=np.intp)
+        known = index >= 0
+
+        def take(matrix: np.ndarray, fill) -> np.ndarray:
+            selected = np.full((n_rows, len(concepts)), fill, dtype=matrix.dtype)
+            selected[:, known] = matrix[:, index[known]]
+            return selected
+
+        keep = set(concepts)
+        return CohortMatrix(self.student_ids, list(concepts), take(self.exposed, False), take(self.understood, False),
+                            take(self.levels, np.nan), [m for m in self.misconceptions if m[1] in keep])
+
+    def gap_frequencies(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Concepts students were exposed to but have not understood, most frequent first.
+
+        Returns:
+            [{'concept', 'students', 'share'}] for concepts with at least one gap
+        """
+        counts = (self.exposed & ~self.understood).sum(axis=0)
+        return self._ranked(counts, top)
+
+    def readiness_counts(self, concept_prerequisites: Dict[str, List[str]], top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Number of students ready to learn each concept: not understood, all prerequisites understood.
+
+        Args:
+            concept_prerequisites: Dictionary mapping concepts to their direct prerequisites
+            top: Only return the most common concepts
+        """
+        counts = np.zeros(len(self.concepts), dtype=np.int64)
+        for concept, prerequisites in concept_prerequisites.items():
+            column = self._columns.get(concept)
+            if column is None:
+                continue
+            ready = ~self.understood[:, column]
+            prereq_columns = [self._columns.get(prereq) for prereq in prerequisites]
+            if None in prereq_columns:
+                continue  # nobody can have understood an untracked prerequisite
+            if prereq_columns:
+                ready &= self.understood[:, prereq_columns].all(axis=1)
+            counts[column] = ready.sum()
+        return self._ranked(counts, top)
+
+    def mastery_distribution(self, bins: Sequence[float] = MASTERY_BINS) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-concept distribution of knowledge levels among students who have a level.
+
+        Args:
+            bins: Increasing bin edges; the last bin includes its upper edge
+
+        Returns:
+            concept -> {'students', 'mean', 'median', 'histogram'} for concepts with any level
+        """
+        has_level = ~np.isnan(self.levels)
+        students = has_level.sum(axis=0)
+        edges = np.asarray(bins, dtype=np.float32)
+        # Students below each edge (NaN compares False); the last edge is inclusive
+        below = [(self.levels < edge).sum(axis=0) for edge in edges[:-1]]
+        below.append((self.levels <= edges[-1]).sum(axis=0))
+        histogram = np.diff(np.stack(below, axis=1), axis=1)
+        # NaNs sort last, so each column's levels come first and the median sits at its middle
+        columns = np.arange(len(self.concepts))
+        ordered = np.sort(self.levels, axis=0)
+        safe = np.maximum(students, 1)
+        medians = (ordered[(safe - 1) // 2, columns] + ordered[safe // 2, columns]) / 2
+        means = np.where(has_level, self.levels, 0).sum(axis=0) / safe
+
+        return {
+            concept: {
+                'students': int(students[column]),
+                'mean': round(float(means[column]), 4),
+                'median': round(float(medians[column]), 4),
+                'histogram': histogram[column].tolist(),
+            }
+            for column, concept in enumerate(self.concepts) if students[column]
+        }
+
+    def top_misconceptions(self, top: int = 10) -> List[Dict[str, Any]]:
+        """Most common (concept, misconception) pairs across the cohort."""
+        if not self.misconceptions:
+            return []
+        pairs = np.array([f"{concept}\x00{text}" for _, concept, text in self.misconceptions], dtype=object)
+        unique, counts = np.unique(pairs, return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:top]
+        n_students = len(self.student_ids)
+        return [
+            dict(zip(('concept', 'misconception'), unique[i].split("\x00", 1)),
+                 students=int(counts[i]), share=round(int(counts[i]) / n_students, 4))
+            for i in order
+        ]
+
+    def summary(self, concept_prerequisites: Optional[Dict[str, List[str]]] = None, top: int = 10) -> Dict[str, Any]:
+        """All dashboard metrics in one JSON-compatible dict."""
+        return {
+            'students': len(self.student_ids),
+            'concepts': len(self.concepts),
+            'knowledge_gaps': self.gap_frequencies(top),
+            'ready_to_learn': self.readiness_counts(concept_prerequisites, top) if concept_prerequisites else None,
+            'mastery': self.mastery_distribution(),
+            'misconceptions': self.top_misconceptions(top),
+        }
+
+    def _ranked(self, counts: np.ndarray, top: Optional[int]) -> List[Dict[str, Any]]:
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0][:top]
+        n_students = max(1, len(self.student_ids))
+        return [
+            {'concept': self.concepts[column], 'students': int(counts[column]),
+             'share': round(int(counts[column]) / n_students, 4)}
+            for column in order
+        ]
+
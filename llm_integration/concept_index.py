@@ -0,0 +1,90 @@
+"""
+Name-keyed index over the individuals of the physics ontology.
+
+``onto.search_one(iri=f"*{name}")`` is a wildcard scan over every IRI, and the
+tutor issues it repeatedly while building context for each question. The
+ConceptIndex is built once when the ontology is loaded and answers the same
+lookups with dictionary hits, keyed by:
+
+1. Local name ("NewtonsFirstLaw")
+2. Lowercase name ("newtonsfirstlaw")
+3. Aliases ("law of inertia", "f=ma", ...)
+
+It also keeps reverse ``isPartOf`` and per-class member lists so topic and
+type queries don't rescan the ontology either.
+"""
+
+import logging
+from typing import List, Dict, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConceptIndex:
+    """O(1) lookup of ontology individuals by name, lowercase name or alias."""
+
+    def __init__(self, onto, aliases: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        Build the index.
+
+        Args:
+            onto: Loaded ontology (a SnapshotOntology)
+            aliases: Optional (alias, concept name) pairs. Aliases are matched
+                     case-insensitively; the first alias registered for a key wins.
+        """
+        self._by_name: Dict[str, object] = {}
+        self._by_lower: Dict[str, object] = {}
+        self._parts: Dict[str, List[object]] = {}
+        self._by_type: Dict[str, List[object]] = {}
+
+        for individual in onto.individuals():
+            name = individual.name
+            self._by_name.setdefault(name, individual)
+            self._by_lower.setdefault(name.lower(), individual)
+            for whole in individual.isPartOf:
+                self._parts.setdefault(whole.name, []).append(individual)
+
+        for cls in onto.classes():
+            self._by_type[cls.name] = onto.search(type=cls)
+
+        for alias, concept_name in aliases or []:
+            individual = self._by_name.get(concept_name)
+            if individual is None:
+                logger.debug(f"Alias '{alias}' points at unknown concept {concept_name}")
+                continue
+            self._by_lower.setdefault(alias.lower(), individual)
+
+        logger.debug(f"Concept index built: {len(self._by_name)} names, {len(self._by_lower)} keys")
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str):
+        """
+        Look up an individual by local name, falling back to lowercase name and aliases.
+
+        Args:
+            name: Local name, any-case name or alias
+
+        Returns:
+            The individual, or None if nothing matches
+        """
+        individual = self._by_name.get(name)
+        if individual is None:
+            individual = self._by_lower.get(name.lower())
+        return individual
+
+    def names(self) -> List[str]:
+        """Return the local names of all individuals, in ontology order."""
+        return list(self._by_name)
+
+    def parts_of(self, whole_name: str) -> List[object]:
+        """Return the individuals declared ``isPartOf`` the named topic."""
+        return self._parts.get(whole_name, [])
+
+    def of_type(self, class_name: str) -> List[object]:
+        """Return the individuals of a class (including subclasses)."""
+        return self._by_type.get(class_name, [])
@@ -0,0 +1,186 @@
+"""
+Token-budgeted assembly of the per-question context.
+
+_get_relevant_context() renders one block per matched topic, law or concept.
+Blocks of neighbouring concepts repeat each other's prerequisites and related
+concepts, and a question matching many quantity keywords used to add a block
+for every one of them, so the context grew without bound. The ContextAssembler
+turns the rendered blocks into the context sent to Claude:
+
+1. Drops repeated blocks and repeated "- " item lines (keeping the first),
+   together with section headers left without items
+2. Ranks blocks by how many of the question's words they contain, keeping
+   match order between equally relevant blocks
+3. Packs blocks into a token budget, truncating the first block that does not
+   fit and skipping blocks that no longer fit. A truncated block only covers
+   its own concept and the concepts whose lines it kept
+
+Token counts come from estimate_tokens(), a local approximation of the
+tokenizer that needs no network call. Tokens saved by deduplication and the
+budget are returned per request and totalled in stats().
+"""
+
+import re
+import threading
+from typing import Dict, List, Iterable, Optional, Sequence, Tuple, NamedTuple, Any
+from llm_integration.answer_cache import normalize_question, content_words
+from llm_integration.student_model import concept_vocabulary
+
+# Word pieces of up to 6 characters and single punctuation marks, roughly one token each
+_TOKEN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of tokens Claude's tokenizer produces for ``text``."""
+    return len(_TOKEN.findall(text))
+
+
+class ContextBlock(NamedTuple):
+    """One rendered topic, law or concept and the concept names it covers."""
+    kind: str
+    name: str
+    lines: Tuple[str, ...]
+    concepts_covered: Tuple[str, ...]
+    # concept_vocabulary id of the concept each line is about, -1 for other lines
+    line_concepts: Tuple[int, ...] = ()
+
+
+class AssembledContext(NamedTuple):
+    """The packed context and what assembling it saved."""
+    text: str
+    concepts_covered: List[str]
+    blocks: List[ContextBlock]
+    tokens: int
+    tokens_saved: int
+    duplicate_lines: int
+    blocks_dropped: int
+
+
+def _is_header(line: str) -> bool:
+    return line.endswith(":") and not line.startswith("- ")
+
+
+def _dedupe_lines(lines: Sequence[str], seen: set) -> Tuple[List[int], int]:
+    """
+    Drop item lines already in ``seen`` and headers whose items were all dropped.
+
+    Returns:
+        (indices of the kept lines, number of dropped item lines)
+    """
+    kept: List[int] = []
+    removed = 0
+    header_at: Optional[int] = None
+    header_had_items = header_kept_items = False
+    for index, line in enumerate(lines):
+        if line.startswith("- "):
+            header_had_items = True
+            if line in seen:
+                removed += 1
+                continue
+            header_kept_items = True
+        elif _is_header(line):
+            if header_at is not None and header_had_items and not header_kept_items:
+                del kept[header_at]
+            header_at, header_had_items, header_kept_items = len(kept), False, False
+        kept.append(index)
+    if header_at is not None and header_had_items and not header_kept_items:
+        del kept[header_at]
+    return kept, removed
+
+
+class ContextAssembler:
+    """Deduplicates, ranks and packs context blocks into a token budget."""
+
+    def __init__(self, token_budget: Optional[int] = 1500):
+        """
+        Args:
+            token_budget: Maximum estimated tokens of context per question (None or 0 for no limit)
+        """
+        self.token_budget = token_budget or None
+        self._lock = threading.Lock()
+        self._totals = dict.fromkeys(
+            ('requests', 'tokens_in', 'tokens_out', 'duplicate_lines', 'blocks_dropped', 'truncated'), 0
+        )
+
+    def assemble(self, question: str, blocks: Iterable[ContextBlock]) -> AssembledContext:
+        """
+        Build the context for a question from its rendered blocks.
+
+        Args:
+            question: The student's question, used to rank blocks
+            blocks: Rendered blocks in match order
+
+        Returns:
+            The AssembledContext; its text is empty if no blocks were given
+        """
+        blocks = list(blocks)
+        # What concatenating every block, as before, would have cost
+        tokens_in = sum(estimate_tokens(line) + 1 for block in blocks for line in block.lines)
+        unique: Dict[Tuple[str, str], ContextBlock] = {}
+        for block in blocks:
+            unique.setdefault((block.kind, block.name), block)
+        candidates = list(unique.values())
+
+        question_terms = set(content_words(normalize_question(question)))
+        if len(candidates) > 1 and question_terms:
+            relevance = [len(question_terms.intersection(content_words(normalize_question(" ".join(block.lines)))))
+                         for block in candidates]
+            order = sorted(range(len(candidates)), key=lambda i: -relevance[i])
+            candidates = [candidates[i] for i in order]
+
+        seen: set = set()
+        lines: List[str] = []
+        packed: List[ContextBlock] = []
+        tokens = duplicates = dropped = truncated = 0
+        for block in candidates:
+            concepts_covered = block.concepts_covered
+            kept, removed = _dedupe_lines(block.lines, seen)
+            duplicates += removed
+            block_lines = [block.lines[i] for i in kept]
+            costs = [estimate_tokens(line) + 1 for line in block_lines]
+            remaining = self.token_budget - tokens if self.token_budget else None
+            if remaining is not None and sum(costs) > remaining:
+                # Keep the longest prefix that fits, if it holds more than the block's title line
+                fit, used = 0, 0
+                for cost in costs:
+                    if used + cost > remaining:
+                        break
+                    fit, used = fit + 1, used + cost
+                if fit < 2:
+                    dropped += 1
+                    continue
+                kept, block_lines, costs = kept[:fit], block_lines[:fit], costs[:fit]
+                truncated += 1
+                kept_ids = {block.line_concepts[i] for i in kept} if block.line_concepts else set()
+                concepts_covered = tuple(concept for concept in block.concepts_covered
+                                         if concept == block.name or concept_vocabulary.lookup(concept) in kept_ids)
+            seen.update(line for line in block_lines if line.startswith("- "))
+            lines.extend(block_lines)
+            tokens += sum(costs)
+            line_concepts = tuple(block.line_concepts[i] for i in kept) if block.line_concepts else ()
+            packed.append(block._replace(lines=tuple(block_lines), concepts_covered=concepts_covered,
+                                         line_concepts=line_concepts))
+
+        covered = list(dict.fromkeys(concept for block in packed for concept in block.concepts_covered))
+        result = AssembledContext("\n".join(lines), covered, packed, tokens, max(0, tokens_in - tokens),
+                                  duplicates, dropped)
+        with self._lock:
+            self._totals['requests'] += 1
+            self._totals['tokens_in'] += tokens_in
+            self._totals['tokens_out'] += tokens
+            self._totals['duplicate_lines'] += duplicates
+            self._totals['blocks_dropped'] += dropped
+            self._totals['truncated'] += truncated
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the budget and the totals across all assembled contexts."""
+        with self._lock:
+            totals = dict(self._totals)
+        saved = totals['tokens_in'] - totals['tokens_out']
+        return {
+            'token_budget': self.token_budget,
+            **totals,
+            'tokens_saved': saved,
+            'saved_ratio': round(saved / totals['tokens_in'], 4) if totals['tokens_in'] else 0.0,
+        }
@@ -0,0 +1,140 @@
+"""
+Cache of rendered per-concept context blocks.
+
+Rendering a concept's context walks relatesTo, hasUnit, hasPrerequisite,
+hasFormula, hasExample and hasApplication and formats the same lines every time
+a question touches that concept. The rendered lines (and the concept names they
+cover) depend only on the ontology, so they are rendered once and cached, keyed
+by ontology version, block kind and concept name. Repeat questions just
+concatenate cached fragments. Each block also records the concept_vocabulary id
+of the concept every line is about, so per-student annotation works on ids
+instead of searching the text.
+
+Entries for other ontology versions are evicted when a new TutorCore is loaded
+(see TutorCore and reload_tutor_core()); reloading an unchanged ontology keeps
+the cache warm.
+"""
+
+import sys
+import logging
+import threading
+from typing import Dict, List, Tuple, Callable, NamedTuple, Any
+from llm_integration.student_model import concept_vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class RenderedBlock(NamedTuple):
+    """Context lines for one concept and the concept names they cover."""
+    lines: Tuple[str, ...]
+    concepts_covered: Tuple[str, ...]
+    # concept_vocabulary id of the concept each line is about, -1 for other lines
+    line_concepts: Tuple[int, ...] = ()
+
+
+def render_block(lines: List[str], concepts_covered: List[str], line_concepts: Dict[int, str]) -> RenderedBlock:
+    """
+    Freeze rendered lines into a RenderedBlock.
+
+    Args:
+        lines: Context lines
+        concepts_covered: Concept names the lines cover
+        line_concepts: line index -> name of the concept that line is about
+    """
+    ids = [-1] * len(lines)
+    for index, name in line_concepts.items():
+        ids[index] = concept_vocabulary.id_for(name)
+    return RenderedBlock(tuple(lines), tuple(concepts_covered), tuple(ids))
+
+
+def _block_size(key: Tuple[str, str, str], block: RenderedBlock) -> int:
+    """Approximate memory held by one cache entry, in bytes."""
+    size = sys.getsizeof(key) + sys.getsizeof(block) + sys.getsizeof(block.lines) + sys.getsizeof(block.concepts_covered)
+    size += sys.getsizeof(block.line_concepts)
+    size += sum(sys.getsizeof(part) for part in key)
+    size += sum(sys.getsizeof(line) for line in block.lines)
+    return size
+
+
+class ContextCache:
+    """Thread-safe cache of RenderedBlocks with hit-rate and memory accounting."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], RenderedBlock] = {}
+        self._sizes: Dict[Tuple[str, str, str], int] = {}
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, version: str, kind: str, name: str,
+                      render: Callable[[], RenderedBlock]) -> RenderedBlock:
+        """
+        Return the cached block, rendering and storing it on a miss.
+
+        Rendering happens outside the lock; two threads missing on the same key
+        at once may both render, which is harmless because blocks are immutable.
+
+        Args:
+            version: Ontology version the block was rendered from
+            kind: Block kind ("concept", "law", "topic")
+            name: Concept name
+            render: Callable producing the block on a miss
+        """
+        key = (version, kind, name)
+        with self._lock:
+            block = self._entries.get(key)
+            if block is not None:
+                self.hits += 1
+                return block
+            self.misses += 1
+
+        block = render()
+        size = _block_size(key, block)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = block
+                self._sizes[key] = size
+                self._memory_bytes += size
+        return block
+
+    def retain_version(self, version: str) -> int:
+        """
+        Evict every entry rendered from a different ontology version.
+
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0] != version]
+            for key in stale:
+                del self._entries[key]
+                self._memory_bytes -= self._sizes.pop(key)
+        if stale:
+            logger.info(f"Evicted {len(stale)} context blocks from previous ontology versions")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._memory_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, hit rate and approximate memory footprint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'memory_bytes': self._memory_bytes,
+            }
+
+
+# Process-wide cache shared by every TutorCore in the worker
+context_cache = ContextCache()
@@ -0,0 +1,62 @@
+"""
+Keyword tables that route student questions to ontology concepts.
+
+Each table maps a lowercase phrase that may appear in a question to the local
+name of an ontology individual. They are consulted in priority order: topics,
+then specific laws, then physical quantities and units. The phrases also serve
+as aliases in the ConceptIndex.
+"""
+
+# General topics (like "Newton's Laws" as a whole topic)
+TOPIC_MAPPINGS = {
+    "newton's laws": "NewtonsLaws",
+    "newtons laws": "NewtonsLaws",
+    "newton laws": "NewtonsLaws",
+    "kinematics": "Kinematics",
+    "motion": "Kinematics",
+}
+
+# Specific Newton's Laws
+LAW_MAPPINGS = {
+    "newton's first law": "NewtonsFirstLaw",
+    "newtons first law": "NewtonsFirstLaw",
+    "newton first law": "NewtonsFirstLaw",
+    "first law": "NewtonsFirstLaw",
+    "law of inertia": "NewtonsFirstLaw",
+    "inertia": "NewtonsFirstLaw",
+
+    "newton's second law": "NewtonsSecondLaw",
+    "newtons second law": "NewtonsSecondLaw",
+    "newton second law": "NewtonsSecondLaw",
+    "second law": "NewtonsSecondLaw",
+    "f = ma": "NewtonsSecondLaw",
+    "f=ma": "NewtonsSecondLaw",
+
+    "newton's third law": "NewtonsThirdLaw",
+    "newtons third law": "NewtonsThirdLaw",
+    "newton third law": "NewtonsThirdLaw",
+    "third law": "NewtonsThirdLaw",
+    "action reaction": "NewtonsThirdLaw",
+    "equal and opposite": "NewtonsThirdLaw"
+}
+
+# Physical quantities and units (matched as whole words)
+QUANTITY_MAPPINGS = {
+    "force": "Force",
+    "mass": "Mass",
+    "acceleration": "Acceleration",
+    "velocity": "Velocity",
+    "speed": "Velocity",
+    "position": "Position",
+    "time": "Time",
+    "newton": "Newton",
+    "kilogram": "Kilogram",
+    "meter": "Meter",
+    "second": "Second"
+}
+
+
+def all_aliases():
+    """Yield (phrase, concept name) pairs from every table, highest priority first."""
+    for mappings in (TOPIC_MAPPINGS, LAW_MAPPINGS, QUANTITY_MAPPINGS):
+        yield from mappings.items()
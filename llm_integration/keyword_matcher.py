@@ -0,0 +1,191 @@
+"""
+Multi-pattern keyword matching for routing questions to ontology concepts.
+
+Routing used to test every keyword of every mapping table against the question
+(substring tests and a freshly built regex per keyword), then fall back to an
+O(concepts x tokens) substring scan over concept names. The KeywordMatcher
+compiles all phrases into a single Aho-Corasick automaton, so one pass over the
+question finds every match regardless of how many phrases are registered.
+
+Matches honour regex ``\\b`` word-boundary semantics (so "mass" does not match
+inside "massive") and carry a priority that preserves the tutor's precedence:
+topics, then laws, then quantities, then plain concept names.
+"""
+
+import re
+from collections import deque
+from typing import List, Dict, NamedTuple, Iterable, Tuple
+
+# Match priorities (lower wins)
+TOPIC = 0
+LAW = 1
+QUANTITY = 2
+CONCEPT = 3
+
+# Classes whose names are matched directly when no mapped phrase is found
+CONCEPT_NAME_TYPES = ["PhysicalQuantity", "Law", "Unit"]
+
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+
+class KeywordMatch(NamedTuple):
+    """One phrase occurrence in the matched text."""
+    start: int
+    end: int
+    phrase: str
+    value: str
+    priority: int
+    order: int
+
+
+def _is_word_char(char: str) -> bool:
+    """Equivalent of regex ``\\w`` for a single character."""
+    return char.isalnum() or char == '_'
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and fold typographic apostrophes so phrases match consistently."""
+    return text.lower().replace('’', "'")
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over lowercase phrases.
+
+    Add phrases with add(), call build() once, then find_all() any number of
+    times from any thread (the built automaton is read-only).
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, str, int]] = []
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, phrase: str, value: str, priority: int) -> None:
+        """
+        Register a phrase.
+
+        Args:
+            phrase: Text to find (matched case-insensitively)
+            value: Payload returned with each match, e.g. an ontology concept name
+            priority: Match priority; lower values take precedence
+        """
+        if self._built:
+            raise RuntimeError("Cannot add phrases after build()")
+        phrase = normalize_text(phrase)
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(len(self._patterns))
+        self._patterns.append((phrase, value, priority))
+
+    def build(self) -> "KeywordMatcher":
+        """Compute failure links (breadth-first) and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+        self._built = True
+        return self
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        Find every whole-word phrase occurrence in one pass over ``text``.
+
+        Args:
+            text: Text to search (normalised internally)
+
+        Returns:
+            Matches in order of their end position
+        """
+        if not self._built:
+            self.build()
+        text = normalize_text(text)
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        length = len(text)
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in outputs[state]:
+                phrase, value, priority = patterns[pattern_id]
+                start = i - len(phrase) + 1
+                end = i + 1
+                # \b before the phrase and after it
+                before = start > 0 and _is_word_char(text[start - 1])
+                after = end < length and _is_word_char(text[end])
+                if before == _is_word_char(phrase[0]) or after == _is_word_char(phrase[-1]):
+                    continue
+                matches.append(KeywordMatch(start, end, phrase, value, priority, pattern_id))
+        return matches
+
+    def match_by_priority(self, text: str) -> Dict[int, List[KeywordMatch]]:
+        """
+        Group matches by priority, keeping one match per phrase in registration order.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Priority -> matches sorted by the order their phrases were added
+        """
+        grouped: Dict[int, Dict[int, KeywordMatch]] = {}
+        for match in self.find_all(text):
+            grouped.setdefault(match.priority, {}).setdefault(match.order, match)
+        return {
+            priority: [by_order[order] for order in sorted(by_order)]
+            for priority, by_order in grouped.items()
+        }
+
+
+def concept_name_phrases(name: str) -> List[str]:
+    """Return the phrases a concept name is matched by: "MeterPerSecond" -> meterpersecond, meter per second."""
+    phrases = [name.lower()]
+    spaced = _CAMEL_BOUNDARY.sub(' ', name).lower()
+    if spaced != phrases[0]:
+        phrases.append(spaced)
+    return phrases
+
+
+def build_concept_matcher(concept_index, tables: Iterable[Tuple[Dict[str, str], int]]) -> KeywordMatcher:
+    """
+    Compile the keyword tables and ontology concept names into one automaton.
+
+    Args:
+        concept_index: ConceptIndex used to enumerate concept names
+        tables: (mapping, priority) pairs, e.g. ((TOPIC_MAPPINGS, TOPIC), ...)
+
+    Returns:
+        The built KeywordMatcher
+    """
+    matcher = KeywordMatcher()
+    for mappings, priority in tables:
+        for phrase, concept_name in mappings.items():
+            matcher.add(phrase, concept_name, priority)
+    for type_name in CONCEPT_NAME_TYPES:
+        for concept in concept_index.of_type(type_name):
+            for phrase in concept_name_phrases(concept.name):
+                matcher.add(phrase, concept.name, CONCEPT)
+    return matcher.build()
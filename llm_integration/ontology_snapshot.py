@@ -0,0 +1,519 @@
+"""
+Precompiled binary snapshot of the physics ontology.
+
+Parsing ``physics_tutor.owl`` with owlready2 dominates serverless cold start. This
+module compiles the OWL file once (at build time) into a compact snapshot and
+loads it at runtime without importing owlready2 at all.
+
+Snapshot layout (all integers little-endian uint32):
+
+1. Header: magic, format version, SHA-256 of the source OWL file and counts
+2. Interned string table: offsets array + one UTF-8 blob
+3. Class names and individual names/IRIs as string ids
+4. Individual types as a CSR (offsets + class indices), including ancestor classes
+5. One CSR per property: literal properties point at string ids, object
+   properties point at individual indices
+
+The loaded SnapshotOntology exposes the small subset of the owlready2 API the
+tutor uses (``search``, ``search_one``, class attributes and property access on
+individuals), so callers do not need to know which backend produced it.
+
+Build a snapshot with:
+    python -m llm_integration.ontology_snapshot
+"""
+
+import os
+import sys
+import time
+import struct
+import hashlib
+import logging
+import argparse
+from array import array
+from fnmatch import fnmatchcase
+from typing import List, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"PTOS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Properties captured in the snapshot, in on-disk order
+LITERAL_PROPERTIES = ["hasDefinition", "hasExplanation", "hasDescription"]
+OBJECT_PROPERTIES = [
+    "hasPrerequisite", "relatesTo", "hasUnit", "hasFormula",
+    "hasExample", "hasApplication", "isPartOf", "isUsedIn"
+]
+
+_HEADER = struct.Struct("<4sHH32sIII")  # magic, version, flags, checksum, strings, classes, individuals
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or of an unknown version."""
+    pass
+
+
+def file_checksum(path: str) -> bytes:
+    """Return the SHA-256 digest of a file."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def default_snapshot_path(owl_path: str) -> str:
+    """Return the snapshot path that sits next to an OWL file."""
+    return os.path.splitext(owl_path)[0] + SNAPSHOT_SUFFIX
+
+
+class SnapshotData:
+    """Flat, interned arrays describing every individual in the ontology."""
+
+    def __init__(self, checksum: bytes = b"\0" * 32):
+        self.checksum = checksum
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.class_names: List[int] = []
+        self.names: List[int] = []
+        self.iris: List[int] = []
+        self.type_offsets: List[int] = [0]
+        self.type_values: List[int] = []
+        self.property_offsets: Dict[str, List[int]] = {p: [0] for p in LITERAL_PROPERTIES + OBJECT_PROPERTIES}
+        self.property_values: Dict[str, List[int]] = {p: [] for p in LITERAL_PROPERTIES + OBJECT_PROPERTIES}
+
+    def intern(self, value: str) -> int:
+        """Return the id of a string, adding it to the string table if needed."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._string_ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def add_individual(self, name: str, iri: str, class_indices: List[int],
+                       properties: Dict[str, List[int]]) -> None:
+        """
+        Append one individual.
+
+        Args:
+            name: Local name of the individual
+            iri: Full IRI of the individual
+            class_indices: Indices into class_names (direct classes and ancestors)
+            properties: Property name -> string ids (literal) or individual indices (object)
+        """
+        self.names.append(self.intern(name))
+        self.iris.append(self.intern(iri))
+        self.type_values.extend(class_indices)
+        self.type_offsets.append(len(self.type_values))
+        for prop in LITERAL_PROPERTIES + OBJECT_PROPERTIES:
+            self.property_values[prop].extend(properties.get(prop, []))
+            self.property_offsets[prop].append(len(self.property_values[prop]))
+
+    def to_bytes(self) -> bytes:
+        """Serialise the snapshot to its binary representation."""
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = [0]
+        for chunk in encoded:
+            offsets.append(offsets[-1] + len(chunk))
+        blob = b"".join(encoded)
+
+        parts = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, self.checksum,
+                              len(self.strings), len(self.class_names), len(self.names))]
+        parts.append(_pack_array(offsets))
+        parts.append(struct.pack("<I", len(blob)) + blob)
+        for values in (self.class_names, self.names, self.iris, self.type_offsets, self.type_values):
+            parts.append(_pack_array(values))
+        for prop in LITERAL_PROPERTIES + OBJECT_PROPERTIES:
+            parts.append(_pack_array(self.property_offsets[prop]))
+            parts.append(_pack_array(self.property_values[prop]))
+        return b"".join(parts)
+
+
+def _pack_array(values) -> bytes:
+    """Pack a sequence of uint32 values as a length-prefixed little-endian array."""
+    packed = array(_U32, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return struct.pack("<I", len(packed)) + packed.tobytes()
+
+
+def _unpack_u32(buffer: memoryview, pos: int) -> Tuple[int, int]:
+    """Read one uint32, returning it and the next offset."""
+    if pos + 4 > len(buffer):
+        raise SnapshotError("Snapshot is truncated")
+    (value,) = struct.unpack_from("<I", buffer, pos)
+    return value, pos + 4
+
+
+def _unpack_array(buffer: memoryview, pos: int) -> Tuple[array, int]:
+    """Read a length-prefixed uint32 array, returning it and the next offset."""
+    count, pos = _unpack_u32(buffer, pos)
+    end = pos + count * 4
+    if end > len(buffer):
+        raise SnapshotError("Snapshot is truncated")
+    values = array(_U32)
+    values.frombytes(buffer[pos:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end
+
+
+def compile_ontology(owl_path: str) -> SnapshotData:
+    """
+    Parse an OWL file with owlready2 and flatten it into SnapshotData.
+
+    owlready2 is imported lazily so runtime loads of an existing snapshot never pay
+    for it.
+
+    Args:
+        owl_path: Path to the OWL file
+
+    Returns:
+        SnapshotData with every named individual of the ontology
+    """
+    from owlready2 import World, Thing, ThingClass
+
+    world = World()
+    onto = world.get_ontology(f"file://{os.path.abspath(owl_path)}").load()
+    data = SnapshotData(checksum=file_checksum(owl_path))
+
+    class_index: Dict[str, int] = {}
+    for cls in onto.classes():
+        class_index[cls.name] = len(data.class_names)
+        data.class_names.append(data.intern(cls.name))
+
+    # Individuals are declared by class (<Law rdf:about=...>) rather than as
+    # owl:NamedIndividual, so onto.individuals() misses them; collect class
+    # instances instead, in declaration (storid) order
+    by_storid = {}
+    for cls in onto.classes():
+        for ind in cls.instances():
+            by_storid[ind.storid] = ind
+    individuals = [by_storid[storid] for storid in sorted(by_storid)]
+    individual_index = {ind: i for i, ind in enumerate(individuals)}
+
+    for ind in individuals:
+        # Mirror owlready2's search(type=...) semantics by storing ancestor classes too
+        class_indices = []
+        for cls in ind.is_a:
+            if not isinstance(cls, ThingClass):
+                continue
+            for ancestor in cls.ancestors():
+                if ancestor is Thing or ancestor.name not in class_index:
+                    continue
+                if class_index[ancestor.name] not in class_indices:
+                    class_indices.append(class_index[ancestor.name])
+
+        properties: Dict[str, List[int]] = {}
+        for prop in LITERAL_PROPERTIES:
+            properties[prop] = [data.intern(str(v)) for v in getattr(ind, prop, [])]
+        for prop in OBJECT_PROPERTIES:
+            properties[prop] = [individual_index[v] for v in getattr(ind, prop, []) if v in individual_index]
+
+        data.add_individual(ind.name, ind.iri, class_indices, properties)
+
+    return data
+
+
+def write_snapshot(data: SnapshotData, snapshot_path: str) -> None:
+    """Write a snapshot atomically (write to a temp file, then rename)."""
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data.to_bytes())
+    os.replace(tmp_path, snapshot_path)
+
+
+def compile_snapshot(owl_path: str, snapshot_path: Optional[str] = None) -> str:
+    """
+    Compile an OWL file into a snapshot on disk.
+
+    Args:
+        owl_path: Path to the OWL file
+        snapshot_path: Output path; defaults to default_snapshot_path(owl_path)
+
+    Returns:
+        The path the snapshot was written to
+    """
+    snapshot_path = snapshot_path or default_snapshot_path(owl_path)
+    write_snapshot(compile_ontology(owl_path), snapshot_path)
+    logger.info(f"Compiled ontology snapshot: {snapshot_path}")
+    return snapshot_path
+
+
+class SnapshotClass:
+    """Stand-in for an owlready2 class, usable as ``search(type=...)`` argument."""
+
+    __slots__ = ("name", "index")
+
+    def __init__(self, name: str, index: int):
+        self.name = name
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"SnapshotClass({self.name})"
+
+
+class SnapshotIndividual:
+    """
+    Read-only view of one individual in a snapshot.
+
+    Property access (``ind.hasDefinition``, ``ind.hasPrerequisite`` ...) returns a
+    list, like owlready2: strings for literal properties and individuals for
+    object properties. Unset properties are empty lists.
+    """
+
+    __slots__ = ("_snapshot", "index")
+
+    def __init__(self, snapshot: "SnapshotOntology", index: int):
+        self._snapshot = snapshot
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self._snapshot.string(self._snapshot._names[self.index])
+
+    @property
+    def iri(self) -> str:
+        return self._snapshot.string(self._snapshot._iris[self.index])
+
+    def __getattr__(self, attr: str):
+        if attr in self._snapshot._literal_props:
+            return [self._snapshot.string(i) for i in self._snapshot._values(attr, self.index)]
+        if attr in self._snapshot._object_props:
+            return [self._snapshot.individual(i) for i in self._snapshot._values(attr, self.index)]
+        raise AttributeError(attr)
+
+    def __repr__(self) -> str:
+        return f"SnapshotIndividual({self.name})"
+
+
+class SnapshotOntology:
+    """
+    Immutable, in-memory ontology backed by a snapshot's flat arrays.
+
+    Individuals and strings are materialised lazily, so loading costs little more
+    than reading the file. Instances are safe to share between threads.
+    """
+
+    def __init__(self, payload: bytes, source: str = "snapshot"):
+        """
+        Parse a snapshot payload.
+
+        Args:
+            payload: Raw snapshot bytes
+            source: Where the data came from ("snapshot" or "owl"), for reporting
+
+        Raises:
+            SnapshotError: If the payload is truncated, corrupt or of another version
+        """
+        try:
+            self._parse(memoryview(payload))
+        except (struct.error, ValueError, IndexError) as e:
+            raise SnapshotError(f"Snapshot is corrupt: {e}") from e
+        self.source = source
+
+    def _parse(self, buffer: memoryview) -> None:
+        """Read the header and arrays of a snapshot, checking every read against its length."""
+        if len(buffer) < _HEADER.size:
+            raise SnapshotError("Snapshot is truncated")
+        magic, version, _flags, checksum, n_strings, n_classes, n_individuals = _HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not an ontology snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+
+        self.checksum = checksum
+        pos = _HEADER.size
+        self._string_offsets, pos = _unpack_array(buffer, pos)
+        blob_len, pos = _unpack_u32(buffer, pos)
+        if pos + blob_len > len(buffer):
+            raise SnapshotError("Snapshot is truncated")
+        self._blob = bytes(buffer[pos:pos + blob_len])
+        pos += blob_len
+        self._class_names, pos = _unpack_array(buffer, pos)
+        self._names, pos = _unpack_array(buffer, pos)
+        self._iris, pos = _unpack_array(buffer, pos)
+        self._type_offsets, pos = _unpack_array(buffer, pos)
+        self._type_values, pos = _unpack_array(buffer, pos)
+        self._offsets: Dict[str, array] = {}
+        self._property_values: Dict[str, array] = {}
+        for prop in LITERAL_PROPERTIES + OBJECT_PROPERTIES:
+            self._offsets[prop], pos = _unpack_array(buffer, pos)
+            self._property_values[prop], pos = _unpack_array(buffer, pos)
+
+        if len(self._names) != n_individuals or len(self._class_names) != n_classes \
+                or len(self._string_offsets) != n_strings + 1:
+            raise SnapshotError("Snapshot header does not match its contents")
+        if pos != len(buffer) or (n_strings and self._string_offsets[-1] != blob_len):
+            raise SnapshotError("Snapshot has a corrupt layout")
+
+        self._literal_props = frozenset(LITERAL_PROPERTIES)
+        self._object_props = frozenset(OBJECT_PROPERTIES)
+        self._strings: List[Optional[str]] = [None] * n_strings
+        self._individuals: List[Optional[SnapshotIndividual]] = [None] * n_individuals
+        self._classes = {
+            self.string(name_id): SnapshotClass(self.string(name_id), i)
+            for i, name_id in enumerate(self._class_names)
+        }
+        self._class_members: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_data(cls, data: SnapshotData, source: str = "owl") -> "SnapshotOntology":
+        """Build a SnapshotOntology directly from freshly compiled SnapshotData."""
+        return cls(data.to_bytes(), source=source)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getattr__(self, attr: str) -> SnapshotClass:
+        # Mirror owlready2's ``onto.Concept`` style class access
+        classes = self.__dict__.get("_classes")
+        if classes is not None and attr in classes:
+            return classes[attr]
+        raise AttributeError(attr)
+
+    def string(self, string_id: int) -> str:
+        """Return an interned string, decoding it on first access."""
+        value = self._strings[string_id]
+        if value is None:
+            start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+            value = self._blob[start:end].decode("utf-8")
+            self._strings[string_id] = value
+        return value
+
+    def individual(self, index: int) -> SnapshotIndividual:
+        """Return the (cached) view of the individual at ``index``."""
+        ind = self._individuals[index]
+        if ind is None:
+            ind = SnapshotIndividual(self, index)
+            self._individuals[index] = ind
+        return ind
+
+    def classes(self) -> List[SnapshotClass]:
+        """Return every class declared in the ontology."""
+        return list(self._classes.values())
+
+    def individuals(self):
+        """Iterate over every individual in declaration order."""
+        for index in range(len(self._names)):
+            yield self.individual(index)
+
+    def _values(self, prop: str, index: int) -> array:
+        offsets = self._offsets[prop]
+        return self._property_values[prop][offsets[index]:offsets[index + 1]]
+
+    def _members(self, cls: SnapshotClass) -> List[int]:
+        members = self._class_members.get(cls.index)
+        if members is None:
+            members = [
+                i for i in range(len(self._names))
+                if cls.index in self._type_values[self._type_offsets[i]:self._type_offsets[i + 1]]
+            ]
+            self._class_members[cls.index] = members
+        return members
+
+    def search(self, **criteria) -> List[SnapshotIndividual]:
+        """
+        Find individuals matching all criteria (subset of owlready2's search).
+
+        Supported criteria:
+            type: a SnapshotClass; matches direct and inherited types
+            iri: a glob pattern matched against the full IRI (e.g. "*Force")
+            <object property>: an individual that must appear in that property
+        """
+        candidates = range(len(self._names))
+        if "type" in criteria:
+            candidates = self._members(criteria.pop("type"))
+        if "iri" in criteria:
+            pattern = criteria.pop("iri")
+            candidates = [i for i in candidates if fnmatchcase(self.string(self._iris[i]), pattern)]
+        for prop, target in criteria.items():
+            if prop not in self._object_props:
+                raise ValueError(f"Unsupported search criterion: {prop}")
+            target_index = target.index
+            candidates = [i for i in candidates if target_index in self._values(prop, i)]
+        return [self.individual(i) for i in candidates]
+
+    def search_one(self, **criteria) -> Optional[SnapshotIndividual]:
+        """Return the first individual matching the criteria, or None."""
+        results = self.search(**criteria)
+        return results[0] if results else None
+
+
+def load_snapshot(snapshot_path: str, source: str = "snapshot") -> SnapshotOntology:
+    """Load a snapshot file from disk."""
+    with open(snapshot_path, "rb") as f:
+        return SnapshotOntology(f.read(), source=source)
+
+
+def load_ontology(owl_path: str, snapshot_path: Optional[str] = None) -> SnapshotOntology:
+    """
+    Load the ontology, preferring an up-to-date snapshot over parsing the OWL file.
+
+    The snapshot's embedded checksum is compared against the OWL file; a missing,
+    corrupt or stale snapshot is rebuilt from the OWL file (and rewritten if the
+    directory is writable, e.g. not on a read-only serverless filesystem).
+
+    Args:
+        owl_path: Path to the OWL file
+        snapshot_path: Snapshot path; defaults to default_snapshot_path(owl_path)
+
+    Returns:
+        The loaded SnapshotOntology
+    """
+    snapshot_path = snapshot_path or default_snapshot_path(owl_path)
+    owl_exists = os.path.exists(owl_path)
+
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = load_snapshot(snapshot_path)
+            if not owl_exists or snapshot.checksum == file_checksum(owl_path):
+                logger.debug(f"Loaded ontology snapshot from: {snapshot_path}")
+                return snapshot
+            logger.warning(f"Ontology snapshot {snapshot_path} is stale, rebuilding")
+        except SnapshotError as e:
+            logger.warning(f"Ignoring unreadable ontology snapshot {snapshot_path}: {e}")
+
+    if not owl_exists:
+        raise FileNotFoundError(f"Ontology file not found at: {owl_path}")
+
+    logger.debug(f"Compiling ontology snapshot from: {owl_path}")
+    data = compile_ontology(owl_path)
+    try:
+        write_snapshot(data, snapshot_path)
+    except OSError as e:
+        logger.warning(f"Could not write ontology snapshot to {snapshot_path}: {e}")
+    return SnapshotOntology.from_data(data, source="owl")
+
+
+def main():
+    """Compile the physics ontology snapshot (used by build_vercel.sh)."""
+    from llm_integration.tutor_core import find_ontology_path
+
+    parser = argparse.ArgumentParser(description="Compile the physics ontology into a binary snapshot")
+    parser.add_argument("--owl", help="Path to the OWL file (default: the tutor's ontology)")
+    parser.add_argument("--output", help="Snapshot output path (default: next to the OWL file)")
+    parser.add_argument("--check", action="store_true",
+                        help="Only verify that the snapshot is up to date (exit code 1 if stale)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    owl_path = args.owl or find_ontology_path()
+    snapshot_path = args.output or default_snapshot_path(owl_path)
+
+    if args.check:
+        try:
+            fresh = load_snapshot(snapshot_path).checksum == file_checksum(owl_path)
+        except (OSError, SnapshotError):
+            fresh = False
+        print(f"{snapshot_path}: {'up to date' if fresh else 'stale or missing'}")
+        sys.exit(0 if fresh else 1)
+
+    started = time.perf_counter()
+    compile_snapshot(owl_path, snapshot_path)
+    size = os.path.getsize(snapshot_path)
+    print(f"Wrote {snapshot_path} ({size} bytes) in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
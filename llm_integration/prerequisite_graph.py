@@ -0,0 +1,204 @@
+"""
+Compiled prerequisite graph.
+
+The ontology only states direct ``hasPrerequisite`` edges, so questions like
+"what does this student still need before X?" used to mean a recursive walk
+over ontology individuals. PrerequisiteGraph compiles the direct edges once per
+ontology version (TutorCore builds it at load time) into:
+
+1. A topological order (prerequisites before the concepts that need them)
+2. The depth of each concept (length of its longest prerequisite chain)
+3. The transitive closure, one bitset row per concept over the ids of the
+   shared ConceptVocabulary, so the same ids index StudentModel bitsets
+4. The concepts on prerequisite cycles, which the ontology should not contain
+5. The PrerequisiteIndex (dependents of each concept) that StudentModel uses to
+   keep its ready frontier up to date, so readiness and ordering come from the
+   same edges
+
+"All missing prerequisites of X for student S" is then a single AND of X's
+closure row with the complement of S's understood bitset.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, List, Optional, Union
+from llm_integration.student_model import (
+    StudentModel, ConceptVocabulary, PrerequisiteIndex, concept_vocabulary, ids_of
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PrerequisiteGraph:
+    """Transitive closure, topological order and depth of a prerequisite graph."""
+
+    def __init__(self, concept_prerequisites: Dict[str, List[str]],
+                 vocabulary: Optional[ConceptVocabulary] = None, version: Optional[str] = None):
+        """
+        Compile the graph.
+
+        Args:
+            concept_prerequisites: Dictionary mapping concepts to their direct prerequisites
+            vocabulary: Concept id mapping shared with the student models (defaults to concept_vocabulary)
+            version: Ontology version the graph was built from, for reporting
+        """
+        self.vocabulary = vocabulary if vocabulary is not None else concept_vocabulary
+        self.version = version
+        self._direct = {concept: list(prerequisites) for concept, prerequisites in concept_prerequisites.items()}
+
+        # Every concept named in the graph, as a key or as a prerequisite
+        names = list(dict.fromkeys(
+            [*self._direct, *(prereq for prerequisites in self._direct.values() for prereq in prerequisites)]
+        ))
+        ids = [self.vocabulary.id_for(name) for name in names]
+        prerequisite_ids = {
+            self.vocabulary.id_for(concept): tuple(dict.fromkeys(self.vocabulary.id_for(p) for p in prerequisites))
+            for concept, prerequisites in self._direct.items()
+        }
+        dependents: Dict[int, List[int]] = {}
+        for concept_id, prerequisites in prerequisite_ids.items():
+            for prereq_id in prerequisites:
+                dependents.setdefault(prereq_id, []).append(concept_id)
+
+        # Kahn's algorithm; whatever is left with unmet prerequisites lies on (or behind) a cycle
+        waiting = {concept_id: len(prerequisite_ids.get(concept_id, ())) for concept_id in ids}
+        queue = deque(concept_id for concept_id in ids if not waiting[concept_id])
+        order: List[int] = []
+        while queue:
+            concept_id = queue.popleft()
+            order.append(concept_id)
+            for dependent in dependents.get(concept_id, ()):
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    queue.append(dependent)
+        cyclic = [concept_id for concept_id in ids if waiting[concept_id]]
+        if cyclic:
+            logger.warning(f"Prerequisite cycle(s) involving {len(cyclic)} concepts: "
+                           f"{', '.join(self._name(i) for i in cyclic[:10])}")
+
+        # Closure rows and depths in topological order: each prerequisite's row is complete first
+        self._closure: Dict[int, int] = {}
+        self._depth: Dict[int, int] = {}
+        for concept_id in order:
+            row, depth = 0, 0
+            for prereq_id in prerequisite_ids.get(concept_id, ()):
+                row |= self._closure[prereq_id] | 1 << prereq_id
+                depth = max(depth, self._depth[prereq_id] + 1)
+            self._closure[concept_id] = row
+            self._depth[concept_id] = depth
+        for concept_id in cyclic:
+            self._closure[concept_id] = self._reachable(concept_id, prerequisite_ids)
+
+        self._position = {concept_id: position for position, concept_id in enumerate(order + cyclic)}
+        self.order: List[str] = [self._name(concept_id) for concept_id in order]
+        self.cyclic: List[str] = [self._name(concept_id) for concept_id in cyclic]
+        # Reverse edges for the student models' incremental ready frontier, over every
+        # concept of the graph (prerequisites that are not keys have none of their own)
+        self.index = PrerequisiteIndex({name: self._direct.get(name, []) for name in names}, self.vocabulary)
+
+    def _name(self, concept_id: int) -> str:
+        return self.vocabulary._names[concept_id]
+
+    def _reachable(self, start: int, prerequisite_ids: Dict[int, tuple]) -> int:
+        """Closure row of a concept on a cycle, by graph search (excludes the concept itself)."""
+        seen = set()
+        stack = list(prerequisite_ids.get(start, ()))
+        while stack:
+            concept_id = stack.pop()
+            if concept_id not in seen:
+                seen.add(concept_id)
+                stack.extend(prerequisite_ids.get(concept_id, ()))
+        seen.discard(start)
+        row = 0
+        for concept_id in seen:
+            row |= 1 << concept_id
+        return row
+
+    def _names_in_order(self, bits: int) -> List[str]:
+        return [self._name(concept_id) for concept_id in sorted(ids_of(bits), key=self._position.__getitem__)]
+
+    def __contains__(self, concept: str) -> bool:
+        concept_id = self.vocabulary.lookup(concept)
+        return concept_id is not None and concept_id in self._position
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+    @property
+    def has_cycles(self) -> bool:
+        return bool(self.cyclic)
+
+    def prerequisites(self, concept: str) -> List[str]:
+        """Direct prerequisites of a concept."""
+        return list(self._direct.get(concept, ()))
+
+    def closure_row(self, concept: str) -> int:
+        """Bitset of all direct and indirect prerequisites of a concept (0 if unknown)."""
+        concept_id = self.vocabulary.lookup(concept)
+        return self._closure.get(concept_id, 0) if concept_id is not None else 0
+
+    def all_prerequisites(self, concept: str) -> List[str]:
+        """All direct and indirect prerequisites of a concept, in learning (topological) order."""
+        return self._names_in_order(self.closure_row(concept))
+
+    def depth(self, concept: str) -> Optional[int]:
+        """Length of the longest prerequisite chain below a concept; None if unknown or on a cycle."""
+        concept_id = self.vocabulary.lookup(concept)
+        return self._depth.get(concept_id) if concept_id is not None else None
+
+    def requires(self, concept: str, prerequisite: str) -> bool:
+        """Whether ``prerequisite`` is a direct or indirect prerequisite of ``concept``."""
+        prereq_id = self.vocabulary.lookup(prerequisite)
+        return prereq_id is not None and bool(self.closure_row(concept) >> prereq_id & 1)
+
+    def missing_prerequisites(self, concept: str, student: Union[StudentModel, int]) -> List[str]:
+        """
+        Prerequisites of a concept the student has not understood yet, in learning order.
+
+        Args:
+            concept: Concept name
+            student: The StudentModel, or its understood bitset (StudentModel.understood_mask)
+
+        Returns:
+            The missing direct and indirect prerequisites, prerequisites first
+        """
+        return self._names_in_order(self.closure_row(concept) & ~self._understood(student))
+
+    def ready_concepts(self, student: StudentModel) -> List[str]:
+        """
+        Concepts the student is ready to learn: not understood, all direct prerequisites understood.
+
+        Args:
+            student: The StudentModel
+
+        Returns:
+            The ready concepts in learning (topological) order
+        """
+        self._understood(student)  # checks the vocabulary
+        return self._names_in_order(student.ready_mask(self.index))
+
+    def learning_path(self, concept: str, student: Union[StudentModel, int]) -> List[str]:
+        """The missing prerequisites followed by the concept itself, unless it is understood."""
+        if concept not in self:
+            return []
+        understood = self._understood(student)
+        concept_id = self.vocabulary.lookup(concept)
+        return self._names_in_order((self.closure_row(concept) | 1 << concept_id) & ~understood)
+
+    def _understood(self, student: Union[StudentModel, int]) -> int:
+        if isinstance(student, StudentModel):
+            if student.vocabulary is not self.vocabulary:
+                raise ValueError("Student model and prerequisite graph use different concept vocabularies")
+            return student.understood_mask
+        return student
+
+    def stats(self) -> Dict[str, object]:
+        """Return the graph's size, depth and cycle information."""
+        return {
+            'version': self.version,
+            'concepts': len(self),
+            'edges': sum(len(prerequisites) for prerequisites in self._direct.values()),
+            'max_depth': max(self._depth.values(), default=0),
+            'cyclic_concepts': len(self.cyclic),
+        }
+
@@ -0,0 +1,200 @@
+"""
+Sparse lexical retrieval over the ontology's text.
+
+Keyword routing (keyword_matcher) only finds concepts whose names or aliases
+appear in a question. Questions like "why is a full shopping cart harder to
+push?" name none, but their words appear in the definitions of concepts and
+in the explanations and descriptions of the examples and applications those
+concepts point to. The RetrievalIndex turns that text into one document per
+learnable concept and ranks the documents against a question with BM25.
+
+The index is built once per ontology version (TutorCore builds it at load
+time) as a terms × concepts SciPy CSR matrix of precomputed BM25 weights, so a
+query is: look up the question's term rows, concatenate their postings and sum
+them per concept with np.bincount. NumPy and SciPy are optional; without them
+TutorCore skips the index and the tutor falls back to its generic messages.
+"""
+
+import time
+import logging
+from collections import Counter
+from typing import Dict, List, Iterable, Optional, Sequence, Tuple
+from llm_integration.answer_cache import STOPWORDS, normalize_question, content_words
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Literal properties whose text is indexed
+TEXT_PROPERTIES = ("hasDefinition", "hasExplanation", "hasDescription")
+
+# Object properties whose targets' text is indexed under the referencing concept
+PART_PROPERTIES = ("hasExample", "hasApplication")
+
+# Words that carry a question's intent rather than its topic. The answer cache
+# keeps them ("how" and "why" questions need different answers), but as search
+# terms they match unrelated definitions ("what's the weather like?" would pull
+# in every concept whose text contains "like"). Entries are in stemmed form.
+RETRIEVAL_STOPWORDS = STOPWORDS | frozenset("""
+how why when where there their they them he she his her us am im not no yes doe has have had
+like just very much many more most some any all also only even still really one two
+happen happened happening get got getting go goe going make made making thing way
+""".split())
+
+# A concept must score at least this fraction of the best concept's score. BM25
+# scores depend on the corpus size and each term's IDF, so an absolute cutoff
+# would mean something different for every ontology; relative to the best
+# match, the cutoff keeps the concepts a question is about and drops the ones
+# that only share an incidental word with it. Questions with no topical words
+# at all score zero everywhere, since intent words are RETRIEVAL_STOPWORDS.
+MIN_RELATIVE_SCORE = 0.5
+
+
+def retrieval_available() -> bool:
+    """Whether NumPy and SciPy are installed."""
+    return sparse is not None
+
+
+def _literals(individual) -> List[str]:
+    return [str(value) for prop in TEXT_PROPERTIES for value in getattr(individual, prop, [])]
+
+
+def collect_documents(concept_index, class_names: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Gather the indexed text of every individual of the given classes.
+
+    A concept's document is its own definitions plus the explanations and
+    descriptions of its examples and applications.
+
+    Args:
+        concept_index: ConceptIndex of the loaded ontology
+        class_names: Classes whose individuals become documents
+
+    Returns:
+        concept name -> text literals, for individuals with any text
+    """
+    documents: Dict[str, List[str]] = {}
+    for class_name in class_names:
+        for individual in concept_index.of_type(class_name):
+            if individual.name in documents:
+                continue
+            texts = _literals(individual)
+            for prop in PART_PROPERTIES:
+                for part in getattr(individual, prop, []):
+                    texts.extend(_literals(part))
+            documents[individual.name] = texts
+    return {name: texts for name, texts in documents.items() if texts}
+
+
+def _terms(text: str) -> List[str]:
+    return list(content_words(normalize_question(text), RETRIEVAL_STOPWORDS))
+
+
+class RetrievalIndex:
+    """BM25 ranking of concepts against a question, backed by a sparse term × concept matrix."""
+
+    def __init__(self, documents: Dict[str, Sequence[str]], k1: float = 1.5, b: float = 0.75,
+                 version: Optional[str] = None):
+        """
+        Build the index.
+
+        Args:
+            documents: concept name -> text literals (see collect_documents())
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            version: Ontology version the index was built from, for reporting
+
+        Raises:
+            ImportError: If NumPy or SciPy is not installed
+        """
+        if not retrieval_available():
+            raise ImportError("RetrievalIndex requires numpy and scipy")
+        started = time.perf_counter()
+        self.version = version
+        self.concepts: List[str] = list(documents)
+        self._term_ids: Dict[str, int] = {}
+
+        rows: List[int] = []
+        columns: List[int] = []
+        counts: List[int] = []
+        lengths = np.zeros(len(self.concepts), dtype=np.float32)
+        for column, texts in enumerate(documents.values()):
+            frequencies = Counter(_terms(" ".join(texts)))
+            lengths[column] = sum(frequencies.values())
+            for term, count in frequencies.items():
+                rows.append(self._term_ids.setdefault(term, len(self._term_ids)))
+                columns.append(column)
+                counts.append(count)
+
+        rows_array = np.asarray(rows, dtype=np.int32)
+        columns_array = np.asarray(columns, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float32)
+        n_docs, n_terms = len(self.concepts), len(self._term_ids)
+        document_frequency = np.bincount(rows_array, minlength=n_terms)
+        idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        average_length = float(lengths.mean()) if n_docs else 1.0
+        norm = k1 * (1 - b + b * lengths[columns_array] / max(average_length, 1.0))
+        weights = idf[rows_array] * tf * (k1 + 1) / (tf + norm)
+
+        # One row per term, so a term's postings are the contiguous slice indptr[t]:indptr[t + 1]
+        matrix = sparse.csr_matrix((weights, (rows_array, columns_array)), shape=(n_terms, n_docs), dtype=np.float32)
+        self._indptr = matrix.indptr
+        self._indices = matrix.indices
+        self._data = matrix.data
+        self.build_seconds = time.perf_counter() - started
+        logger.debug(f"Retrieval index built: {n_docs} concepts, {n_terms} terms, {matrix.nnz} postings "
+                     f"in {self.build_seconds * 1000:.1f} ms")
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def search(self, question: str, k: int = 3,
+               min_relative_score: float = MIN_RELATIVE_SCORE) -> List[Tuple[str, float]]:
+        """
+        Rank concepts against a question.
+
+        Args:
+            question: The student's question
+            k: Maximum number of concepts to return
+            min_relative_score: Only return concepts scoring at least this fraction
+                of the best concept's score
+
+        Returns:
+            [(concept name, BM25 score)], best first (equal scores in ontology order)
+        """
+        term_ids = list(dict.fromkeys(
+            self._term_ids[term] for term in _terms(question) if term in self._term_ids
+        ))
+        if not term_ids or k <= 0:
+            return []
+        indptr = self._indptr
+        if len(term_ids) == 1:
+            start, end = indptr[term_ids[0]], indptr[term_ids[0] + 1]
+            docs, weights = self._indices[start:end], self._data[start:end]
+        else:
+            docs = np.concatenate([self._indices[indptr[t]:indptr[t + 1]] for t in term_ids])
+            weights = np.concatenate([self._data[indptr[t]:indptr[t + 1]] for t in term_ids])
+
+        scores = np.bincount(docs, weights=weights, minlength=len(self.concepts))
+        best = float(scores.max())
+        candidates = np.flatnonzero((scores > 0) & (scores >= best * min_relative_score))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        scores = scores[candidates]
+        order = np.lexsort((candidates, -scores))
+        return [(self.concepts[candidates[i]], round(float(scores[i]), 4)) for i in order]
+
+    def stats(self) -> Dict[str, object]:
+        """Return the index's size and build time."""
+        return {
+            'version': self.version,
+            'concepts': len(self.concepts),
+            'terms': len(self._term_ids),
+            'postings': int(len(self._data)),
+            'build_ms': round(self.build_seconds * 1000, 2),
+        }
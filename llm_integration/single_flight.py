@@ -0,0 +1,133 @@
+"""
+Single-flight coalescing of identical in-flight Claude calls.
+
+When an assignment goes out, many sessions send the same question within
+seconds. Fresh students get byte-identical prompts, so instead of one upstream
+call per request, the first request for a prompt fingerprint makes the call
+("leader") and every identical request that arrives while it is in flight
+("follower") waits for and receives the same response (or exception).
+
+Nothing is cached after the call completes; that is the AnswerCache's job.
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Tuple, Callable, Awaitable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def prompt_fingerprint(request: Dict[str, Any]) -> str:
+    """Stable SHA-256 fingerprint of a Messages API request (system, messages, options)."""
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    do() coalesces calls from threads (Flask workers); do_async() coalesces
+    coroutines on one event loop (the ASGI app). Both are safe to use from the
+    same instance.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, "asyncio.Future"] = {}
+        self.upstream_calls = 0
+        self.calls_saved = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run ``fn`` unless an identical call is in flight, in which case wait for its result.
+
+        Args:
+            key: Fingerprint identifying identical calls
+            fn: The upstream call
+
+        Returns:
+            Tuple of (result, shared); shared is True if another thread's call was reused
+
+        Raises:
+            Whatever ``fn`` raised, in the leader and every follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+            else:
+                self.calls_saved += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Coroutine version of do() for callers on a single event loop.
+
+        The upstream call runs in its own task that every waiter, the leader
+        included, awaits through asyncio.shield(). Cancelling one waiter (e.g. a
+        client disconnecting) therefore cancels only that waiter; the call keeps
+        running for the others.
+        """
+        task = self._async_calls.get(key)
+        shared = task is not None
+        if shared:
+            with self._lock:
+                self.calls_saved += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._async_calls[key] = task
+            task.add_done_callback(lambda done: self._async_done(key, done))
+            with self._lock:
+                self.upstream_calls += 1
+        return await asyncio.shield(task), shared
+
+    def _async_done(self, key: str, task: "asyncio.Future") -> None:
+        if self._async_calls.get(key) is task:
+            del self._async_calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every waiter was cancelled
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return upstream calls made, calls saved by coalescing and calls currently in flight."""
+        with self._lock:
+            requests = self.upstream_calls + self.calls_saved
+            return {
+                'upstream_calls': self.upstream_calls,
+                'upstream_calls_saved': self.calls_saved,
+                'in_flight': len(self._calls) + len(self._async_calls),
+                'saved_ratio': round(self.calls_saved / requests, 4) if requests else 0.0,
+            }
@@ -1,92 +1,552 @@
 import logging
-from typing import Dict, List, Set
+import threading
+from array import array
+from collections.abc import Set as AbstractSet, MutableMapping
+from typing import Dict, List, Set, Any, Iterable, Iterator, Optional, Tuple
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+
+class ConceptVocabulary:
+    """
+    Mapping of concept names to dense integer ids.
+
+    Ids are the bit positions in StudentModel bitsets. TutorCore registers every ontology individual at load time, in
+    ontology order; names first seen later get the next free id. Ids are local to
+    a process, so persisted models store names (see StudentModel.to_dict()).
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # Index of the last graph passed to prerequisite_index()
+        self._prerequisite_index: Optional["PrerequisiteIndex"] = None
+        self.extend(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def extend(self, names: Iterable[str]) -> None:
+        """Register names that do not have an id yet."""
+        for name in names:
+            self.id_for(name)
+
+    def id_for(self, name: str) -> int:
+        """Return the id of a name, assigning the next free id to new names."""
+        concept_id = self._ids.get(name)
+        if concept_id is None:
+            with self._lock:
+                concept_id = self._ids.get(name)
+                if concept_id is None:
+                    concept_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = concept_id
+        return concept_id
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Return the id of a name, or None if it has none."""
+        return self._ids.get(name)
+
+    def names_of(self, bits: int) -> Iterator[str]:
+        """Yield the names of the set bits, lowest id first."""
+        names = self._names
+        for concept_id in ids_of(bits):
+            yield names[concept_id]
+
+    def mask_of(self, names: Iterable[str]) -> int:
+        """Return the bitset of the given names."""
+        mask = 0
+        for name in names:
+            mask |= 1 << self.id_for(name)
+        return mask
+
+    def prerequisite_index(self, concept_prerequisites: Dict[str, List[str]]) -> "PrerequisiteIndex":
+        """
+        Return the PrerequisiteIndex of a prerequisite graph.
+
+        The index of the most recently used graph is kept, so the shared graph of
+        the TutorCore is compiled once rather than on every readiness query.
+        """
+        index = self._prerequisite_index
+        if index is None or index.graph is not concept_prerequisites or index.size != len(concept_prerequisites):
+            index = self._prerequisite_index = PrerequisiteIndex(concept_prerequisites, self)
+        return index
+
+
+# Positions of the set bits of every byte value
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def ids_of(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a bitset, lowest first."""
+    if bits < 1 << 64:
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+        return
+    # Large bitsets: one pass over the bytes instead of a big-int operation per bit
+    for byte_index, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        if byte:
+            base = byte_index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class PrerequisiteIndex:
+    """
+    A prerequisite graph compiled to vocabulary ids, with a reverse (dependents) index.
+
+    StudentModel uses it to keep its ready frontier up to date incrementally:
+    understanding a concept can only make that concept's dependents ready.
+    """
+
+    def __init__(self, concept_prerequisites: Dict[str, List[str]], vocabulary: ConceptVocabulary):
+        """
+        Args:
+            concept_prerequisites: Dictionary mapping concepts to their prerequisites
+            vocabulary: Vocabulary assigning the concept ids
+        """
+        self.graph = concept_prerequisites
+        self.size = len(concept_prerequisites)
+        self.vocabulary = vocabulary
+        self.position: Dict[int, int] = {}  # Concept id -> position in the graph's iteration order
+        self.prerequisites: Dict[int, Tuple[int, ...]] = {}  # Concept id -> ids of its prerequisites
+        self.dependents: Dict[int, List[int]] = {}  # Concept id -> ids of the concepts it is a prerequisite of
+        roots = []
+        for position, (concept, prerequisites) in enumerate(concept_prerequisites.items()):
+            concept_id = vocabulary.id_for(concept)
+            self.position[concept_id] = position
+            prerequisite_ids = tuple(vocabulary.id_for(prerequisite) for prerequisite in prerequisites)
+            self.prerequisites[concept_id] = prerequisite_ids
+            for prerequisite_id in prerequisite_ids:
+                self.dependents.setdefault(prerequisite_id, []).append(concept_id)
+            if not prerequisites:
+                roots.append(concept_id)
+        # Concepts without prerequisites, which are ready until understood
+        self.roots = _bitset(roots)
+        # Whether id order is graph order (true for the TutorCore graph), so results need no sort
+        self.id_ordered = list(self.position) == sorted(self.position)
+
+    def is_ready(self, concept_id: int, understood: int) -> bool:
+        """Whether a concept of the graph is not yet understood and all its prerequisites are."""
+        return not understood >> concept_id & 1 and all(
+            understood >> prerequisite & 1 for prerequisite in self.prerequisites[concept_id]
+        )
+
+    def frontier(self, understood: int) -> int:
+        """Compute the ready bitset from scratch, visiting only the dependents of understood concepts."""
+        ready = self.roots & ~understood
+        for concept_id in ids_of(understood):
+            for dependent in self.dependents.get(concept_id, ()):
+                if self.is_ready(dependent, understood):
+                    ready |= 1 << dependent
+        return ready
+
+    def advance(self, ready: int, concept_id: int, understood: int) -> int:
+        """Update a ready bitset after ``concept_id`` was added to ``understood``."""
+        ready &= ~(1 << concept_id)
+        for dependent in self.dependents.get(concept_id, ()):
+            if self.is_ready(dependent, understood):
+                ready |= 1 << dependent
+        return ready
+
+    def names_in_order(self, bits: int) -> List[str]:
+        """Names of the concepts in a bitset, in the graph's iteration order."""
+        names = self.vocabulary._names
+        if self.id_ordered:
+            return [names[concept_id] for concept_id in ids_of(bits)]
+        concept_ids = sorted(ids_of(bits), key=self.position.__getitem__)
+        return [names[concept_id] for concept_id in concept_ids]
+
+
+def _bitset(concept_ids: Iterable[int]) -> int:
+    """Build a bitset from ids in linear time (OR-ing large ints one bit at a time is quadratic)."""
+    concept_ids = list(concept_ids)
+    if not concept_ids:
+        return 0
+    bitmap = bytearray(max(concept_ids) // 8 + 1)
+    for concept_id in concept_ids:
+        bitmap[concept_id >> 3] |= 1 << (concept_id & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+# Shared by all student models in the process
+concept_vocabulary = ConceptVocabulary()
+
+# Guards the lazy creation of StudentModel locks
+_lock_creation = threading.Lock()
+
+
+class ConceptSet(AbstractSet):
+    """Set-of-names view over one of a StudentModel's bitsets."""
+
+    __slots__ = ("_model", "_attr")
+
+    def __init__(self, model: "StudentModel", attr: str):
+        self._model = model
+        self._attr = attr
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # Results of set operators (e.g. exposed - understood) are plain sets
+        return set(it)
+
+    def __contains__(self, name) -> bool:
+        concept_id = self._model.vocabulary.lookup(name)
+        return concept_id is not None and bool(getattr(self._model, self._attr) >> concept_id & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._model.vocabulary.names_of(getattr(self._model, self._attr))
+
+    def __len__(self) -> int:
+        return getattr(self._model, self._attr).bit_count()
+
+    def add(self, name: str) -> None:
+        with self._model.lock:
+            self._set(getattr(self._model, self._attr) | 1 << self._model.vocabulary.id_for(name))
+
+    def discard(self, name: str) -> None:
+        concept_id = self._model.vocabulary.lookup(name)
+        if concept_id is not None:
+            with self._model.lock:
+                self._set(getattr(self._model, self._attr) & ~(1 << concept_id))
+
+    def _set(self, bits: int) -> None:
+        setattr(self._model, self._attr, bits)
+        self._model._version += 1
+        if self._attr == "_understood":
+            # Recompute the ready frontier on the next query
+            self._model._ready_index = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+class KnowledgeLevels(MutableMapping):
+    """Concept name -> level view over a StudentModel's packed float32 levels."""
+
+    __slots__ = ("_model",)
+
+    def __init__(self, model: "StudentModel"):
+        self._model = model
+
+    def __getitem__(self, name: str) -> float:
+        concept_id = self._model.vocabulary.lookup(name)
+        level = None if concept_id is None else self._model._get_level(concept_id)
+        if level is None:
+            raise KeyError(name)
+        return level
+
+    def __setitem__(self, name: str, level: float) -> None:
+        with self._model.lock:
+            self._model._set_level(self._model.vocabulary.id_for(name), level)
+
+    def __delitem__(self, name: str) -> None:
+        concept_id = self._model.vocabulary.lookup(name)
+        with self._model.lock:
+            if concept_id is None or not self._model._del_level(concept_id):
+                raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._model.vocabulary.names_of(self._model._level_bits)
+
+    def __len__(self) -> int:
+        return self._model._level_bits.bit_count()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class Misconceptions(MutableMapping):
+    """Concept name -> misconception view that counts changes in the StudentModel's version."""
+
+    __slots__ = ("_model",)
+
+    def __init__(self, model: "StudentModel"):
+        self._model = model
+
+    def __getitem__(self, name: str) -> str:
+        if not self._model._misconceptions:
+            raise KeyError(name)
+        return self._model._misconceptions[name]
+
+    def __setitem__(self, name: str, misconception: str) -> None:
+        with self._model.lock:
+            if self._model._misconceptions is None:
+                self._model._misconceptions = {}
+            self._model._misconceptions[name] = misconception
+            self._model._version += 1
+
+    def __delitem__(self, name: str) -> None:
+        with self._model.lock:
+            if not self._model._misconceptions:
+                raise KeyError(name)
+            del self._model._misconceptions[name]
+            self._model._version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._model._misconceptions or ())
+
+    def __len__(self) -> int:
+        return len(self._model._misconceptions or ())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
 class StudentModel:
     """
     A simplified student model that tracks exposure to concepts.
-    
+
     The StudentModel maintains:
     - Concepts the student has been exposed to
     - Concepts the student has demonstrated understanding of
-    
+
     This model enables basic personalization of tutoring responses based on
     what concepts the student has already encountered.
+
+    Concepts are stored compactly so that millions of models fit in a cohort
+    cache: exposure and understanding are integer bitsets over the dense ids of
+    a ConceptVocabulary, and knowledge levels are a float32 array holding one
+    slot per concept that has a level (those in a third bitset), in id order.
+    ``exposed_concepts``, ``understood_concepts`` and ``knowledge_level`` are
+    set and dict views over that storage.
+
+    The concepts ready to learn are kept as a bitset too (the ready frontier).
+    It is computed once per prerequisite graph and then updated incrementally
+    by mark_as_understood(), which only re-checks the understood concept's
+    dependents.
+
+    Every change to the model increments ``version``, so derived data such as
+    the student's system prompt section is only rebuilt when the model changed.
+
+    A cached model is shared by concurrent requests of the same student. Its
+    updates and to_dict() run under ``lock``, a reentrant lock that callers can
+    also hold to make several updates atomic.
     """
-    
-    def __init__(self, student_id: str):
+
+    __slots__ = ("student_id", "vocabulary", "_exposed", "_understood", "_level_bits", "_levels",
+                 "_misconceptions", "_ready", "_ready_index", "_version", "_lock")
+
+    def __init__(self, student_id: str, vocabulary: Optional[ConceptVocabulary] = None):
         """
         Initialize a new student model.
-        
+
         Args:
             student_id: Unique identifier for the student
+            vocabulary: Concept id mapping (defaults to the process-wide concept_vocabulary)
         """
         self.student_id = student_id
-        
+        self.vocabulary = vocabulary if vocabulary is not None else concept_vocabulary
+
         # Initialize student model attributes
-        self.exposed_concepts: Set[str] = set()  # Concepts the student has seen
-        self.understood_concepts: Set[str] = set()  # Concepts the student understands
-        self.misconceptions: Dict[str, str] = {}  # Concept name -> description of misconception
-        self.knowledge_level: Dict[str, float] = {}  # Concept name -> knowledge level (0.0 to 1.0)
-        
+        self._exposed = 0  # Bitset of concepts the student has seen
+        self._understood = 0  # Bitset of concepts the student understands
+        self._level_bits = 0  # Bitset of concepts with a knowledge level
+        self._levels: Optional[array] = None  # Knowledge levels (0.0 to 1.0) of those concepts, by rank
+        self._misconceptions: Optional[Dict[str, str]] = None  # Created on first use; most students have none
+        self._ready = 0  # Bitset of concepts ready to learn, valid for _ready_index
+        self._ready_index: Optional[PrerequisiteIndex] = None
+        self._version = 0  # Incremented on every change
+        self._lock: Optional[threading.RLock] = None  # Created on first use; most cohort models never need one
+
         logger.debug(f"Initialized student model for {self.student_id}")
-    
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Reentrant lock guarding the model's updates."""
+        if self._lock is None:
+            with _lock_creation:
+                if self._lock is None:
+                    self._lock = threading.RLock()
+        return self._lock
+
+    @property
+    def version(self) -> int:
+        """Change counter: increases whenever the student's knowledge state changes."""
+        return self._version
+
+    @property
+    def exposed_concepts(self) -> Set[str]:
+        """Concepts the student has seen."""
+        return ConceptSet(self, "_exposed")
+
+    @exposed_concepts.setter
+    def exposed_concepts(self, concepts: Iterable[str]) -> None:
+        self._exposed = self.vocabulary.mask_of(concepts)
+        self._version += 1
+
+    @property
+    def understood_concepts(self) -> Set[str]:
+        """Concepts the student understands."""
+        return ConceptSet(self, "_understood")
+
+    @understood_concepts.setter
+    def understood_concepts(self, concepts: Iterable[str]) -> None:
+        self._understood = self.vocabulary.mask_of(concepts)
+        self._ready_index = None
+        self._version += 1
+
+    @property
+    def exposed_mask(self) -> int:
+        """Bitset of exposed concepts over the ids of ``vocabulary``."""
+        return self._exposed
+
+    @property
+    def understood_mask(self) -> int:
+        """Bitset of understood concepts over the ids of ``vocabulary``."""
+        return self._understood
+
+    @property
+    def packed_levels(self) -> Tuple[int, Optional[array]]:
+        """Bitset of concepts with a knowledge level, and their float32 levels in id order."""
+        return self._level_bits, self._levels
+
+    def misconception_items(self) -> List[Tuple[str, str]]:
+        """(concept, misconception) pairs, without creating the dict for students who have none."""
+        return list(self._misconceptions.items()) if self._misconceptions else []
+
+    @property
+    def knowledge_level(self) -> Dict[str, float]:
+        """Concept name -> knowledge level (0.0 to 1.0), stored as float32."""
+        return KnowledgeLevels(self)
+
+    @knowledge_level.setter
+    def knowledge_level(self, levels: Dict[str, float]) -> None:
+        self._level_bits, self._levels = 0, None
+        for concept, level in levels.items():
+            self._set_level(self.vocabulary.id_for(concept), level)
+
+    @property
+    def misconceptions(self) -> Dict[str, str]:
+        """Concept name -> description of misconception."""
+        return Misconceptions(self)
+
+    @misconceptions.setter
+    def misconceptions(self, misconceptions: Dict[str, str]) -> None:
+        self._misconceptions = dict(misconceptions) or None
+        self._version += 1
+
+    def _level_slot(self, concept_id: int) -> int:
+        """Index of a concept's level in the packed array: the number of lower ids with a level."""
+        return (self._level_bits & ((1 << concept_id) - 1)).bit_count()
+
+    def _get_level(self, concept_id: int) -> Optional[float]:
+        if not self._level_bits >> concept_id & 1:
+            return None
+        return self._levels[self._level_slot(concept_id)]
+
+    def _set_level(self, concept_id: int, level: float) -> None:
+        self._version += 1
+        slot = self._level_slot(concept_id)
+        if self._level_bits >> concept_id & 1:
+            self._levels[slot] = level
+            return
+        if self._levels is None:
+            self._levels = array('f')
+        self._levels.insert(slot, level)
+        self._level_bits |= 1 << concept_id
+
+    def _del_level(self, concept_id: int) -> bool:
+        if not self._level_bits >> concept_id & 1:
+            return False
+        del self._levels[self._level_slot(concept_id)]
+        self._level_bits &= ~(1 << concept_id)
+        self._version += 1
+        return True
+
     def expose_concept(self, concept: str) -> None:
         """
         Mark a concept as exposed to the student.
-        
+
         This is called when a concept is mentioned or explained in a
         tutoring interaction.
-        
+
         Args:
             concept: The concept name to mark as exposed
         """
-        self.exposed_concepts.add(concept)
-        # Initialize knowledge level if not set
-        if concept not in self.knowledge_level:
-            self.knowledge_level[concept] = 0.1
-    
+        concept_id = self.vocabulary.id_for(concept)
+        bit = 1 << concept_id
+        with self.lock:
+            if not self._exposed & bit:
+                self._exposed |= bit
+                self._version += 1
+            # Initialize knowledge level if not set
+            if not self._level_bits & bit:
+                self._set_level(concept_id, 0.1)
+
     def mark_as_understood(self, concept: str) -> None:
         """
         Mark a concept as understood by the student.
-        
+
         Args:
             concept: The concept name to mark as understood
         """
-        self.understood_concepts.add(concept)
-        # Also ensure it's in exposed concepts
-        self.exposed_concepts.add(concept)
-        # Set knowledge level to high for this concept
-        self.knowledge_level[concept] = 1.0
-        # Remove any misconceptions about this concept
-        if concept in self.misconceptions:
-            del self.misconceptions[concept]
-    
+        concept_id = self.vocabulary.id_for(concept)
+        bit = 1 << concept_id
+        with self.lock:
+            self._understood |= bit
+            # Also ensure it's in exposed concepts
+            self._exposed |= bit
+            # Set knowledge level to high for this concept (counts the change in version)
+            self._set_level(concept_id, 1.0)
+            # Only this concept's dependents can have become ready
+            if self._ready_index is not None:
+                self._ready = self._ready_index.advance(self._ready, concept_id, self._understood)
+            # Remove any misconceptions about this concept
+            if self._misconceptions and concept in self._misconceptions:
+                del self._misconceptions[concept]
+                self._version += 1
+
     def get_knowledge_gaps(self) -> List[str]:
         """Returns a list of concepts the student has been exposed to but not yet understood."""
-        return list(self.exposed_concepts - self.understood_concepts)
-        
+        return list(self.vocabulary.names_of(self._exposed & ~self._understood))
+
     def get_ready_concepts(self, concept_prerequisites: Dict[str, List[str]]) -> List[str]:
         """Identifies concepts that the student is ready to learn based on their prerequisites.
-        
+
         Args:
             concept_prerequisites: Dictionary mapping concepts to their prerequisites
-            
+
         Returns:
             List of concepts that the student is ready to learn
         """
-        ready_concepts = []
-        
-        for concept, prerequisites in concept_prerequisites.items():
-            # Skip concepts the student already understands
-            if concept in self.understood_concepts:
-                continue
-                
-            # Check if all prerequisites are understood
-            if all(prereq in self.understood_concepts for prereq in prerequisites):
-                ready_concepts.append(concept)
-                
-        return ready_concepts
\ No newline at end of file
+        index = self.vocabulary.prerequisite_index(concept_prerequisites)
+        return index.names_in_order(self.ready_mask(index))
+
+    def ready_mask(self, index: "PrerequisiteIndex") -> int:
+        """
+        Bitset of the concepts ready to learn under a compiled prerequisite graph.
+
+        The frontier is computed once per index and then kept up to date by
+        mark_as_understood() (see PrerequisiteGraph.ready_concepts()).
+        """
+        with self.lock:
+            if self._ready_index is not index:
+                self._ready = index.frontier(self._understood)
+                self._ready_index = index
+            return self._ready
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the model to JSON-compatible data (see StudentModelRepository)."""
+        with self.lock:
+            return {
+                'exposed_concepts': sorted(self.exposed_concepts),
+                'understood_concepts': sorted(self.understood_concepts),
+                'misconceptions': dict(self._misconceptions or {}),
+                'knowledge_level': dict(self.knowledge_level),
+            }
+
+    @classmethod
+    def from_dict(cls, student_id: str, data: Dict[str, Any]) -> "StudentModel":
+        """Rebuild a model serialized with to_dict()."""
+        model = cls(student_id)
+        model.exposed_concepts = data.get('exposed_concepts', ())
+        model.understood_concepts = data.get('understood_concepts', ())
+        model.misconceptions = data.get('misconceptions', {})
+        model.knowledge_level = data.get('knowledge_level', {})
+        return model
@@ -0,0 +1,364 @@
+"""
+Persistent storage for StudentModel state.
+
+A ClaudeTutor lives for one request, so without persistence every question
+starts from an empty StudentModel and the adaptive parts of the prompt never
+apply. This module keeps student models across requests and worker processes:
+
+1. StudentStore is the pluggable backend interface: bulk load and bulk save of
+   serialized models (StudentModel.to_dict()). SQLiteStudentStore is the
+   default backend, and MemoryStudentStore keeps models in process only.
+2. StudentModelRepository sits in front of a store. It keeps a read-through LRU
+   of hot student models and writes changed models behind: mark_dirty() only
+   snapshots the model, and a background thread saves pending snapshots in
+   batches, so requests never wait on a database write.
+3. get_student_repository() returns the process-wide repository configured
+   from STUDENT_STORE* environment variables. Every TutorCore, including
+   reloaded ones, shares it, so one flusher thread writes each student's row.
+"""
+
+import os
+import json
+import atexit
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from llm_integration.student_model import StudentModel
+
+logger = logging.getLogger(__name__)
+
+# Keeps bulk queries under SQLite's default limit on bound parameters
+SQLITE_BATCH = 500
+
+
+class StudentStore:
+    """Backend interface for serialized student models."""
+
+    def load_many(self, student_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the stored data of the given students; unknown students are omitted."""
+        raise NotImplementedError
+
+    def save_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or replace the data of several students in one transaction."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryStudentStore(StudentStore):
+    """Process-local store, for tests and single-process development."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, str] = {}
+
+    def load_many(self, student_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {sid: json.loads(self._records[sid]) for sid in student_ids if sid in self._records}
+
+    def save_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._records.update((sid, json.dumps(data)) for sid, data in records.items())
+
+
+class SQLiteStudentStore(StudentStore):
+    """Store backed by one SQLite table, shared by all worker processes on a host."""
+
+    def __init__(self, path: str):
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        with self._lock, self._conn:
+            # WAL lets workers read while another worker flushes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS student_models ("
+                "student_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def load_many(self, student_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        student_ids = list(student_ids)
+        loaded = {}
+        with self._lock:
+            for start in range(0, len(student_ids), SQLITE_BATCH):
+                batch = student_ids[start:start + SQLITE_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT student_id, state FROM student_models WHERE student_id IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                loaded.update((sid, json.loads(state)) for sid, state in rows)
+        return loaded
+
+    def save_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        now = time.time()
+        rows = [(sid, json.dumps(data, separators=(',', ':')), now) for sid, data in records.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO student_models (student_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(student_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                rows
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StudentModelRepository:
+    """
+    Read-through LRU of StudentModels over a StudentStore, with batched write-behind.
+
+    Cached models are reloaded from the store after ``ttl_seconds`` (unless they
+    have unsaved changes) so that updates written by other workers are picked up.
+    """
+
+    def __init__(self, store: StudentStore, max_entries: int = 10000, ttl_seconds: float = 60.0,
+                 flush_interval: float = 1.0, batch_size: int = 256):
+        """
+        Args:
+            store: Backend to load from and save to
+            max_entries: Maximum cached models; the least recently used is dropped beyond this
+            ttl_seconds: Seconds before a cached, saved model is reloaded from the store
+            flush_interval: Maximum seconds a change waits before it is written
+            batch_size: Number of pending models that triggers an early flush
+        """
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # student_id -> (model, loaded_at), least recently used first
+        self._models: "OrderedDict[str, Tuple[StudentModel, float]]" = OrderedDict()
+        # student_id -> snapshot waiting to be written
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # student_id -> snapshot taken by a flush whose save has not committed yet
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self._flusher = threading.Thread(target=self._flush_loop, name="student-model-flusher", daemon=True)
+        self._flusher.start()
+
+    def get(self, student_id: str) -> StudentModel:
+        """Return the student's model from the cache, the pending writes or the store, or a new one."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._models.get(student_id)
+            if cached is not None and (now - cached[1] < self.ttl_seconds or self._unsaved(student_id)):
+                self._models.move_to_end(student_id)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+            pending = self._pending.get(student_id) or self._in_flight.get(student_id)
+        if pending is not None:
+            model = StudentModel.from_dict(student_id, pending)
+        else:
+            data = self.store.load_many([student_id]).get(student_id)
+            model = StudentModel.from_dict(student_id, data) if data else StudentModel(student_id)
+        return self._cache(student_id, model, now)
+
+    def preload(self, student_ids: Iterable[str]) -> int:
+        """
+        Bulk load models into the cache with one store query, e.g. for a class roster.
+
+        Returns:
+            Number of models found in the store
+        """
+        with self._lock:
+            missing = [sid for sid in dict.fromkeys(student_ids) if sid not in self._models and not self._unsaved(sid)]
+        loaded = self.store.load_many(missing)
+        now = time.monotonic()
+        for sid, data in loaded.items():
+            self._cache(sid, StudentModel.from_dict(sid, data), now)
+        return len(loaded)
+
+    def mark_dirty(self, model: StudentModel) -> None:
+        """Queue the model's current state for the next batched write; never blocks on the store."""
+        snapshot = model.to_dict()
+        with self._lock:
+            self._pending[model.student_id] = snapshot
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.notify()
+
+    def flush(self) -> int:
+        """Write all pending models now. Returns the number of models written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            # Until the save commits the store still holds the old rows, so the
+            # batch stays visible to get() and _cache()
+            self._in_flight.update(batch)
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        try:
+            self.store.save_many(batch)
+        except Exception as e:
+            logger.error(f"Failed to save {len(batch)} student models: {e}")
+            with self._lock:
+                self._settle(batch)
+                self.flush_errors += 1
+                # Keep newer snapshots queued since the batch was taken
+                self._pending = {**batch, **self._pending}
+            return 0
+        with self._lock:
+            self._settle(batch)
+            self.flushes += 1
+            self.rows_written += len(batch)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+        return len(batch)
+
+    def _unsaved(self, student_id: str) -> bool:
+        """Whether the student has changes not yet committed to the store (caller holds the lock)."""
+        return student_id in self._pending or student_id in self._in_flight
+
+    def _settle(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        """Drop a finished flush's snapshots from the in-flight map (caller holds the lock)."""
+        for student_id, snapshot in batch.items():
+            if self._in_flight.get(student_id) is snapshot:
+                del self._in_flight[student_id]
+
+    def _cache(self, student_id: str, model: StudentModel, now: float) -> StudentModel:
+        with self._lock:
+            cached = self._models.get(student_id)
+            if cached is not None and self._unsaved(student_id):
+                # Another request changed its copy while we were loading; keep that one
+                return cached[0]
+            self._models[student_id] = (model, now)
+            self._models.move_to_end(student_id)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+        return model
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self) -> None:
+        """Write pending models, stop the flusher and close the store."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._flusher.join()
+        self.flush()
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss counters and write-behind statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self.store).__name__,
+                'cached': len(self._models),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'pending_writes': len(self._pending),
+                'flushes': self.flushes,
+                'rows_written': self.rows_written,
+                'flush_errors': self.flush_errors,
+                'last_flush_ms': round(self.last_flush_ms, 3),
+            }
+
+
+def create_student_repository(backend: str, path: Optional[str] = None, **options) -> Optional[StudentModelRepository]:
+    """
+    Build a repository for a backend name.
+
+    Args:
+        backend: "sqlite", "memory" or "none"
+        path: Database file for the sqlite backend
+        **options: StudentModelRepository settings
+
+    Returns:
+        The repository, or None for the "none" backend (models are not kept)
+    """
+    backend = backend.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return StudentModelRepository(MemoryStudentStore(), **options)
+    if backend == "sqlite":
+        return StudentModelRepository(SQLiteStudentStore(path), **options)
+    raise ValueError(f"Unknown student store backend: {backend}")
+
+
+_repository: Optional[StudentModelRepository] = None
+_repository_loaded = False
+_repository_lock = threading.Lock()
+
+
+def _create_configured_repository() -> Optional[StudentModelRepository]:
+    """Create a repository from STUDENT_STORE* environment variables."""
+    backend = os.getenv('STUDENT_STORE', 'sqlite')
+    path = os.getenv('STUDENT_STORE_PATH') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'students.db'
+    )
+    options = dict(
+        max_entries=int(os.getenv('STUDENT_STORE_CACHE_SIZE', '10000')),
+        flush_interval=float(os.getenv('STUDENT_STORE_FLUSH_INTERVAL', '1.0'))
+    )
+    try:
+        if backend == 'sqlite':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        repository = create_student_repository(backend, path, **options)
+    except (OSError, sqlite3.Error) as e:
+        # e.g. a read-only filesystem on serverless hosts
+        logger.warning(f"Could not open student store at {path} ({e}); keeping student models in memory")
+        repository = create_student_repository('memory', **options)
+    if repository is None:
+        logger.info("Student model persistence disabled")
+    return repository
+
+
+def get_student_repository() -> Optional[StudentModelRepository]:
+    """
+    Return the process-wide StudentModelRepository, creating it on first use.
+
+    Returns:
+        The repository, or None if STUDENT_STORE is "none"
+    """
+    global _repository, _repository_loaded
+    if not _repository_loaded:
+        with _repository_lock:
+            if not _repository_loaded:
+                _repository = _create_configured_repository()
+                _repository_loaded = True
+    return _repository
+
+
+def reset_student_repository() -> None:
+    """Write pending models, close and drop the process-wide repository (at exit and in tests)."""
+    global _repository, _repository_loaded
+    with _repository_lock:
+        previous, _repository, _repository_loaded = _repository, None, False
+    if previous is not None:
+        previous.close()
+
+
+# Write pending changes when the worker exits
+atexit.register(reset_student_repository)
@@ -0,0 +1,397 @@
+"""
+Process-wide tutoring core shared by every ClaudeTutor instance.
+
+Building a tutor used to reparse the OWL ontology, recreate the Anthropic client,
+rebuild the prerequisite graph and regenerate the system prompt on every request.
+None of that depends on the student, so this module loads it exactly once per
+worker process and hands the same immutable TutorCore to every tutor:
+
+1. The Anthropic clients (sync for Flask, async for the ASGI app), reused across requests
+2. The ontology, loaded from its precompiled snapshot (see ontology_snapshot.py)
+3. The concept index, keyword matcher, prerequisite graph (direct edges and
+   the compiled PrerequisiteGraph) and concept list derived from the ontology
+4. The static system prompt block (ontology overview and tutoring rules), sent
+   as the prompt-cached prefix of every request, and API token usage counters
+5. The rendered per-concept context cache, keyed by ontology version, the
+   answer cache for repeated questions and the single-flight group that
+   coalesces identical in-flight Claude calls
+6. The student model repository (student_store.py), which keeps each session's
+   StudentModel across requests; it survives reload_tutor_core()
+
+Per-session state (the StudentModel) is layered on top by ClaudeTutor.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from anthropic import Anthropic, AsyncAnthropic, DEFAULT_TIMEOUT
+from utils.ssl_config import configure_ssl_certificates
+from utils.http_client import get_http_pool
+from utils.metrics import TokenUsageTracker
+from llm_integration.ontology_snapshot import load_ontology
+from llm_integration.concept_index import ConceptIndex
+from llm_integration.context_cache import RenderedBlock, context_cache
+from llm_integration.context_assembler import ContextAssembler
+from llm_integration.answer_cache import AnswerCache
+from llm_integration.single_flight import SingleFlight
+from llm_integration.student_model import StudentModel, concept_vocabulary
+from llm_integration.prerequisite_graph import PrerequisiteGraph
+from llm_integration.retrieval_index import RetrievalIndex, collect_documents, retrieval_available
+from llm_integration.student_store import StudentModelRepository, get_student_repository
+from llm_integration.keyword_mappings import TOPIC_MAPPINGS, LAW_MAPPINGS, QUANTITY_MAPPINGS, all_aliases
+from llm_integration.keyword_matcher import TOPIC, LAW, QUANTITY, build_concept_matcher
+
+logger = logging.getLogger(__name__)
+
+# Laws that are always listed in the system prompt
+KEY_LAWS = ["NewtonsFirstLaw", "NewtonsSecondLaw", "NewtonsThirdLaw"]
+
+# Shortest prefix Anthropic's prompt cache accepts (Opus; Haiku needs 2048)
+MIN_CACHEABLE_PROMPT_TOKENS = 1024
+
+# Ontology classes whose individuals take part in the compiled prerequisite graph
+LEARNABLE_TYPES = ["Concept", "PhysicalQuantity", "Law", "Unit", "Formula", "Principle"]
+
+# Student-independent instructions appended to the ontology overview in the static system block
+TUTORING_GUIDELINES = """
+When tutoring:
+1. Use the knowledge base to ensure accuracy
+2. Consider prerequisites when explaining concepts
+3. Provide relevant examples from the knowledge base
+4. Connect concepts to real-world applications
+5. Be clear and concise in your explanations
+
+Each question comes with RELEVANT CONTEXT from the knowledge base. Please answer the question accurately using the provided context and knowledge base. Only use information from the context and general physics knowledge. Do not hallucinate or make up information not supported by the context.
+"""
+
+
+def find_ontology_path() -> str:
+    """Locate the physics ontology file, honouring the ONTOLOGY_PATH override."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    possible_paths = [
+        # Development path (from llm_integration directory)
+        os.path.join(os.path.dirname(current_dir), 'ontology', 'schemas', 'physics_tutor.owl'),
+        # Alternative path (from root directory)
+        os.path.join(current_dir, '..', 'ontology', 'schemas', 'physics_tutor.owl'),
+        # Deployed path (same level)
+        os.path.join(current_dir, 'ontology', 'schemas', 'physics_tutor.owl'),
+        # Environment variable override
+        os.getenv('ONTOLOGY_PATH', '')
+    ]
+
+    for path in possible_paths:
+        if path and os.path.exists(path):
+            return os.path.abspath(path)
+
+    raise FileNotFoundError(f"Could not find ontology file. Searched paths: {possible_paths}")
+
+
+class TutorCore:
+    """
+    Immutable resources shared by all tutors in a worker process.
+
+    A TutorCore is expensive to build (ontology load, client construction) and
+    cheap to share. Once constructed none of its attributes are reassigned, and
+    the snapshot-backed ontology is read-only, so it can be used from any number
+    of request threads. The caches it holds (answers, student blocks, usage
+    counters) lock internally.
+    """
+
+    # Times the static system prompt was rendered in this process (once per ontology version)
+    static_prompt_renders = 0
+
+    def __init__(self, ontology_path: Optional[str] = None,
+                 student_models: Optional[StudentModelRepository] = None):
+        """
+        Load the ontology, create the Anthropic client and precompute derived data.
+
+        Args:
+            ontology_path: Optional explicit path to the OWL file. Defaults to the
+                           first existing path returned by find_ontology_path().
+            student_models: Optional student model repository. Defaults to the
+                            process-wide one configured from STUDENT_STORE*.
+        """
+        started = time.perf_counter()
+        logger.debug("Initializing TutorCore...")
+        load_dotenv()
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not self.api_key:
+            logger.error("ANTHROPIC_API_KEY environment variable is not set")
+            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+
+        # Validate API key format before logging success
+        if not self.api_key.startswith("sk-ant-"):
+            logger.error("API key appears to be in wrong format")
+            raise ValueError("API key appears to be in wrong format. Should start with 'sk-ant-'")
+
+        logger.debug("API key validated successfully")
+
+        try:
+            # Configure SSL certificates before the client opens any connection (once per process)
+            configure_ssl_certificates()
+            # Keep-alive connections shared with the evaluation clients and across reloads.
+            # Answers keep the SDK's default timeout, which is longer than APIConfig.timeout
+            self.http_pool = get_http_pool()
+            self.client = Anthropic(api_key=self.api_key, http_client=self.http_pool.client,
+                                    timeout=DEFAULT_TIMEOUT)
+            # Used by the ASGI app (asgi.py); opens no connections until first awaited
+            self.async_client = AsyncAnthropic(api_key=self.api_key, http_client=self.http_pool.create_async_client(),
+                                               timeout=DEFAULT_TIMEOUT)
+            logger.debug("Anthropic clients initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Anthropic client: {type(e).__name__}: {e}")
+            raise
+
+        # Load the ontology
+        try:
+            self.ontology_path = ontology_path or find_ontology_path()
+            logger.debug(f"Loading ontology from: {self.ontology_path}")
+            ontology_started = time.perf_counter()
+            self.onto = load_ontology(self.ontology_path)
+            self.ontology_load_seconds = time.perf_counter() - ontology_started
+            self.ontology_version = self.onto.checksum.hex()[:16]
+            logger.debug(f"Ontology loaded successfully (source: {self.onto.source}, version: {self.ontology_version})")
+        except Exception as e:
+            logger.error(f"Failed to load ontology: {e}")
+            raise
+
+        # Index concepts by name, lowercase name and keyword aliases
+        self.concept_index = ConceptIndex(self.onto, aliases=all_aliases())
+        # Dense concept ids for the bitset student models, in ontology order
+        concept_vocabulary.extend(self.concept_index.names())
+
+        # Compile keyword tables and concept names into one question-routing automaton
+        self.keyword_matcher = build_concept_matcher(self.concept_index, (
+            (TOPIC_MAPPINGS, TOPIC),
+            (LAW_MAPPINGS, LAW),
+            (QUANTITY_MAPPINGS, QUANTITY),
+        ))
+
+        # Rendered context blocks are keyed by ontology version; drop blocks from other versions
+        self.context_cache = context_cache
+        self.context_cache.retain_version(self.ontology_version)
+        # Deduplicates, ranks and packs the rendered blocks into a token budget per question
+        self.context_assembler = ContextAssembler(token_budget=int(os.getenv('CONTEXT_TOKEN_BUDGET', '1500')))
+
+        # Direct prerequisites of every learnable individual, compiled once per ontology
+        # version into the one graph used for readiness, learning order and depth
+        self.concept_prerequisites = self._collect_prerequisite_edges()
+        self.prerequisite_graph = PrerequisiteGraph(self.concept_prerequisites, concept_vocabulary,
+                                                    version=self.ontology_version)
+        self.all_concepts = list(self.concept_prerequisites)
+
+        # BM25 index over definitions, explanations and descriptions (None without NumPy/SciPy)
+        self.retrieval_index = self._create_retrieval_index()
+
+        # Pre-render the ontology-derived, student-independent parts of the system prompt,
+        # once per ontology version (reloading an unchanged ontology reuses the rendering).
+        # static_prompt is byte-identical for every request, so it is sent as the
+        # cached prefix (see ClaudeTutor.system_blocks)
+        self.ontology_prompt, guidelines = self.context_cache.get_or_render(
+            self.ontology_version, "prompt", "static", self._render_static_prompt
+        ).lines
+        self.static_prompt = self.ontology_prompt + guidelines
+        self.static_system_block = {
+            "type": "text",
+            "text": self.static_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }
+        # Rough estimate at four characters per token
+        self.static_prompt_tokens = len(self.static_prompt) // 4
+        if self.static_prompt_tokens < MIN_CACHEABLE_PROMPT_TOKENS:
+            logger.info(f"Static system prompt is ~{self.static_prompt_tokens} tokens, below the "
+                        f"{MIN_CACHEABLE_PROMPT_TOKENS}-token prompt cache minimum; it will not be cached")
+
+        # Cached vs uncached input tokens reported by the API, across all tutors
+        self.token_usage = TokenUsageTracker()
+
+        # Answers to repeated questions, shared by all tutors (None when disabled)
+        self.answer_cache = self._create_answer_cache()
+
+        # Identical concurrent prompts share one upstream call (None when disabled)
+        self.single_flight = SingleFlight() if os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true' else None
+
+        # Student models persisted across requests and workers (None when disabled)
+        self.student_models = student_models if student_models is not None else get_student_repository()
+
+        # Rendered per-student system blocks, reused by the next request's tutor while
+        # the student model is unchanged (see student_system_block)
+        self._student_blocks: "OrderedDict[str, Tuple[StudentModel, int, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._student_blocks_lock = threading.Lock()
+        self.max_student_blocks = int(os.getenv('STUDENT_STORE_CACHE_SIZE', '10000'))
+        self.student_block_renders = 0
+        self.student_block_reuses = 0
+
+        self.load_seconds = time.perf_counter() - started
+        logger.info(f"TutorCore loaded in {self.load_seconds * 1000:.1f} ms")
+
+    def _create_answer_cache(self) -> Optional[AnswerCache]:
+        """Create the answer cache from ANSWER_CACHE_* environment variables."""
+        if os.getenv('ANSWER_CACHE_ENABLED', 'true').lower() != 'true':
+            logger.info("Answer cache disabled")
+            return None
+        return AnswerCache(
+            max_entries=int(os.getenv('ANSWER_CACHE_SIZE', '1024')),
+            ttl_seconds=float(os.getenv('ANSWER_CACHE_TTL', '3600')),
+            similarity_threshold=float(os.getenv('ANSWER_CACHE_SIMILARITY', '0.85'))
+        )
+
+    def _create_retrieval_index(self) -> Optional[RetrievalIndex]:
+        """Build the retrieval index over the learnable concepts' text, if NumPy and SciPy are installed."""
+        if not retrieval_available():
+            logger.info("numpy/scipy not installed; retrieval index disabled")
+            return None
+        return RetrievalIndex(collect_documents(self.concept_index, LEARNABLE_TYPES), version=self.ontology_version)
+
+    def student_system_block(self, model: StudentModel,
+                             render: Callable[[], Optional[Dict[str, Any]]]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Return the student's system block, rendering it only if the model changed.
+
+        Tutors live for one request, so the rendered block is kept here, keyed by
+        the student id and the model's version. The cached model object is compared
+        too: a model reloaded from the store restarts its version count.
+
+        Args:
+            model: The student's model
+            render: Renders the block from the model (None if there is nothing to send)
+
+        Returns:
+            Tuple of (block, rendered); rendered is False if the cached block was reused
+        """
+        with model.lock:
+            version = model.version
+            with self._student_blocks_lock:
+                cached = self._student_blocks.get(model.student_id)
+                if cached is not None and cached[0] is model and cached[1] == version:
+                    self._student_blocks.move_to_end(model.student_id)
+                    self.student_block_reuses += 1
+                    return cached[2], False
+            block = render()
+        with self._student_blocks_lock:
+            self._student_blocks[model.student_id] = (model, version, block)
+            self._student_blocks.move_to_end(model.student_id)
+            while len(self._student_blocks) > self.max_student_blocks:
+                self._student_blocks.popitem(last=False)
+            self.student_block_renders += 1
+        return block, True
+
+    def _collect_prerequisite_edges(self) -> Dict[str, List[str]]:
+        """
+        Collect the direct prerequisites of every learnable individual for the PrerequisiteGraph.
+
+        The ontology declares no individuals typed Concept; its hasPrerequisite
+        edges are carried by the laws, quantities, units, formulas and principles.
+        """
+        edges = {}
+        for class_name in LEARNABLE_TYPES:
+            for individual in self.concept_index.of_type(class_name):
+                edges.setdefault(individual.name, [prereq.name for prereq in getattr(individual, 'hasPrerequisite', [])])
+        return edges
+
+    def _render_static_prompt(self) -> RenderedBlock:
+        """Render the ontology section and the tutoring guidelines of the system prompt."""
+        TutorCore.static_prompt_renders += 1
+        return RenderedBlock((self._create_ontology_prompt(), TUTORING_GUIDELINES), ())
+
+    def _create_ontology_prompt(self) -> str:
+        """Render the topics and key laws section of the system prompt."""
+        prompt = """You are a physics tutor that uses a structured knowledge base to provide accurate and helpful responses.
+        You have access to the following key concepts and their relationships:
+
+        Topics:
+        """
+
+        # Add topics
+        for topic in self.concept_index.of_type("Topic"):
+            if hasattr(topic, 'hasDefinition') and len(topic.hasDefinition) > 0:
+                prompt += f"- {topic.name}: {topic.hasDefinition[0]}\n"
+            else:
+                prompt += f"- {topic.name}\n"
+
+        prompt += "\nKey Laws:\n"
+        # Add Newton's Laws
+        for law in KEY_LAWS:
+            law_obj = self.concept_index.get(law)
+            if law_obj and hasattr(law_obj, 'hasDefinition') and len(law_obj.hasDefinition) > 0:
+                prompt += f"- {law}: {law_obj.hasDefinition[0]}\n"
+            elif law_obj:
+                prompt += f"- {law}\n"
+
+        return prompt
+
+    def stats(self) -> Dict[str, object]:
+        """Return load-time, cache and token usage statistics for monitoring."""
+        return {
+            'load_ms': round(self.load_seconds * 1000, 2),
+            'ontology_load_ms': round(self.ontology_load_seconds * 1000, 3),
+            'ontology_source': self.onto.source,
+            'ontology_version': self.ontology_version,
+            'concepts': len(self.all_concepts),
+            'prerequisite_graph': self.prerequisite_graph.stats(),
+            'retrieval_index': self.retrieval_index.stats() if self.retrieval_index else None,
+            'context_cache': self.context_cache.stats(),
+            'context_assembler': self.context_assembler.stats(),
+            'static_prompt_renders': TutorCore.static_prompt_renders,
+            'static_prompt_tokens': self.static_prompt_tokens,
+            'student_blocks': {
+                'cached': len(self._student_blocks),
+                'renders': self.student_block_renders,
+                'reuses': self.student_block_reuses,
+            },
+            'token_usage': self.token_usage.snapshot(),
+            'answer_cache': self.answer_cache.stats() if self.answer_cache else None,
+            'single_flight': self.single_flight.stats() if self.single_flight else None,
+            'student_models': self.student_models.stats() if self.student_models else None,
+            'http_pool': self.http_pool.stats(),
+        }
+
+
+_core: Optional[TutorCore] = None
+_core_lock = threading.Lock()
+
+
+def get_tutor_core() -> TutorCore:
+    """
+    Return the process-wide TutorCore, loading it on first use.
+
+    Uses double-checked locking so concurrent first requests build the core once.
+    """
+    global _core
+    if _core is None:
+        with _core_lock:
+            if _core is None:
+                _core = TutorCore()
+    return _core
+
+
+def current_tutor_core() -> Optional[TutorCore]:
+    """Return the process-wide TutorCore if it has been loaded, without loading it."""
+    return _core
+
+
+def reload_tutor_core() -> TutorCore:
+    """
+    Reload the ontology and swap in a fresh process-wide TutorCore.
+
+    Tutors created before the reload keep using the previous core. Cached context
+    blocks survive if the ontology is unchanged and are evicted otherwise. Student
+    models are carried over, since every core shares the process-wide repository.
+    """
+    global _core
+    core = TutorCore()
+    with _core_lock:
+        _core = core
+    logger.info(f"TutorCore reloaded (ontology version {core.ontology_version})")
+    return core
+
+
+def reset_tutor_core() -> None:
+    """Drop the cached TutorCore so the next call to get_tutor_core() reloads it."""
+    global _core
+    with _core_lock:
+        _core = None
@@ -1,11 +1,16 @@
 from flask import Flask, render_template, request, jsonify
 import os
+import sys
 import logging
 from dotenv import load_dotenv
-from owlready2 import get_ontology
 import anthropic
 import json
 
+# Make the project root importable when run as ``python ontology/app.py``
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_integration.ontology_snapshot import load_ontology
+from llm_integration.concept_index import ConceptIndex
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,6 +22,7 @@ app = Flask(__name__)
 
 # Load the ontology with proper exception handling
 onto = None
+concept_index = None
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     ontology_path = os.path.join(current_dir, 'schemas', 'physics_tutor.owl')
@@ -25,12 +31,15 @@ try:
         raise FileNotFoundError(f"Ontology file not found at: {ontology_path}")
     
     logger.info(f"Loading ontology from: {ontology_path}")
-    onto = get_ontology(f"file://{ontology_path}").load()
-    logger.info("Ontology loaded successfully")
+    # Prefer the precompiled snapshot; it is rebuilt automatically if stale
+    onto = load_ontology(ontology_path)
+    concept_index = ConceptIndex(onto)
+    logger.info(f"Ontology loaded successfully (source: {onto.source})")
 except Exception as e:
     logger.error(f"Failed to load ontology: {e}")
     logger.error("Application will continue without ontology support")
     onto = None
+    concept_index = None
 
 # Initialize Anthropic client
 client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
@@ -85,35 +94,39 @@ def get_ontology_context(query):
     if any(term in ["newton", "law", "force", "motion"] for term in query_terms):
         for law in ["NewtonsFirstLaw", "NewtonsSecondLaw", "NewtonsThirdLaw"]:
             try:
-                law_obj = onto.search_one(iri=f"*{law}")
+                law_obj = concept_index.get(law)
                 if law_obj and hasattr(law_obj, 'hasDefinition') and law_obj.hasDefinition:
                     context_parts.append(f"{law}: {law_obj.hasDefinition[0]}")
             except (AttributeError, IndexError) as e:
                 logger.warning(f"Could not access definition for {law}: {e}")
-                
-                    # Add prerequisites
-                    try:
-                        prerequisites = list(law_obj.hasPrerequisite) if hasattr(law_obj, 'hasPrerequisite') else []
-                        if prerequisites:
-                            prereq_text = ", ".join([getattr(prereq, 'name', str(prereq)) for prereq in prerequisites])
-                            context_parts.append(f"{law} prerequisites: {prereq_text}")
-                    except Exception as e:
-                        logger.warning(f"Could not access prerequisites for {law}: {e}")
-                
-                    # Add formulas if available
-                    try:
-                        formulas = list(law_obj.hasFormula) if hasattr(law_obj, 'hasFormula') else []
-                        for formula in formulas:
-                            if hasattr(formula, 'hasDefinition') and formula.hasDefinition:
-                                context_parts.append(f"{law} formula: {formula.hasDefinition[0]}")
-                    except Exception as e:
-                        logger.warning(f"Could not access formulas for {law}: {e}")
+                continue
+            
+            if not law_obj:
+                continue
+            
+            # Add prerequisites
+            try:
+                prerequisites = list(law_obj.hasPrerequisite) if hasattr(law_obj, 'hasPrerequisite') else []
+                if prerequisites:
+                    prereq_text = ", ".join([getattr(prereq, 'name', str(prereq)) for prereq in prerequisites])
+                    context_parts.append(f"{law} prerequisites: {prereq_text}")
+            except Exception as e:
+                logger.warning(f"Could not access prerequisites for {law}: {e}")
+            
+            # Add formulas if available
+            try:
+                formulas = list(law_obj.hasFormula) if hasattr(law_obj, 'hasFormula') else []
+                for formula in formulas:
+                    if hasattr(formula, 'hasDefinition') and formula.hasDefinition:
+                        context_parts.append(f"{law} formula: {formula.hasDefinition[0]}")
+            except Exception as e:
+                logger.warning(f"Could not access formulas for {law}: {e}")
     
     # Look for physical quantities
     for quantity in ["Force", "Mass", "Acceleration", "Velocity", "Position", "Time"]:
         if quantity.lower() in query.lower():
             try:
-                quantity_obj = onto.search_one(iri=f"*{quantity}")
+                quantity_obj = concept_index.get(quantity)
                 if quantity_obj:
                     definition = getattr(quantity_obj, "hasDefinition", [""])
                     if definition and len(definition) > 0:
@@ -94,6 +94,63 @@ document.addEventListener("DOMContentLoaded", () => {
 
       return response.json();
     },
+
+    /**
+     * Stream the tutor's answer from /api/ask/stream (Server-Sent Events).
+     * Calls onToken(text) for each fragment and resolves with the "done" payload.
+     */
+    async streamTutorResponse(question, onToken) {
+      const response = await fetch("/api/ask/stream", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({
+          question,
+          session_id: sessionId,
+        }),
+      });
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || "Network response was not ok");
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let eventName = "message";
+          let data = "";
+          rawEvent.split("\n").forEach((line) => {
+            if (line.startsWith("event:")) eventName = line.slice(6).trim();
+            else if (line.startsWith("data:")) data += line.slice(5).trim();
+          });
+          const payload = data ? JSON.parse(data) : {};
+
+          if (eventName === "token") {
+            onToken(payload.text);
+          } else if (eventName === "error") {
+            throw new Error(payload.error || "Network response was not ok");
+          } else if (eventName === "done") {
+            return payload;
+          }
+        }
+      }
+
+      throw new Error("Network response was not ok");
+    },
   };
 
   // Chat Management
@@ -111,23 +168,59 @@ document.addEventListener("DOMContentLoaded", () => {
         behavior: 'smooth'
       });
 
+      let streamingMessage = null;
+
       try {
-        // Get tutor's response
-        const response = await api.fetchTutorResponse(message);
-        
-        // Remove typing indicator
-        typingIndicator.remove();
-        
-        // Add a small delay for better UX
-        await new Promise(resolve => setTimeout(resolve, 300));
-        
-        // Add tutor response
-        this.addMessage(response.response, "tutor");
+        if (window.ReadableStream && window.TextDecoder) {
+          // Render the answer as it streams in
+          let text = "";
+          let renderPending = false;
+
+          await api.streamTutorResponse(message, (fragment) => {
+            if (!streamingMessage) {
+              // Replace the typing indicator with the answer on the first token
+              typingIndicator.remove();
+              streamingMessage = this.addMessage("", "tutor");
+            }
+            text += fragment;
+
+            // Re-render at most once per animation frame
+            if (!renderPending) {
+              renderPending = true;
+              requestAnimationFrame(() => {
+                renderPending = false;
+                this.updateMessage(streamingMessage, text);
+              });
+            }
+          });
+
+          typingIndicator.remove();
+          if (streamingMessage) {
+            this.updateMessage(streamingMessage, text);
+          } else {
+            this.addMessage(text, "tutor");
+          }
+        } else {
+          // Get tutor's response
+          const response = await api.fetchTutorResponse(message);
+          
+          // Remove typing indicator
+          typingIndicator.remove();
+          
+          // Add a small delay for better UX
+          await new Promise(resolve => setTimeout(resolve, 300));
+          
+          // Add tutor response
+          this.addMessage(response.response, "tutor");
+        }
       } catch (error) {
         console.error("Error:", error);
         
-        // Remove typing indicator
+        // Remove typing indicator and any partially streamed answer
         typingIndicator.remove();
+        if (streamingMessage) {
+          streamingMessage.closest(".tutor-message").remove();
+        }
         
         // Provide more specific error messages
         let errorMessage = "Sorry, I encountered an error. Please try again.";
@@ -216,6 +309,17 @@ document.addEventListener("DOMContentLoaded", () => {
           behavior: 'smooth'
         });
       }, 50);
+
+      return message;
+    },
+
+    // Re-render a tutor message with the text received so far
+    updateMessage(messageElement, content) {
+      messageElement.innerHTML = this.formatMessage(content);
+      this.processMathAndPhysics(messageElement);
+
+      // Keep the growing answer in view
+      chatContainer.scrollTop = chatContainer.scrollHeight;
     },
     
     processMathAndPhysics(messageElement) {
@@ -0,0 +1,12 @@
+import pytest
+
+from llm_integration.student_store import reset_student_repository
+
+
+@pytest.fixture(autouse=True)
+def isolated_student_store(monkeypatch, tmp_path):
+    """Keep each test's student models in its own database."""
+    monkeypatch.setenv("STUDENT_STORE_PATH", str(tmp_path / "students.db"))
+    reset_student_repository()
+    yield
+    reset_student_repository()
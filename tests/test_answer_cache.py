@@ -0,0 +1,34 @@
+from llm_integration.answer_cache import AnswerCache
+
+LAW = ["NewtonsSecondLaw", "Force", "Mass", "Acceleration"]
+
+
+def test_rephrased_question_hits_but_different_intent_misses():
+    cache = AnswerCache()
+    cache.store(cache.probe("What is Newton's second law?", LAW, "novice"), "F = ma")
+
+    for phrasing in ["what is newtons second law", "Can you explain Newton's 2nd law?", "newton second law?"]:
+        assert cache.probe(phrasing, LAW, "novice").answer == "F = ma"
+    assert cache.probe("Give me an example of Newton's second law", LAW, "novice").answer is None
+    # Same text, different concepts or knowledge bucket
+    assert cache.probe("What is Newton's second law?", LAW[:1], "novice").answer is None
+    assert cache.probe("What is Newton's second law?", LAW, "advanced").answer is None
+
+    stats = cache.stats()
+    assert (stats["similar_hits"], stats["misses"]) == (3, 4)
+
+
+def test_ttl_expiry_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("llm_integration.answer_cache.time.time", lambda: now[0])
+    cache = AnswerCache(max_entries=2, ttl_seconds=60)
+    for i, concept in enumerate(["Mass", "Force", "Velocity"]):
+        cache.store(cache.probe(f"What is {concept}?", [concept], "novice"), concept)
+        if i == 1:
+            cache.probe("What is Mass?", ["Mass"], "novice")  # Mass becomes most recently used
+
+    assert cache.probe("What is Force?", ["Force"], "novice").answer is None  # evicted (LRU)
+    assert cache.probe("What is Mass?", ["Mass"], "novice").answer == "Mass"
+    now[0] += 61
+    assert cache.probe("What is Velocity?", ["Velocity"], "novice").answer is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["expirations"] == 1
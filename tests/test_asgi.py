@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+
+pytest.importorskip("quart")
+pytest.importorskip("anthropic")
+
+from benchmarks.stub_llm import StubLLMServer
+from llm_integration.tutor_core import reset_tutor_core
+
+
+@pytest.fixture
+def asgi_app(monkeypatch):
+    with StubLLMServer(first_token_delay=0.3) as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        monkeypatch.setenv("JWT_SECRET", "test_jwt_secret_key")
+        reset_tutor_core()
+        import asgi
+        monkeypatch.setattr(asgi.app_config, "metrics_enabled", True)
+        monkeypatch.setattr(asgi.app_config, "allow_cache_bypass", True)
+        yield asgi.app, llm
+        reset_tutor_core()
+
+
+def test_concurrent_questions_overlap_on_one_event_loop(asgi_app, monkeypatch):
+    app, llm = asgi_app
+    monkeypatch.setenv("SINGLE_FLIGHT_ENABLED", "false")  # every request must reach the LLM
+
+    async def run():
+        async with app.test_app() as test_app:
+            client = test_app.test_client()
+            ask = lambda i: client.post("/api/ask", json={"question": "What is Newton's second law?",
+                                                          "session_id": f"s{i}"})
+            started = asyncio.get_running_loop().time()
+            responses = await asyncio.gather(*(ask(i) for i in range(20)))
+            return responses, asyncio.get_running_loop().time() - started
+
+    responses, elapsed = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200] * 20
+    assert len(llm.requests) == 20
+    # 20 calls of 0.3 s each finish together, not one after another
+    assert elapsed < 0.3 * 5
+
+
+def test_validation_matches_wsgi_app(asgi_app):
+    app, llm = asgi_app
+
+    async def run():
+        async with app.test_app() as test_app:
+            response = await test_app.test_client().post("/api/ask/stream", json={"question": 42})
+            return response.status_code, await response.get_json()
+
+    assert asyncio.run(run()) == (400, {"error": "Question must be a text string"})
+    assert llm.requests == []
+
+
+def test_identical_questions_share_one_upstream_call(asgi_app):
+    app, llm = asgi_app
+
+    async def run():
+        async with app.test_app() as test_app:
+            client = test_app.test_client()
+            ask = lambda i: client.post("/api/ask", json={"question": "What is Newton's second law?",
+                                                          "session_id": f"s{i}", "bypass_cache": True})
+            responses = await asyncio.gather(*(ask(i) for i in range(10)))
+            answers = {(await response.get_json())["response"] for response in responses}
+            metrics = await (await client.get("/api/metrics")).get_json()
+            return answers, metrics
+
+    answers, metrics = asyncio.run(run())
+    assert len(answers) == 1
+    assert len(llm.requests) == 1
+    assert metrics["tutor_core"]["single_flight"]["upstream_calls_saved"] == 9
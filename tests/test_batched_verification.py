@@ -0,0 +1,55 @@
+import pytest
+
+from evaluation.utils.text_processing import parse_batch_verification_result, verification_verdict
+
+
+def test_batch_response_is_split_per_explanation():
+    response = """=== RESULT 1 ===
+CONTAINS_HALLUCINATIONS: No
+No hallucinations detected.
+
+**=== RESULT 2 ===**
+**CONTAINS_HALLUCINATIONS:** [Yes]
+- [Heavier objects fall faster]: Free-fall acceleration does not depend on mass.
+
+=== RESULT 4 ===
+I could not evaluate this one.
+"""
+    results = parse_batch_verification_result(response, 4)
+
+    assert results[0] == []
+    assert [item["quote"] for item in results[1]] == ["Heavier objects fall faster"]
+    assert results[2] is None  # no section
+    assert results[3] is None  # no verdict
+    assert verification_verdict("CONTAINS_HALLUCINATIONS: [No]") is False
+
+
+def test_echoed_template_is_not_a_verdict():
+    assert verification_verdict("CONTAINS_HALLUCINATIONS: [Yes/No]") is None
+    assert verification_verdict("Format:\nCONTAINS_HALLUCINATIONS: [Yes/No]\n\nCONTAINS_HALLUCINATIONS: No") is False
+    assert parse_batch_verification_result("=== RESULT 1 ===\nCONTAINS_HALLUCINATIONS: [Yes/No]\n", 1) == [None]
+
+
+def test_items_missing_from_a_batch_are_verified_one_at_a_time(monkeypatch, tmp_path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("matplotlib")
+    from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+
+    questions = tmp_path / "questions.json"
+    questions.write_text("[]")
+    evaluator = HallucinationEvaluator(str(questions), use_deployed_api=False)
+    prompts = []
+
+    def query(prompt):
+        prompts.append(prompt)
+        if "=== EXPLANATION" in prompt:
+            return "=== RESULT 1 ===\nCONTAINS_HALLUCINATIONS: No\n"
+        return "CONTAINS_HALLUCINATIONS: Yes\n- [Force keeps it moving]: Inertia does."
+    monkeypatch.setattr(evaluator, "query_baseline_model", query)
+
+    results = evaluator.verify_explanations([("First explanation", ["Inertia"]), ("Second explanation", ["Force"])])
+
+    assert results[0] == []
+    assert results[1][0]["quote"] == "Force keeps it moving"
+    assert len(prompts) == 2 and "Second explanation" in prompts[1]
+    assert evaluator.verification_stats == {'explanations': 2, 'calls': 2, 'batched_calls': 1, 'fallback_calls': 1}
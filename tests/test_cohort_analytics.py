@@ -0,0 +1,52 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+from llm_integration.cohort_analytics import CohortMatrix
+
+PREREQUISITES = {"Mass": [], "Force": ["Mass"], "NewtonsSecondLaw": ["Force", "Mass"]}
+
+
+@pytest.fixture
+def cohort_models():
+    vocabulary = ConceptVocabulary(["Mass", "Force", "NewtonsSecondLaw", "Inertia"])
+    models = [StudentModel(f"s{i}", vocabulary) for i in range(4)]
+    for model in models:
+        model.expose_concept("Force")
+    models[0].mark_as_understood("Mass")
+    models[1].mark_as_understood("Mass")
+    models[1].mark_as_understood("Force")
+    models[2].misconceptions["Force"] = "Motion needs a force"
+    models[3].misconceptions["Force"] = "Motion needs a force"
+    models[3].misconceptions["Inertia"] = "Heavy things fall faster"
+    return models, vocabulary
+
+
+def test_dashboard_metrics(cohort_models):
+    models, vocabulary = cohort_models
+    cohort = CohortMatrix.from_models(models, vocabulary)
+
+    assert cohort.shape == (4, 4)
+    assert cohort.gap_frequencies() == [{'concept': 'Force', 'students': 3, 'share': 0.75}]
+    ready = {row['concept']: row['students'] for row in cohort.readiness_counts(PREREQUISITES)}
+    assert ready == {'Mass': 2, 'Force': 1, 'NewtonsSecondLaw': 1}
+    mastery = cohort.mastery_distribution()
+    assert mastery['Force']['students'] == 4
+    assert mastery['Force']['histogram'] == [3, 0, 0, 1]
+    assert mastery['Force']['mean'] == pytest.approx(0.325)
+    assert 'Inertia' not in mastery
+    assert cohort.top_misconceptions(1) == [
+        {'concept': 'Force', 'misconception': 'Motion needs a force', 'students': 2, 'share': 0.5}
+    ]
+
+
+def test_records_and_models_load_the_same_matrix(cohort_models):
+    models, vocabulary = cohort_models
+    from_models = CohortMatrix.from_models(models, vocabulary)
+    from_records = CohortMatrix.from_records({m.student_id: m.to_dict() for m in models}, from_models.concepts)
+
+    assert (from_models.exposed == from_records.exposed).all()
+    assert (from_models.understood == from_records.understood).all()
+    np.testing.assert_allclose(from_models.levels, from_records.levels)
+    assert from_models.summary(PREREQUISITES) == from_records.summary(PREREQUISITES)
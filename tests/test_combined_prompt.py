@@ -0,0 +1,22 @@
+from evaluation.utils.text_processing import extract_answer_choice, extract_explanation
+
+
+def test_combined_response_yields_letter_and_explanation():
+    response = "ANSWER: B\nEXPLANATION: No net force is needed to keep the puck moving."
+    assert extract_answer_choice(response) == "B"
+    assert extract_explanation(response) == "No net force is needed to keep the puck moving."
+
+    markdown = "**Answer:** (c)\n\n**Explanation:**\nGravity gives both balls the same acceleration."
+    assert extract_answer_choice(markdown) == "C"
+    assert extract_explanation(markdown) == "Gravity gives both balls the same acceleration."
+
+    # Without an EXPLANATION label the rest of the response is the explanation
+    assert extract_explanation("Answer: D\nThe forces are equal and opposite.") == "The forces are equal and opposite."
+
+
+def test_free_form_answers_still_parse():
+    assert extract_answer_choice("The answer is A. Objects keep moving.") == "A"
+    assert extract_answer_choice("ANSWER: Because of inertia") is None
+    # A leading article is not an answer letter
+    assert extract_answer_choice("Answer: a net force keeps it moving, so the answer is C.") == "C"
+    assert extract_answer_choice("Error: 529 - overloaded") is None
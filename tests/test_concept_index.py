@@ -0,0 +1,57 @@
+import pytest
+
+from llm_integration.concept_index import ConceptIndex
+from llm_integration.keyword_mappings import all_aliases
+from llm_integration.ontology_snapshot import load_ontology
+
+
+@pytest.fixture(scope="module")
+def onto(tmp_path_factory):
+    from llm_integration.tutor_core import find_ontology_path
+
+    snapshot_path = tmp_path_factory.mktemp("snapshot") / "physics_tutor.snapshot"
+    return load_ontology(find_ontology_path(), str(snapshot_path))
+
+
+@pytest.fixture(scope="module")
+def index(onto):
+    return ConceptIndex(onto, aliases=all_aliases())
+
+
+def test_names_resolve_like_iri_searches(onto, index):
+    names = [individual.name for individual in onto.individuals()]
+    assert index.names() == names
+    for name in names:
+        assert index.get(name) is onto.search_one(iri=f"*#{name}")
+        assert index.get(name.lower()) is index.get(name)
+    assert index.get("NoSuchConcept") is None and "NoSuchConcept" not in index
+
+
+def test_aliases_and_types(onto, index):
+    assert index.get("law of inertia").name == "NewtonsFirstLaw"
+    assert index.get("F=MA").name == "NewtonsSecondLaw"
+    assert index.get("speed").name == "Velocity"
+
+    assert [law.name for law in index.of_type("Law")] == ["NewtonsFirstLaw", "NewtonsSecondLaw", "NewtonsThirdLaw"]
+    assert [i.name for i in index.of_type("PhysicalQuantity")] == \
+        [i.name for i in onto.search(type=onto.PhysicalQuantity)]
+    assert {part.name for part in index.parts_of("NewtonsLaws")} >= {"Force", "Mass", "NewtonsFirstLaw"}
+    assert index.of_type("NoSuchClass") == [] and index.parts_of("NoSuchTopic") == []
+
+
+def test_standalone_app_context_lists_law_prerequisites_and_formulas(monkeypatch):
+    pytest.importorskip("flask")
+    pytest.importorskip("anthropic")
+    import importlib.util
+    import os
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    path = os.path.join(os.path.dirname(__file__), "..", "ontology", "app.py")
+    spec = importlib.util.spec_from_file_location("ontology_app", path)
+    ontology_app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(ontology_app)
+
+    lines = ontology_app.get_ontology_context("What does Newton's second law say about force?").splitlines()
+    assert "NewtonsSecondLaw prerequisites: Force, Mass, Acceleration" in lines
+    assert any(line.startswith("NewtonsSecondLaw formula: F = m * a") for line in lines)
+    assert "NewtonsThirdLaw prerequisites: Force, NewtonsFirstLaw, NewtonsSecondLaw" in lines
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("anthropic")
+
+from llm_integration.claude_tutor import ClaudeTutor
+from llm_integration.tutor_core import TutorCore
+
+
+def test_annotations_follow_concept_ids_not_substrings(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    tutor = ClaudeTutor("student_a", core=TutorCore())
+    tutor.student_model.mark_as_understood("Newton")  # the unit, a substring of "NewtonsFirstLaw"
+    tutor.student_model.mark_as_understood("Force")
+    tutor.student_model.expose_concept("Mass")
+
+    adapted, _ = tutor._prepare_context("What does Newton's second law say?")
+    lines = adapted.splitlines()
+
+    assert any(line.startswith("- Force:") and line.endswith("[ALREADY UNDERSTOOD]") for line in lines)
+    assert any(line.startswith("- Mass:") and line.endswith("[KNOWLEDGE GAP - NEEDS REVIEW]") for line in lines)
+    # Examples and applications mention concepts in prose but are never annotated
+    assert not any("UNDERSTOOD" in line for line in lines if "NewtonsFirstLaw" in line or "athletes" in line)
+
+
+def test_unrelated_question_gets_no_context(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    tutor = ClaudeTutor("student_a", core=TutorCore())
+
+    context, concepts = tutor._prepare_context("What's the weather like?")
+
+    assert context == "No specific context found for this question."
+    assert concepts == []
+    assert tutor.student_model.get_knowledge_gaps() == []
@@ -0,0 +1,51 @@
+from llm_integration.context_assembler import ContextAssembler, ContextBlock, estimate_tokens
+from llm_integration.student_model import concept_vocabulary
+
+
+def _block(name, *items):
+    return ContextBlock("concept", name, (f"Concept: {name}", f"Definition: {name} definition",
+                                          "Prerequisites:", *(f"- {item}" for item in items)), (name, *items))
+
+
+def test_duplicate_blocks_and_items_are_dropped():
+    assembler = ContextAssembler(token_budget=None)
+    force = _block("Force", "Mass", "Acceleration")
+    weight = _block("Weight", "Mass")
+
+    context = assembler.assemble("what is weight", [force, weight, force])
+
+    # Weight ranks first; its only prerequisite line then repeats in Force's block
+    assert context.text.splitlines()[0] == "Concept: Weight"
+    assert context.text.count("- Mass") == 1
+    assert context.duplicate_lines == 1
+    assert context.concepts_covered == ["Weight", "Mass", "Force", "Acceleration"]
+    assert context.tokens_saved > 0
+    assert assembler.stats()['tokens_saved'] == context.tokens_saved
+
+
+def test_blocks_are_packed_into_the_token_budget():
+    blocks = [_block(f"Concept{i}", *(f"Item{i}_{j}" for j in range(20))) for i in range(10)]
+    budget = 100
+
+    context = ContextAssembler(token_budget=budget).assemble("anything", blocks)
+
+    assert context.tokens <= budget
+    assert estimate_tokens(context.text) <= budget
+    assert context.text.startswith("Concept: Concept0")
+    assert context.blocks_dropped > 0
+    assert "Concept1" not in context.concepts_covered
+
+
+def test_truncated_block_covers_only_kept_lines():
+    items = [f"Part{j}" for j in range(20)]
+    lines = ("Concept: Whole", "Definition: Whole definition", "Parts:", *(f"- {item}" for item in items))
+    line_ids = (-1, -1, -1, *(concept_vocabulary.id_for(item) for item in items))
+    block = ContextBlock("concept", "Whole", lines, ("Whole", *items), line_ids)
+
+    assembler = ContextAssembler(token_budget=30)
+    context = assembler.assemble("whole", [block])
+
+    assert assembler.stats()['truncated'] == 1
+    kept = [line[2:] for line in context.text.splitlines() if line.startswith("- ")]
+    assert 0 < len(kept) < len(items)
+    assert context.concepts_covered == ["Whole", *kept]
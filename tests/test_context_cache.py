@@ -0,0 +1,54 @@
+import shutil
+
+import pytest
+
+from llm_integration.context_cache import ContextCache, RenderedBlock
+
+
+def test_entries_of_other_versions_are_evicted():
+    cache = ContextCache()
+    renders = []
+
+    def render(text):
+        def _render():
+            renders.append(text)
+            return RenderedBlock((text,), ("Force",))
+        return _render
+
+    cache.get_or_render("v1", "concept", "Force", render("force v1"))
+    cache.get_or_render("v1", "law", "NewtonsSecondLaw", render("law v1"))
+    assert cache.get_or_render("v1", "concept", "Force", render("unused")).lines == ("force v1",)
+    assert cache.retain_version("v1") == 0
+
+    assert cache.retain_version("v2") == 2
+    assert cache.stats()["entries"] == 0 and cache.stats()["memory_bytes"] == 0
+    assert cache.get_or_render("v2", "concept", "Force", render("force v2")).lines == ("force v2",)
+    assert renders == ["force v1", "law v1", "force v2"]
+
+
+def test_changed_ontology_invalidates_rendered_context(monkeypatch, tmp_path):
+    pytest.importorskip("anthropic")
+    from llm_integration.claude_tutor import ClaudeTutor
+    from llm_integration.context_cache import context_cache
+    from llm_integration.tutor_core import TutorCore, find_ontology_path
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    owl_path = tmp_path / "physics_tutor.owl"
+    shutil.copy(find_ontology_path(), owl_path)
+    question = "What is Newton's second law?"
+
+    core = TutorCore(ontology_path=str(owl_path))
+    context, _ = ClaudeTutor("student_a", core=core)._get_relevant_context(question)
+    assert "directly proportional" in context
+    assert context_cache.stats()["entries"] > 0
+
+    owl_path.write_text(owl_path.read_text(encoding="utf-8").replace(
+        "directly proportional", "exactly proportional"), encoding="utf-8")
+    reloaded = TutorCore(ontology_path=str(owl_path), student_models=core.student_models)
+    assert reloaded.ontology_version != core.ontology_version
+    # Blocks rendered from the old version are gone, so the new definition is served
+    misses = context_cache.stats()["misses"]
+    context, _ = ClaudeTutor("student_a", core=reloaded)._get_relevant_context(question)
+    assert "exactly proportional" in context and "directly proportional" not in context
+    assert context_cache.stats()["misses"] > misses
+    core.student_models.close()
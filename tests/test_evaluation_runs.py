@@ -0,0 +1,80 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+from benchmarks.stub_llm import StubLLMServer
+from benchmarks.bench_evaluation_concurrency import ANSWER
+from evaluation.models import api_client, hallucination_evaluator
+from evaluation.models.hallucination_evaluator import HallucinationEvaluator
+from evaluation.utils import response_cache
+from evaluation.utils.response_cache import ResponseCache
+from evaluation.utils.result_journal import JournalMismatchError
+
+ANSWER_TEXT = "".join(ANSWER)
+DATA = os.path.join(os.path.dirname(__file__), "..", "evaluation", "enhanced_fci_questions.json")
+
+
+@pytest.fixture
+def stub_evaluator(monkeypatch, tmp_path):
+    """Build evaluators that query the stub LLM and write to tmp_path, without the response cache."""
+    with StubLLMServer(tokens=ANSWER) as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setattr(api_client, "ANTHROPIC_API_URL", llm.base_url)
+        monkeypatch.setattr(hallucination_evaluator, "OUTPUT_DIR", str(tmp_path))
+        monkeypatch.setattr(response_cache, "_cache", ResponseCache(str(tmp_path / "cache"), mode="off"))
+
+        def build(questions=3, **options):
+            evaluator = HallucinationEvaluator(DATA, use_deployed_api=False, requests_per_minute=0, **options)
+            evaluator.fci_questions = evaluator.fci_questions[:questions]
+            return evaluator
+
+        yield build, llm
+
+
+def test_concurrent_run_keeps_question_order(stub_evaluator):
+    build, llm = stub_evaluator
+    serial = build(questions=4).evaluate_models(concurrency=1)
+
+    # The first pair answers last, so workers finish out of question order
+    calls = len(llm.requests)
+    llm.responder = lambda body: (time.sleep(0.3) if body is llm.requests[calls] else None) or ANSWER_TEXT
+    concurrent = build(questions=4).evaluate_models(concurrency=4)
+
+    question_ids = [question["id"] for question in build(questions=4).fci_questions]
+    assert list(serial["question_id"]) == [qid for qid in question_ids for _ in range(2)]
+    assert list(serial["model_type"]) == ["baseline", "ontology"] * 4
+    assert concurrent.equals(serial)
+
+
+def test_resume_skips_journaled_pairs(stub_evaluator):
+    build, llm = stub_evaluator
+    complete = build().evaluate_models()
+    calls_per_pair = len(llm.requests) // len(complete)
+
+    # Interrupted after the header and two results
+    journal_path = build().journal.path
+    with open(journal_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(journal_path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:3])
+
+    resumed = build()
+    calls_before = len(llm.requests)
+    results = resumed.evaluate_models(resume=True)
+    assert resumed.resumed_results == 2
+    assert len(llm.requests) - calls_before == (len(complete) - 2) * calls_per_pair
+    assert results.equals(complete)
+
+
+def test_resume_refuses_a_journal_with_other_settings(stub_evaluator):
+    build, llm = stub_evaluator
+    build().evaluate_models()
+
+    with pytest.raises(JournalMismatchError, match="prompt_mode"):
+        build(prompt_mode="combined").evaluate_models(resume=True)
+    # Starting a new run is still possible
+    assert len(build(prompt_mode="combined").evaluate_models()) == 6
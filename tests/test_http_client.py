@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("anthropic")
+
+from benchmarks.stub_llm import StubLLMServer
+from llm_integration.claude_tutor import ClaudeTutor
+from llm_integration.tutor_core import TutorCore
+
+
+def test_tutors_and_reloads_share_keep_alive_connections(monkeypatch):
+    monkeypatch.setenv("ANSWER_CACHE_ENABLED", "false")
+    with StubLLMServer() as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        core = TutorCore()
+        before = core.http_pool.stats()
+        for i in range(3):
+            ClaudeTutor(f"student_{i}", core=core).tutor_sync("What is Newton's second law?")
+        # A reloaded core reuses the process-wide pool
+        reloaded = TutorCore()
+        ClaudeTutor("student_x", core=reloaded).tutor_sync("What is mass?")
+
+        after = reloaded.http_pool.stats()
+        assert reloaded.http_pool is core.http_pool
+        assert len(llm.requests) == 4
+        assert llm.connections == 1
+        assert after['requests'] - before['requests'] == 4
+        assert after['connections_opened'] - before['connections_opened'] == 1
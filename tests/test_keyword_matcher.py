@@ -0,0 +1,34 @@
+import re
+from llm_integration.keyword_matcher import KeywordMatcher, TOPIC, LAW, QUANTITY, concept_name_phrases
+from llm_integration.keyword_mappings import TOPIC_MAPPINGS, LAW_MAPPINGS, QUANTITY_MAPPINGS
+
+
+def _router():
+    matcher = KeywordMatcher()
+    for mappings, priority in ((TOPIC_MAPPINGS, TOPIC), (LAW_MAPPINGS, LAW), (QUANTITY_MAPPINGS, QUANTITY)):
+        for phrase, name in mappings.items():
+            matcher.add(phrase, name, priority)
+    return matcher.build()
+
+
+def test_matches_agree_with_word_boundary_regex():
+    matcher = _router()
+    question = "Does f=ma hold for massive objects, or is mass time-dependent? Newton's second law!"
+    expected = set()
+    for phrase in list(TOPIC_MAPPINGS) + list(LAW_MAPPINGS) + list(QUANTITY_MAPPINGS):
+        for match in re.finditer(r'(?=\b(' + re.escape(phrase) + r')\b)', question.lower()):
+            expected.add((match.start(1), match.end(1), phrase))
+    found = {(m.start, m.end, m.phrase) for m in matcher.find_all(question)}
+    assert found == expected
+    assert not any(m.phrase == "mass" and m.start == question.lower().index("massive") for m in matcher.find_all(question))
+
+
+def test_priority_groups_keep_table_order():
+    grouped = _router().match_by_priority("Explain the law of inertia and Newton’s laws of motion")
+    assert [m.value for m in grouped[TOPIC]] == ["NewtonsLaws", "Kinematics"]
+    assert grouped[LAW][0].value == "NewtonsFirstLaw"
+
+
+def test_concept_name_phrases_split_camel_case():
+    assert concept_name_phrases("MeterPerSecond") == ["meterpersecond", "meter per second"]
+    assert concept_name_phrases("Force") == ["force"]
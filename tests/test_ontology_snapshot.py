@@ -0,0 +1,92 @@
+import os
+import shutil
+
+import pytest
+
+owlready2 = pytest.importorskip("owlready2")
+
+from llm_integration import ontology_snapshot
+from llm_integration.ontology_snapshot import (
+    LITERAL_PROPERTIES, OBJECT_PROPERTIES, SnapshotError, compile_snapshot, load_ontology, load_snapshot
+)
+
+OWL_PATH = os.path.join(os.path.dirname(__file__), "..", "ontology", "schemas", "physics_tutor.owl")
+
+
+@pytest.fixture(scope="module")
+def owl():
+    world = owlready2.World()
+    return world.get_ontology(f"file://{os.path.abspath(OWL_PATH)}").load()
+
+
+@pytest.fixture(scope="module")
+def snapshot(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "physics_tutor.snapshot"
+    return load_snapshot(compile_snapshot(OWL_PATH, str(path)))
+
+
+def test_snapshot_matches_owlready2(owl, snapshot):
+    assert {cls.name for cls in snapshot.classes()} == {cls.name for cls in owl.classes()}
+
+    owl_individuals = {ind.name: ind for cls in owl.classes() for ind in cls.instances()}
+    assert owl_individuals
+    assert {ind.name for ind in snapshot.individuals()} == set(owl_individuals)
+
+    for ind in snapshot.individuals():
+        expected = owl_individuals[ind.name]
+        assert ind.iri == expected.iri
+        for prop in LITERAL_PROPERTIES:
+            assert getattr(ind, prop) == [str(v) for v in getattr(expected, prop, [])]
+        for prop in OBJECT_PROPERTIES:
+            assert [v.name for v in getattr(ind, prop)] == [v.name for v in getattr(expected, prop, [])]
+
+
+def test_search_matches_owlready2(owl, snapshot):
+    for cls in owl.classes():
+        expected = {ind.name for ind in owl.search(type=cls)}
+        assert {ind.name for ind in snapshot.search(type=getattr(snapshot, cls.name))} == expected
+
+    expected = owl.search_one(iri="*NewtonsFirstLaw")
+    assert snapshot.search_one(iri="*NewtonsFirstLaw").iri == expected.iri
+    assert snapshot.search_one(iri="*NoSuchConcept") is None
+
+
+def test_stale_snapshot_is_rebuilt(tmp_path, monkeypatch):
+    owl_path = tmp_path / "physics_tutor.owl"
+    snapshot_path = tmp_path / "physics_tutor.snapshot"
+    shutil.copy(OWL_PATH, owl_path)
+
+    compiles = []
+    compile_ontology = ontology_snapshot.compile_ontology
+
+    def counting_compile(path):
+        compiles.append(path)
+        return compile_ontology(path)
+
+    monkeypatch.setattr(ontology_snapshot, "compile_ontology", counting_compile)
+
+    first = load_ontology(str(owl_path), str(snapshot_path))
+    assert first.source == "owl" and len(compiles) == 1
+    assert load_ontology(str(owl_path), str(snapshot_path)).source == "snapshot"
+    assert len(compiles) == 1
+
+    # Any edit to the OWL file changes its checksum and invalidates the snapshot
+    with open(owl_path, "a", encoding="utf-8") as f:
+        f.write("\n<!-- edited -->\n")
+    rebuilt = load_ontology(str(owl_path), str(snapshot_path))
+    assert rebuilt.source == "owl" and len(compiles) == 2
+    assert rebuilt.checksum != first.checksum
+    assert load_snapshot(str(snapshot_path)).checksum == rebuilt.checksum
+
+
+def test_truncated_snapshot_is_rebuilt(tmp_path):
+    snapshot_path = tmp_path / "physics_tutor.snapshot"
+    payload = open(compile_snapshot(OWL_PATH, str(snapshot_path)), "rb").read()
+
+    for size in (10, ontology_snapshot._HEADER.size + 2, len(payload) // 2, len(payload) - 1):
+        snapshot_path.write_bytes(payload[:size])
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(snapshot_path))
+        # load_ontology falls back to the OWL file and rewrites a complete snapshot
+        assert load_ontology(OWL_PATH, str(snapshot_path)).source == "owl"
+        assert snapshot_path.read_bytes() == payload
@@ -0,0 +1,77 @@
+import pytest
+
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+from llm_integration.prerequisite_graph import PrerequisiteGraph
+
+GRAPH = {
+    "NewtonsSecondLaw": ["Force", "Acceleration"],
+    "Force": ["Mass"],
+    "Acceleration": ["Velocity"],
+    "Velocity": ["Displacement", "Time"],
+    "Mass": [],
+}
+
+
+def test_closure_order_and_depth():
+    graph = PrerequisiteGraph(GRAPH, ConceptVocabulary())
+
+    assert graph.order.index("Displacement") < graph.order.index("Velocity") < graph.order.index("Acceleration")
+    assert set(graph.all_prerequisites("NewtonsSecondLaw")) == {
+        "Force", "Mass", "Acceleration", "Velocity", "Displacement", "Time"
+    }
+    assert graph.depth("Mass") == 0 and graph.depth("NewtonsSecondLaw") == 3
+    assert graph.requires("NewtonsSecondLaw", "Time") and not graph.requires("Force", "Time")
+    assert graph.prerequisites("Velocity") == ["Displacement", "Time"]
+    assert not graph.has_cycles
+
+
+def test_missing_prerequisites_for_a_student():
+    vocabulary = ConceptVocabulary()
+    graph = PrerequisiteGraph(GRAPH, vocabulary)
+    student = StudentModel("s1", vocabulary)
+    for concept in ("Mass", "Force", "Time"):
+        student.mark_as_understood(concept)
+
+    missing = graph.missing_prerequisites("NewtonsSecondLaw", student)
+    assert set(missing) == {"Acceleration", "Velocity", "Displacement"}
+    assert missing.index("Displacement") < missing.index("Velocity") < missing.index("Acceleration")
+    assert graph.learning_path("NewtonsSecondLaw", student)[-1] == "NewtonsSecondLaw"
+    assert graph.missing_prerequisites("Force", student.understood_mask) == []
+
+
+def test_cycles_are_detected():
+    graph = PrerequisiteGraph({"A": ["B"], "B": ["C"], "C": ["A"], "D": ["A"], "E": []}, ConceptVocabulary())
+    assert graph.has_cycles
+    assert sorted(graph.cyclic) == ["A", "B", "C", "D"]
+    assert graph.order == ["E"]
+    assert set(graph.all_prerequisites("D")) == {"A", "B", "C"}
+    assert graph.depth("A") is None
+
+
+def test_ready_concepts_follow_the_graph():
+    vocabulary = ConceptVocabulary()
+    graph = PrerequisiteGraph(GRAPH, vocabulary)
+    student = StudentModel("s1", vocabulary)
+
+    assert graph.ready_concepts(student) == ["Mass", "Displacement", "Time"]
+    for concept in ("Mass", "Displacement", "Time"):
+        student.mark_as_understood(concept)
+    assert graph.ready_concepts(student) == ["Force", "Velocity"]
+
+
+def test_tutor_recommends_ready_concepts_of_the_ontology(monkeypatch):
+    pytest.importorskip("anthropic")
+    from llm_integration.claude_tutor import ClaudeTutor
+    from llm_integration.tutor_core import TutorCore
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    core = TutorCore()
+    tutor = ClaudeTutor("student_a", core=core)
+    assert "NewtonsFirstLaw" in core.prerequisite_graph
+    assert "NewtonsFirstLaw" not in core.prerequisite_graph.ready_concepts(tutor.student_model)
+
+    for concept in core.prerequisite_graph.prerequisites("NewtonsFirstLaw"):
+        tutor.student_model.mark_as_understood(concept)
+    assert "NewtonsFirstLaw" in core.prerequisite_graph.ready_concepts(tutor.student_model)
+    adapted, _ = tutor._prepare_context("What is Newton's first law?")
+    assert "- NewtonsFirstLaw [READY TO LEARN]" in adapted
@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from benchmarks.stub_llm import StubLLMServer
+from llm_integration.claude_tutor import ClaudeTutor
+from llm_integration.tutor_core import TutorCore
+
+
+@pytest.fixture
+def stub_core(monkeypatch):
+    with StubLLMServer() as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        yield TutorCore(), llm
+
+
+def test_static_prefix_is_a_cached_system_block(stub_core):
+    core, llm = stub_core
+    ClaudeTutor("student_a", core=core).tutor_sync("What is Newton's second law?")
+
+    request = llm.requests[-1]
+    static_block = request["system"][0]
+    assert static_block["text"] == core.static_prompt
+    assert static_block["cache_control"] == {"type": "ephemeral"}
+    question_block = request["messages"][0]["content"]
+    assert question_block.startswith("RELEVANT CONTEXT:")
+    assert question_block.endswith("USER QUESTION: What is Newton's second law?")
+    assert core.static_prompt not in question_block
+
+
+def test_static_prefix_below_the_minimum_is_not_cached(stub_core):
+    core, llm = stub_core
+    assert len(core.static_prompt) // 4 < llm.min_cacheable_tokens
+
+    for student, question in (("student_a", "What is Newton's second law?"), ("student_b", "What is inertia?")):
+        tutor = ClaudeTutor(student, core=core)
+        tutor.tutor_sync(question)
+        assert tutor.last_usage["cache_creation_input_tokens"] == 0
+        assert tutor.last_usage["cache_read_input_tokens"] == 0
+    assert core.stats()["token_usage"]["cached_input_ratio"] == 0
+
+
+def test_usage_splits_cached_and_uncached_input_tokens(monkeypatch):
+    # Without the minimum, the stub caches the static prefix as it would a longer one
+    with StubLLMServer(min_cacheable_tokens=0) as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        core = TutorCore()
+        first = ClaudeTutor("student_a", core=core)
+        first.tutor_sync("What is Newton's second law?")
+        assert first.last_usage["cache_creation_input_tokens"] > 0
+        assert first.last_usage["cache_read_input_tokens"] == 0
+
+        # A different student and question reuse the same static prefix
+        second = ClaudeTutor("student_b", core=core)
+        "".join(second.tutor_stream("What is inertia?"))
+        assert second.last_usage["cache_read_input_tokens"] == first.last_usage["cache_creation_input_tokens"]
+
+        usage = core.stats()["token_usage"]
+        assert usage["requests"] == 2
+        assert 0 < usage["cached_input_ratio"] < 1
+
+
+def test_student_block_is_rebuilt_only_when_the_model_changes(stub_core):
+    core, llm = stub_core
+    tutor = ClaudeTutor("student_a", core=core)
+    tutor.tutor_sync("What is Newton's second law?")
+    renders = tutor.prompt_stats()['student_renders']
+    assert "NewtonsSecondLaw" in llm.requests[-1]["system"][1]["text"]  # not stale after exposure
+
+    # Same question: no new exposures, so the student block is reused
+    tutor.tutor_sync("What is Newton's second law?")
+    assert tutor.prompt_stats()['student_renders'] == renders
+
+    tutor.student_model.misconceptions["Force"] = "Force keeps things moving"
+    request = tutor._build_request("What is force?", adapted_context="")
+    assert "Force keeps things moving" in request["system"][1]["text"]
+    assert tutor.prompt_stats()['student_renders'] == renders + 1
+    assert tutor.prompt_stats()['static_renders'] >= 1
+
+
+def test_student_block_is_reused_across_requests(stub_core):
+    core, llm = stub_core
+    ClaudeTutor("student_a", core=core).tutor_sync("What is Newton's second law?")
+    renders = core.stats()["student_blocks"]["renders"]
+
+    # A new request builds a new tutor; the unchanged model's block is not re-rendered
+    tutor = ClaudeTutor("student_a", core=core)
+    tutor.tutor_sync("What is Newton's second law?", use_cache=False)
+    assert tutor.prompt_stats()['student_renders'] == 0
+    assert core.stats()["student_blocks"]["renders"] == renders
+    assert llm.requests[-1]["system"][1] == llm.requests[-2]["system"][1]
+
+
+def test_answer_cache_is_probed_before_the_student_model_changes(stub_core, monkeypatch):
+    core, llm = stub_core
+    tutor = ClaudeTutor("student_a", core=core)
+    probe = tutor._probe_answer_cache
+    exposed_at_probe = []
+
+    def recording_probe(question, concepts):
+        exposed_at_probe.append(set(tutor.student_model.exposed_concepts))
+        return probe(question, concepts)
+
+    monkeypatch.setattr(tutor, "_probe_answer_cache", recording_probe)
+    tutor.tutor_sync("What is Newton's second law?")
+    assert exposed_at_probe == [set()]
+    assert "NewtonsSecondLaw" in tutor.student_model.exposed_concepts
+
+
+def test_questions_without_concepts_are_not_cached(stub_core):
+    core, llm = stub_core
+    for student_id in ("student_a", "student_b"):
+        ClaudeTutor(student_id, core=core).tutor_sync("What's the weather like?")
+    assert len(llm.requests) == 2
+
+
+def test_async_fallback_failure_is_logged_like_sync(stub_core, caplog):
+    core, llm = stub_core
+    tutor = ClaudeTutor("student_a", core=core)
+
+    def fail(model, **kwargs):
+        raise RuntimeError(f"{model} unavailable")
+
+    async def fail_async(model, **kwargs):
+        fail(model)
+
+    tutor.client = SimpleNamespace(messages=SimpleNamespace(create=fail))
+    tutor.async_client = SimpleNamespace(messages=SimpleNamespace(create=fail_async))
+
+    with pytest.raises(RuntimeError):
+        tutor._create_message({})
+    with pytest.raises(RuntimeError):
+        asyncio.run(tutor._create_message_async({}))
+    failures = [r.getMessage() for r in caplog.records if r.levelname == "ERROR"]
+    assert failures == ["Fallback model also failed: claude-3-haiku-20240307 unavailable"] * 2
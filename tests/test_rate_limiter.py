@@ -0,0 +1,33 @@
+from evaluation.utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bucket_allows_burst_then_paces_calls():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == 0.5
+    assert bucket.acquire() == 0.5
+    assert clock.now == 1.0
+
+    # Idle time refills the bucket, up to its capacity
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == 0.5
+    assert bucket.waited == 1.5
+
+
+def test_zero_rate_disables_limiting():
+    bucket = TokenBucket.per_minute(0)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
@@ -0,0 +1,52 @@
+import os
+
+from evaluation.utils.response_cache import ResponseCache, cache_key
+
+
+def _caller(responses):
+    calls = []
+
+    def call():
+        calls.append(1)
+        return responses[len(calls) - 1]
+    return call, calls
+
+
+def test_record_read_only_and_refresh_modes(tmp_path):
+    call, calls = _caller(["F = ma", "F = dp/dt"])
+    fetch = ("https://api.example/v1/messages", "claude", "What is force?", 1024)
+
+    record = ResponseCache(str(tmp_path), mode="record")
+    assert record.fetch(*fetch, call) == "F = ma"
+    assert record.fetch(*fetch, call) == "F = ma"
+    assert len(calls) == 1
+    assert record.stats()["hits"] == 1 and record.stats()["entries"] == 1
+
+    # Any part of the key changing is a different request
+    assert cache_key(*fetch[:3], 512) != cache_key(*fetch[:3], 1024)
+
+    read_only = ResponseCache(str(tmp_path), mode="read-only")
+    assert read_only.fetch(*fetch, call) == "F = ma"
+    assert read_only.fetch(fetch[0], fetch[1], "New prompt", 1024, lambda: "fresh") == "fresh"
+    assert read_only.stats()["entries"] == 1
+
+    refresh = ResponseCache(str(tmp_path), mode="refresh")
+    assert refresh.fetch(*fetch, call) == "F = dp/dt"
+    assert ResponseCache(str(tmp_path)).fetch(*fetch, call) == "F = dp/dt"
+    assert len(calls) == 2
+
+
+def test_errors_are_not_stored_and_eviction_drops_oldest(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=1500)
+    assert cache.fetch("e", "m", "p", None, lambda: "Error: 529 - overloaded").startswith("Error")
+    assert cache.fetch("e", "m", "q", None, lambda: None) is None
+    assert cache.stats()["entries"] == 0
+
+    for i in range(8):
+        cache.fetch("e", "m", f"prompt {i}", None, lambda: "x" * 200)
+        path = cache._path(cache_key("e", "m", f"prompt {i}"))
+        os.utime(path, (i, i))
+    stats = cache.stats()
+    assert stats["evictions"] > 0 and stats["bytes"] <= 1500
+    assert cache.get(cache_key("e", "m", "prompt 7")) is not None
+    assert cache.get(cache_key("e", "m", "prompt 0")) is None
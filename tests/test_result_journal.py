@@ -0,0 +1,18 @@
+from evaluation.utils.result_journal import ResultJournal
+
+
+def test_journal_round_trip_skips_truncated_line(tmp_path):
+    journal = ResultJournal(str(tmp_path / "journal.jsonl"))
+    journal.append({"question_id": 1, "model_type": "baseline", "is_correct": True,
+                    "hallucination_details": [{"type": "misconception", "content": "Motion needs a force"}]})
+    journal.append({"question_id": 1, "model_type": "ontology", "is_correct": False})
+    # A crash mid-write leaves a partial last line
+    with open(journal.path, "a") as f:
+        f.write('{"question_id": 2, "model_ty')
+
+    completed = journal.load()
+    assert set(completed) == {(1, "baseline"), (1, "ontology")}
+    assert completed[(1, "baseline")]["hallucination_details"][0]["content"] == "Motion needs a force"
+
+    journal.reset()
+    assert journal.load() == {}
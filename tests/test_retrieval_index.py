@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("scipy")
+
+from llm_integration.retrieval_index import RetrievalIndex
+
+
+def test_bm25_ranks_concepts_by_shared_terms():
+    index = RetrievalIndex({
+        "NewtonsFirstLaw": ["An object at rest stays at rest", "Passengers lurch forward when the bus brakes"],
+        "NewtonsThirdLaw": ["Every action has an equal and opposite reaction"],
+        "Mass": ["The amount of matter in an object"],
+    })
+
+    assert index.search("why do I lurch forward when the bus brakes")[0][0] == "NewtonsFirstLaw"
+    assert [name for name, _ in index.search("object", k=5)] == ["Mass", "NewtonsFirstLaw"]
+    assert len(index.search("object", k=1)) == 1
+    assert index.search("what is the weather like") == []
+
+
+@pytest.fixture(scope="module")
+def ontology_index(tmp_path_factory):
+    from llm_integration.concept_index import ConceptIndex
+    from llm_integration.ontology_snapshot import load_ontology
+    from llm_integration.retrieval_index import collect_documents
+    from llm_integration.tutor_core import LEARNABLE_TYPES, find_ontology_path
+
+    snapshot_path = tmp_path_factory.mktemp("snapshot") / "physics_tutor.snapshot"
+    concept_index = ConceptIndex(load_ontology(find_ontology_path(), str(snapshot_path)))
+    return RetrievalIndex(collect_documents(concept_index, LEARNABLE_TYPES))
+
+
+def test_intent_words_do_not_retrieve_concepts(ontology_index):
+    assert ontology_index.search("What's the weather like?") == []
+    assert ontology_index.search("How does it happen and why?") == []
+
+
+def test_compiled_ontology_ranks_the_explaining_concept(ontology_index):
+    assert [name for name, _ in ontology_index.search("why does a book on a table stay at rest")] == \
+        ["NewtonsFirstLaw"]
+    assert [name for name, _ in ontology_index.search("why is a full shopping cart harder to push")] == \
+        ["NewtonsSecondLaw"]
+    assert ontology_index.search("why does a rocket move forward")[0][0] == "NewtonsThirdLaw"
+    # Weak matches far below the best one are dropped
+    assert [name for name, _ in ontology_index.search("what is the rate of change of position")] == ["Velocity"]
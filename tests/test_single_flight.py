@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import pytest
+
+from llm_integration.single_flight import SingleFlight, prompt_fingerprint
+
+
+def test_concurrent_threads_share_one_call():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(group.do("key", upstream))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while group.stats()["upstream_calls_saved"] < 7:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 7
+    assert group.stats() == {'upstream_calls': 1, 'upstream_calls_saved': 7, 'in_flight': 0, 'saved_ratio': 0.875}
+    # Completed calls are not cached
+    assert group.do("key", lambda: "fresh") == ("fresh", False)
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def upstream():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            group.do("key", upstream)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while group.stats()["upstream_calls_saved"] < 1:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+    assert errors == ["upstream down", "upstream down"]
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    async def scenario():
+        group = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.ensure_future(group.do_async("key", upstream))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(group.do_async("key", upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        assert calls == [1]
+        assert results == [("answer", True)] * 3
+        assert group.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_fingerprint_ignores_key_order():
+    assert prompt_fingerprint({"a": 1, "b": [1]}) == prompt_fingerprint({"b": [1], "a": 1})
+    assert prompt_fingerprint({"a": 1}) != prompt_fingerprint({"a": 2})
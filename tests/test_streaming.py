@@ -0,0 +1,97 @@
+import json
+import time
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("anthropic")
+
+from benchmarks.stub_llm import StubLLMServer
+from llm_integration.tutor_core import reset_tutor_core
+
+
+def _events(chunks):
+    events = []
+    for raw in b"".join(chunks).decode().split("\n\n"):
+        if not raw.strip():
+            continue
+        fields = dict(line.split(": ", 1) for line in raw.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def stub_app(monkeypatch):
+    with StubLLMServer(token_delay=0.05) as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        monkeypatch.setenv("JWT_SECRET", "test_jwt_secret_key")
+        reset_tutor_core()
+        import app as app_module
+        monkeypatch.setattr(app_module.app_config, "metrics_enabled", True)
+        yield app_module, llm
+        reset_tutor_core()
+
+
+def test_stream_forwards_tokens_in_order(stub_app):
+    app_module, llm = stub_app
+    response = app_module.app.test_client().post(
+        "/api/ask/stream", json={"question": "What is Newton's second law?", "session_id": "s1"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    events = _events([response.data])
+    tokens = [data["text"] for name, data in events if name == "token"]
+    assert tokens == llm.tokens
+    name, done = events[-1]
+    assert name == "done"
+    assert 0 < done["ttft_ms"] <= done["total_ms"]
+
+    # Same context pipeline as /api/ask, sent as a streaming request
+    assert llm.requests[-1]["stream"] is True
+    assert "RELEVANT CONTEXT" in llm.requests[-1]["messages"][0]["content"]
+
+
+def test_first_token_arrives_before_answer_completes(stub_app):
+    app_module, llm = stub_app
+    llm.token_delay = 0.2
+    response = app_module.app.test_client().post(
+        "/api/ask/stream", json={"question": "What is inertia?", "session_id": "s2"}, buffered=False)
+    started = time.perf_counter()
+    chunks = iter(response.response)
+    first = next(chunks)
+    first_at = time.perf_counter() - started
+    rest = list(chunks)
+    total = time.perf_counter() - started
+    assert b"event: token" in first
+    assert total - first_at > 0.2 * (len(llm.tokens) - 2)
+    assert _events([first] + rest)[-1][0] == "done"
+
+
+def test_validation_errors_are_plain_json(stub_app):
+    app_module, llm = stub_app
+    client = app_module.app.test_client()
+    response = client.post("/api/ask/stream", json={"question": "?", "session_id": "s3"})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Question is too short"
+    assert llm.requests == []
+
+    client.post("/api/ask/stream", json={"question": "What is mass?", "session_id": "s3"}).get_data()
+    metrics = client.get("/api/metrics").get_json()
+    assert metrics["stream_ttft"]["requests"] >= 1
+    assert metrics["stream_latency"]["requests"] >= 1
+
+
+def test_metrics_and_cache_bypass_are_off_unless_enabled(stub_app, monkeypatch):
+    app_module, llm = stub_app
+    monkeypatch.setattr(app_module.app_config, "metrics_enabled", False)
+    monkeypatch.setattr(app_module.app_config, "allow_cache_bypass", False)
+    client = app_module.app.test_client()
+
+    assert client.get("/api/metrics").status_code == 404
+    body = {"question": "What is Newton's second law?", "session_id": "s4", "bypass_cache": True}
+    first, second = (client.post("/api/ask", json=body).get_json()["response"] for _ in range(2))
+    assert first == second and len(llm.requests) == 1  # the second answer came from the cache
+
+    monkeypatch.setattr(app_module.app_config, "allow_cache_bypass", True)
+    client.post("/api/ask", json=body)
+    assert len(llm.requests) == 2
@@ -0,0 +1,72 @@
+import random
+import pytest
+
+from llm_integration.student_model import StudentModel, ConceptVocabulary
+
+PREREQUISITES = {"Force": ["Mass", "Acceleration"], "Mass": [], "Acceleration": ["Velocity"], "Velocity": []}
+
+
+@pytest.fixture
+def model():
+    return StudentModel("s1", ConceptVocabulary(["Velocity", "Mass"]))
+
+
+def test_exposure_and_understanding_behave_like_sets(model):
+    model.expose_concept("Force")
+    model.expose_concept("Mass")
+    model.mark_as_understood("Mass")
+    model.mark_as_understood("Velocity")
+
+    assert set(model.exposed_concepts) == {"Force", "Mass", "Velocity"}
+    assert "Velocity" in model.understood_concepts and "Force" not in model.understood_concepts
+    assert "Unknown" not in model.exposed_concepts
+    assert len(model.understood_concepts) == 2
+    assert model.exposed_concepts - model.understood_concepts == {"Force"}
+    assert model.get_knowledge_gaps() == ["Force"]
+
+
+def test_knowledge_levels_are_float32(model):
+    model.expose_concept("Force")
+    model.expose_concept("Velocity")
+    model.mark_as_understood("Force")
+    model.expose_concept("Force")  # keeps the existing level
+
+    assert dict(model.knowledge_level) == pytest.approx({"Velocity": 0.1, "Force": 1.0})
+    assert "Mass" not in model.knowledge_level
+    del model.knowledge_level["Velocity"]
+    assert list(model.knowledge_level) == ["Force"]
+    assert model.knowledge_level["Force"] == 1.0
+
+
+def test_ready_concepts_follow_prerequisites(model):
+    assert model.get_ready_concepts(PREREQUISITES) == ["Mass", "Velocity"]
+    model.mark_as_understood("Velocity")
+    model.mark_as_understood("Mass")
+    assert model.get_ready_concepts(PREREQUISITES) == ["Acceleration"]
+    model.mark_as_understood("Acceleration")
+    assert model.get_ready_concepts(PREREQUISITES) == ["Force"]
+
+
+def test_understanding_clears_misconceptions(model):
+    model.misconceptions["Force"] = "Force keeps things moving"
+    model.mark_as_understood("Force")
+    assert model.misconceptions == {}
+    assert StudentModel.from_dict("s1", model.to_dict()).to_dict() == model.to_dict()
+
+
+def test_incremental_frontier_matches_full_scan():
+    rng = random.Random(7)
+    graph = {f"C{i}": [f"C{j}" for j in rng.sample(range(i), min(i, rng.randint(0, 3)))] for i in range(300)}
+    model = StudentModel("s1", ConceptVocabulary())
+    model.get_ready_concepts(graph)  # builds the frontier; later calls only apply updates
+
+    def full_scan():
+        return [c for c, prereqs in graph.items()
+                if c not in model.understood_concepts and all(p in model.understood_concepts for p in prereqs)]
+
+    for _ in range(150):
+        ready = model.get_ready_concepts(graph)
+        assert ready == full_scan()
+        model.mark_as_understood(rng.choice(ready))
+    model.understood_concepts.discard(next(iter(model.understood_concepts)))
+    assert model.get_ready_concepts(graph) == full_scan()
@@ -0,0 +1,172 @@
+import threading
+
+import pytest
+
+from llm_integration.student_model import StudentModel
+from llm_integration.student_store import (
+    MemoryStudentStore, SQLiteStudentStore, StudentModelRepository, reset_student_repository
+)
+
+
+class CountingStore(MemoryStudentStore):
+    def __init__(self):
+        super().__init__()
+        self.loads = []
+        self.saves = []
+
+    def load_many(self, student_ids):
+        student_ids = list(student_ids)
+        self.loads.append(student_ids)
+        return super().load_many(student_ids)
+
+    def save_many(self, records):
+        self.saves.append(sorted(records))
+        super().save_many(records)
+
+
+def test_changes_are_written_behind_in_batches():
+    store = CountingStore()
+    repository = StudentModelRepository(store, flush_interval=60)
+    for student_id in ("a", "b"):
+        model = repository.get(student_id)
+        model.expose_concept("Force")
+        repository.mark_dirty(model)
+        model.mark_as_understood("Mass")
+        repository.mark_dirty(model)
+    assert store.saves == []  # nothing is written on the request path
+
+    assert repository.flush() == 2
+    assert store.saves == [["a", "b"]]
+    repository.close()
+
+    reloaded = StudentModelRepository(store).get("a")
+    assert reloaded.exposed_concepts == {"Force", "Mass"}
+    assert reloaded.understood_concepts == {"Mass"}
+    assert reloaded.knowledge_level == pytest.approx({"Force": 0.1, "Mass": 1.0})
+
+
+def test_read_through_lru_and_bulk_preload():
+    store = CountingStore()
+    store.save_many({sid: StudentModel(sid).to_dict() for sid in ("a", "b", "c")})
+    repository = StudentModelRepository(store, max_entries=2, flush_interval=60)
+
+    assert repository.preload(["a", "b", "c", "d"]) == 3
+    assert store.loads == [["a", "b", "c", "d"]]
+    repository.get("c")
+    repository.get("b")
+    assert len(store.loads) == 1  # served from the cache
+    repository.get("a")  # evicted by the size bound
+    assert store.loads[-1] == ["a"]
+    assert repository.stats()["hits"] == 2
+    repository.close()
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    store = SQLiteStudentStore(str(tmp_path / "students.db"))
+    model = StudentModel("s1")
+    model.expose_concept("Force")
+    model.misconceptions["Force"] = "Force is needed to keep moving"
+    store.save_many({"s1": model.to_dict()})
+    store.save_many({"s1": model.to_dict()})
+    store.close()
+
+    data = SQLiteStudentStore(str(tmp_path / "students.db")).load_many(["s1", "s2"])
+    assert list(data) == ["s1"]
+    assert StudentModel.from_dict("s1", data["s1"]).to_dict() == model.to_dict()
+
+
+class BlockingStore(MemoryStudentStore):
+    def __init__(self):
+        super().__init__()
+        self.saving = threading.Event()
+        self.release = threading.Event()
+
+    def save_many(self, records):
+        self.saving.set()
+        assert self.release.wait(5)
+        super().save_many(records)
+
+
+def test_reads_during_a_flush_see_the_unsaved_model():
+    store = BlockingStore()
+    repository = StudentModelRepository(store, ttl_seconds=0, flush_interval=60)
+    model = repository.get("a")
+    model.expose_concept("Force")
+    repository.mark_dirty(model)
+
+    flusher = threading.Thread(target=repository.flush)
+    flusher.start()
+    assert store.saving.wait(5)
+    # The TTL has expired and the store still holds no row for "a"
+    assert repository.get("a") is model
+    repository._models.clear()
+    assert "Force" in repository.get("a").exposed_concepts
+
+    store.release.set()
+    flusher.join()
+    assert "Force" in repository.get("a").exposed_concepts
+    repository.close()
+
+
+def test_tutor_remembers_exposed_concepts_across_requests(monkeypatch):
+    pytest.importorskip("anthropic")
+    from benchmarks.stub_llm import StubLLMServer
+    from llm_integration.claude_tutor import ClaudeTutor
+    from llm_integration.tutor_core import TutorCore
+
+    with StubLLMServer() as llm:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", llm.base_url)
+        core = TutorCore()
+        ClaudeTutor("returning", core=core).tutor_sync("What is Newton's second law?")
+        reset_student_repository()
+
+        # A new worker process sees the same student state
+        core = TutorCore()
+        tutor = ClaudeTutor("returning", core=core)
+        assert "NewtonsSecondLaw" in tutor.student_model.exposed_concepts
+        assert len(tutor.system_blocks) == 2  # the adaptive student block is now sent
+        core.student_models.close()
+
+
+def test_concurrent_updates_of_a_shared_model_are_not_lost():
+    repository = StudentModelRepository(MemoryStudentStore(), flush_interval=60)
+    model = repository.get("shared")
+    concepts = [f"Concept{i}" for i in range(200)]
+
+    def expose(offset):
+        for concept in concepts[offset::4]:
+            with model.lock:
+                model.expose_concept(concept)
+                repository.mark_dirty(model)
+
+    threads = [threading.Thread(target=expose, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(model.knowledge_level) == sorted(concepts)
+    assert list(model.knowledge_level.values()) == pytest.approx([0.1] * len(concepts))
+    repository.flush()
+    assert sorted(repository.store.load_many(["shared"])["shared"]["exposed_concepts"]) == sorted(concepts)
+    repository.close()
+
+
+@pytest.mark.parametrize("session_id", ["default_session", "eval_session"])
+def test_shared_sessions_are_not_persisted(monkeypatch, session_id):
+    pytest.importorskip("anthropic")
+    from llm_integration.claude_tutor import ClaudeTutor
+    from llm_integration.tutor_core import TutorCore
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    core = TutorCore()
+    first = ClaudeTutor(session_id, core=core)
+    first._prepare_context("What is Newton's second law?")
+    assert "NewtonsSecondLaw" in first.student_model.exposed_concepts
+
+    # Clients without a session id, and evaluation questions, do not see each other's history
+    assert not ClaudeTutor(session_id, core=core).student_model.exposed_concepts
+    core.student_models.flush()
+    assert core.student_models.store.load_many([session_id]) == {}
+    core.student_models.close()
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from llm_integration import tutor_core
+from llm_integration.claude_tutor import ClaudeTutor
+from llm_integration.tutor_core import get_tutor_core, current_tutor_core, reload_tutor_core, reset_tutor_core
+
+
+@pytest.fixture(autouse=True)
+def fresh_core(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    reset_tutor_core()
+    yield
+    reset_tutor_core()
+
+
+def test_concurrent_first_calls_build_one_core(monkeypatch):
+    builds = []
+    original = tutor_core.TutorCore
+
+    class CountingCore(original):
+        def __init__(self, *args, **kwargs):
+            builds.append(1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(tutor_core, "TutorCore", CountingCore)
+    assert current_tutor_core() is None
+
+    cores = []
+    threads = [threading.Thread(target=lambda: cores.append(get_tutor_core())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(core is cores[0] for core in cores)
+    assert current_tutor_core() is cores[0]
+    # Tutors share the core's resources instead of loading their own
+    first, second = ClaudeTutor("a"), ClaudeTutor("b")
+    assert first.core is second.core is cores[0]
+    assert first.onto is second.onto and first.client is second.client
+
+
+def test_reload_swaps_the_core_and_keeps_student_models():
+    before = get_tutor_core()
+    tutor = ClaudeTutor("student_a")
+    tutor.student_model.expose_concept("Force")
+    flushers = lambda: [t for t in threading.enumerate() if t.name == "student-model-flusher"]
+    running = len(flushers())
+
+    after = reload_tutor_core()
+
+    assert after is not before
+    assert get_tutor_core() is after
+    assert tutor.core is before  # tutors created before the reload keep their core
+    assert after.ontology_version == before.ontology_version
+    assert after.student_models is before.student_models
+    # Every core, reloaded or built directly, shares the repository and its flusher thread
+    assert tutor_core.TutorCore().student_models is after.student_models
+    assert len(flushers()) == running
+    assert "Force" in ClaudeTutor("student_a").student_model.exposed_concepts
@@ -1,14 +1,21 @@
 """Utility modules for the AI Physics Tutor application."""
 
 from .ssl_config import configure_ssl_certificates
+from .http_client import HTTPClientPool, get_http_pool
+from .metrics import LatencyTracker, TokenUsageTracker
 from .error_handler import (
-    handle_api_error, validate_question, validate_session_id,
+    handle_api_error, api_error_payload, validate_question, validate_session_id,
     TutorError, ValidationError, APIServiceError, OntologyError
 )
 
 __all__ = [
     'configure_ssl_certificates',
+    'HTTPClientPool',
+    'get_http_pool',
+    'LatencyTracker',
+    'TokenUsageTracker',
     'handle_api_error', 
+    'api_error_payload',
     'validate_question', 
     'validate_session_id',
     'TutorError', 
@@ -28,47 +28,56 @@ class OntologyError(TutorError):
     pass
 
 
-def handle_api_error(error: Exception) -> Tuple[Response, int]:
-    """Handle API-related errors and return appropriate responses."""
+def api_error_payload(error: Exception) -> Tuple[Dict[str, str], int]:
+    """Map an error to the JSON payload and status code returned to the client.
+    
+    Framework-independent; used directly by the ASGI app and streaming endpoints.
+    """
     error_message = str(error)
     
     if isinstance(error, APIError):
         if "api_key" in error_message.lower() or "authentication" in error_message.lower():
             logger.error(f"API authentication error: {error}")
-            return jsonify({'error': 'AI service authentication error'}), 503
+            return {'error': 'AI service authentication error'}, 503
         elif isinstance(error, RateLimitError):
             logger.warning(f"API rate limit exceeded: {error}")
-            return jsonify({'error': 'AI service rate limit exceeded. Please try again later.'}), 429
+            return {'error': 'AI service rate limit exceeded. Please try again later.'}, 429
         elif isinstance(error, APIConnectionError):
             logger.error(f"API connection error: {error}")
-            return jsonify({'error': 'AI service connection error. Please try again.'}), 503
+            return {'error': 'AI service connection error. Please try again.'}, 503
         else:
             logger.error(f"API error: {error}")
-            return jsonify({'error': 'AI service error. Please try again.'}), 500
+            return {'error': 'AI service error. Please try again.'}, 500
     
     elif isinstance(error, ValidationError):
         logger.warning(f"Validation error: {error}")
-        return jsonify({'error': str(error)}), 400
+        return {'error': str(error)}, 400
     
     elif isinstance(error, OntologyError):
         logger.error(f"Ontology error: {error}")
-        return jsonify({'error': 'Knowledge base error. Please try again later.'}), 503
+        return {'error': 'Knowledge base error. Please try again later.'}, 503
     
     elif isinstance(error, APIServiceError):
         logger.error(f"API service error: {error}")
-        return jsonify({'error': 'AI service error. Please try again.'}), 503
+        return {'error': 'AI service error. Please try again.'}, 503
     
     else:
         # Generic error handling
         if "timeout" in error_message.lower() or "timed out" in error_message.lower():
             logger.error(f"Request timeout: {error}")
-            return jsonify({'error': 'Request timed out. Please try again.'}), 504
+            return {'error': 'Request timed out. Please try again.'}, 504
         elif "ontology" in error_message.lower():
             logger.error(f"Ontology error: {error}")
-            return jsonify({'error': 'Could not load physics knowledge base. Please try again later.'}), 503
+            return {'error': 'Could not load physics knowledge base. Please try again later.'}, 503
         else:
             logger.error(f"Unexpected error: {error}")
-            return jsonify({'error': 'Internal server error'}), 500
+            return {'error': 'Internal server error'}, 500
+
+
+def handle_api_error(error: Exception) -> Tuple[Response, int]:
+    """Handle API-related errors and return appropriate responses."""
+    payload, status = api_error_payload(error)
+    return jsonify(payload), status
 
 
 def validate_question(question: str) -> None:
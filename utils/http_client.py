@@ -0,0 +1,148 @@
+"""Process-wide pooled HTTP client for the Anthropic SDK and the evaluation clients.
+
+Every TLS handshake to the API costs a few round trips. The tutor's Anthropic
+clients, ``AnthropicClient`` and ``OntologyAPIClient`` therefore share one
+keep-alive connection pool per process instead of opening a connection per call.
+The pool is sized and timed from ``config.settings.APIConfig``.
+
+The clients are the Anthropic SDK's own httpx clients (``DefaultHttpxClient``),
+so they are accepted as ``Anthropic(http_client=...)`` whichever httpx build the
+SDK was installed with. Every request carries an httpx ``trace`` extension that
+counts new TCP connections and TLS handshakes. ``HTTPClientPool.stats()`` reports
+them next to the request count, so connection reuse can be measured.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+from anthropic import DefaultHttpxClient, DefaultAsyncHttpxClient, DEFAULT_CONNECTION_LIMITS, Timeout
+from config.settings import APIConfig, load_api_config
+from utils.ssl_config import configure_ssl_certificates
+
+logger = logging.getLogger(__name__)
+
+# The httpx Limits class the SDK was built against
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+_TCP_CONNECTED = "connection.connect_tcp.complete"
+_TLS_COMPLETE = "connection.start_tls.complete"
+
+
+class HTTPClientPool:
+    """Shared sync client (and per-event-loop async clients) with connection accounting."""
+
+    def __init__(self, max_connections: int = APIConfig.pool_connections,
+                 max_keepalive_connections: int = APIConfig.pool_keepalive,
+                 keepalive_expiry: float = APIConfig.keepalive_expiry,
+                 connect_timeout: float = APIConfig.connect_timeout,
+                 timeout: float = APIConfig.timeout):
+        """
+        Args:
+            max_connections: Maximum open connections per client
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept
+            connect_timeout: Seconds to establish a connection
+            timeout: Seconds for reads, writes and waiting for a pooled connection
+        """
+        configure_ssl_certificates()
+        self.limits = Limits(max_connections=max_connections,
+                             max_keepalive_connections=max_keepalive_connections,
+                             keepalive_expiry=keepalive_expiry)
+        self.timeout = Timeout(timeout, connect=connect_timeout)
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(('requests', 'connections_opened', 'tls_handshakes'), 0)
+        self.client = DefaultHttpxClient(limits=self.limits, timeout=self.timeout,
+                                         event_hooks={"request": [self._on_request]})
+
+    @classmethod
+    def from_config(cls, api_config: APIConfig) -> "HTTPClientPool":
+        """Create a pool sized and timed from an APIConfig."""
+        return cls(max_connections=api_config.pool_connections,
+                   max_keepalive_connections=api_config.pool_keepalive,
+                   keepalive_expiry=api_config.keepalive_expiry,
+                   connect_timeout=api_config.connect_timeout,
+                   timeout=api_config.timeout)
+
+    def create_async_client(self) -> DefaultAsyncHttpxClient:
+        """
+        Create an async client with the same limits and accounting.
+
+        Async connection pools belong to one event loop, so each AsyncAnthropic
+        client gets its own instead of sharing the sync pool.
+        """
+        return DefaultAsyncHttpxClient(limits=self.limits, timeout=self.timeout,
+                                       event_hooks={"request": [self._on_request_async]})
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            self._counts[field] += 1
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == _TCP_CONNECTED:
+            self._count('connections_opened')
+        elif event_name == _TLS_COMPLETE:
+            self._count('tls_handshakes')
+
+    async def _trace_async(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._trace(event_name, info)
+
+    def _on_request(self, request) -> None:
+        self._count('requests')
+        request.extensions["trace"] = self._trace
+
+    async def _on_request_async(self, request) -> None:
+        self._count('requests')
+        request.extensions["trace"] = self._trace_async
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, connection and handshake counts and the share of requests on a reused connection."""
+        with self._lock:
+            counts = dict(self._counts)
+        reused = max(0, counts['requests'] - counts['connections_opened'])
+        return {
+            **counts,
+            'reused_connections': reused,
+            'reuse_ratio': round(reused / counts['requests'], 4) if counts['requests'] else 0.0,
+            'max_connections': self.limits.max_connections,
+            'max_keepalive_connections': self.limits.max_keepalive_connections,
+        }
+
+    def close(self) -> None:
+        """Close the shared sync client's connections."""
+        self.client.close()
+
+
+_pool: Optional[HTTPClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool(api_config: Optional[APIConfig] = None) -> HTTPClientPool:
+    """
+    Return the process-wide HTTPClientPool, creating it on first use.
+
+    Args:
+        api_config: Pool settings for the first call; later calls share the existing pool.
+                    Defaults to load_api_config(), or the APIConfig defaults if the
+                    environment has no valid API key.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if api_config is None:
+                    try:
+                        api_config = load_api_config()
+                    except ValueError as e:
+                        logger.debug(f"Using default HTTP pool settings ({e})")
+                _pool = HTTPClientPool.from_config(api_config) if api_config else HTTPClientPool()
+                logger.debug(f"HTTP connection pool created: {_pool.limits}")
+    return _pool
+
+
+def reset_http_pool() -> None:
+    """Close and drop the process-wide pool (for tests)."""
+    global _pool
+    with _pool_lock:
+        previous, _pool = _pool, None
+    if previous is not None:
+        previous.close()
@@ -0,0 +1,122 @@
+"""Lightweight in-process metrics for the AI Physics Tutor application."""
+
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class LatencyTracker:
+    """Thread-safe latency recorder that separates the first request from steady state.
+
+    The first request in a worker pays for loading shared resources (ontology,
+    client, prompt sections), so it is reported on its own instead of skewing
+    the steady-state percentiles.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent steady-state samples kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self._first_ms: Optional[float] = None
+        self._samples = deque(maxlen=window)
+        self._count = 0
+
+    def record(self, seconds: float) -> bool:
+        """
+        Record one request latency.
+
+        Args:
+            seconds: Wall-clock duration of the request
+
+        Returns:
+            True if this was the first request recorded by the tracker
+        """
+        ms = seconds * 1000
+        with self._lock:
+            self._count += 1
+            if self._first_ms is None:
+                self._first_ms = ms
+                return True
+            self._samples.append(ms)
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return first-request latency and steady-state summary statistics in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            first_ms = self._first_ms
+            count = self._count
+
+        steady: Dict[str, Any] = {'count': len(samples)}
+        if samples:
+            steady.update({
+                'mean_ms': round(sum(samples) / len(samples), 2),
+                'p50_ms': round(_percentile(samples, 50), 2),
+                'p99_ms': round(_percentile(samples, 99), 2),
+            })
+
+        return {
+            'requests': count,
+            'first_request_ms': round(first_ms, 2) if first_ms is not None else None,
+            'steady_state': steady,
+        }
+
+
+class TokenUsageTracker:
+    """Thread-safe totals of the token usage reported by the Messages API.
+
+    ``input_tokens`` in the API usage excludes prompt-cache reads and writes, so
+    the three input counters add up to the full prompt size.
+    """
+
+    FIELDS = ('input_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens', 'output_tokens')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = dict.fromkeys(self.FIELDS, 0)
+        self._requests = 0
+
+    def record(self, usage: Any) -> Dict[str, int]:
+        """
+        Add one response's usage to the totals.
+
+        Args:
+            usage: The ``usage`` object (or dict) of a Messages API response
+
+        Returns:
+            This call's counts, keyed by field name
+        """
+        if isinstance(usage, dict):
+            counts = {field: usage.get(field) or 0 for field in self.FIELDS}
+        else:
+            counts = {field: getattr(usage, field, None) or 0 for field in self.FIELDS}
+        with self._lock:
+            self._requests += 1
+            for field, count in counts.items():
+                self._totals[field] += count
+        return counts
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return token totals and the fraction of input tokens served from the prompt cache."""
+        with self._lock:
+            totals = dict(self._totals)
+            requests = self._requests
+        prompt_tokens = totals['input_tokens'] + totals['cache_read_input_tokens'] + totals['cache_creation_input_tokens']
+        return {
+            'requests': requests,
+            'uncached_input_tokens': totals['input_tokens'],
+            'cache_read_input_tokens': totals['cache_read_input_tokens'],
+            'cache_creation_input_tokens': totals['cache_creation_input_tokens'],
+            'output_tokens': totals['output_tokens'],
+            'cached_input_ratio': round(totals['cache_read_input_tokens'] / prompt_tokens, 4) if prompt_tokens else 0.0,
+        }
+
+
+def _percentile(sorted_samples, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    index = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
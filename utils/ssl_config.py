@@ -3,15 +3,31 @@
 import os
 import certifi
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+_configured_path = None
+_configure_lock = threading.Lock()
+
 def configure_ssl_certificates():
     """Configure SSL certificates for all HTTP requests.
     
     This function sets up the necessary environment variables for SSL certificate
     verification, fixing common issues with the Anthropic client and other HTTPS requests.
+    Only the first call modifies ``os.environ``; later calls return the configured path.
     """
+    global _configured_path
+    if _configured_path is not None:
+        return _configured_path
+    with _configure_lock:
+        if _configured_path is not None:
+            return _configured_path
+        _configured_path = _set_certificate_environment()
+    return _configured_path
+
+
+def _set_certificate_environment():
     cert_path = certifi.where()
     
     # Set SSL certificate path environment variables